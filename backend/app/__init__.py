@@ -3,6 +3,17 @@ from flask_cors import CORS
 from pathlib import Path
 import logging
 from dotenv import load_dotenv
+import threading
+
+def _start_warmup(app):
+    def warm_up():
+        from app.services.blockchain import get_blockchain_service
+        with app.app_context():
+            try:
+                get_blockchain_service()
+            except Exception as e:
+                app.logger.error(f'Blockchain warm-up failed: {e}')
+    threading.Thread(target=warm_up, name='blockchain-warmup', daemon=True).start()
 
 def create_app():
     # Load backend/.env regardless of the current working directory.
@@ -10,7 +21,10 @@ def create_app():
 
     from app.config import get_config
 
+    from app.services.uploads import UploadRequest
+
     app = Flask(__name__)
+    app.request_class = UploadRequest
     app.config.from_object(get_config())
     Path(app.config['UPLOAD_FOLDER']).mkdir(parents=True, exist_ok=True)
 
@@ -18,7 +32,8 @@ def create_app():
         r"/api/*":{
             "origins": app.config['CORS_ORIGINS'],
             "methods": ["GET", "POST", "OPTIONS"],
-            "allow_headers": ["content-Type"]
+            "allow_headers": ["content-Type", "Idempotency-Key"],
+            "expose_headers": ["Idempotent-Replayed"]
         }
     })
 
@@ -33,6 +48,9 @@ def create_app():
     app.register_blueprint(certificate.bp, url_prefix='/api/certificate')
     app.register_blueprint(verification.bp, url_prefix='/api/verify')
 
+    if app.config.get('BLOCKCHAIN_WARMUP'):
+        _start_warmup(app)
+
     @app.errorhandler(404)
     def not_found(error):
         return jsonify({'success': False, 'message': 'Not Found'}), 404
@@ -47,7 +65,10 @@ def create_app():
         from app.services.blockchain import get_blockchain_service
         try:
             bc = get_blockchain_service()
-            return jsonify({'status': 'healthy', 'blockchain_connected': bc.w3.is_connected()})
+            if bc.w3 is None:
+                return jsonify({'status': 'healthy', 'backend': 'snapshot', 'snapshot_block': bc.block_number})
+            return jsonify({'status': 'healthy', 'blockchain_connected': bc.w3.is_connected(),
+                            'rpc_endpoints': bc.get_rpc_stats(), 'cache': bc.get_cache_stats()})
         except:
             return jsonify({'status': 'unhealthy'}), 503
     return app
@@ -17,16 +17,110 @@ class Config:
     CORS_ORIGINS = _split_csv_env('CORS_ORIGINS', [])
     UPLOAD_FOLDER = BASE_DIR /'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+    # Uploaded files are held in memory up to this many bytes, then spooled to a temp file.
+    UPLOAD_SPOOL_THRESHOLD = int(os.getenv('UPLOAD_SPOOL_THRESHOLD', str(512 * 1024)))
+    # Keep validation results in UPLOAD_FOLDER by content hash so repeats skip PDF parsing;
+    # least recently used records are evicted past UPLOAD_SPOOL_MAX_BYTES.
+    UPLOAD_SPOOL_ENABLED = os.getenv('UPLOAD_SPOOL_ENABLED', 'false').lower() == 'true'
+    UPLOAD_SPOOL_MAX_BYTES = int(os.getenv('UPLOAD_SPOOL_MAX_BYTES', str(256 * 1024 * 1024)))
     ALLOWED_EXTENSIONS = {'pdf'}
 
     WEB3_PROVIDER_URI = os.environ['WEB3_PROVIDER_URI']
+    # Comma-separated RPC endpoints; the first one also receives every write.
+    WEB3_PROVIDER_URIS = _split_csv_env('WEB3_PROVIDER_URIS', [WEB3_PROVIDER_URI])
+    RPC_TIMEOUT = float(os.getenv('RPC_TIMEOUT', '10'))
+    RPC_HEDGE_PERCENTILE = float(os.getenv('RPC_HEDGE_PERCENTILE', '95'))
+    RPC_HEDGE_MIN_DELAY = float(os.getenv('RPC_HEDGE_MIN_DELAY', '0.02'))
+    RPC_FAILURE_THRESHOLD = int(os.getenv('RPC_FAILURE_THRESHOLD', '3'))
+    RPC_ENDPOINT_COOLDOWN = float(os.getenv('RPC_ENDPOINT_COOLDOWN', '10'))
     NETWORK_ID = int(os.environ['NETWORK_ID'])
 
     ISSUER_REGISTRY_ADDRESS = os.environ['ISSUER_REGISTRY_ADDRESS']
     CERTIFICATE_STORE_ADDRESS = os.environ['CERTIFICATE_STORE_ADDRESS']
+    # Minimal ABI files (see extract_abis.py), refreshed from the brownie build when it is newer.
+    ABI_DIR = os.getenv('ABI_DIR', str(BASE_DIR / 'app' / 'data' / 'abi'))
+    CONTRACTS_BUILD_DIR = os.getenv('CONTRACTS_BUILD_DIR', str(BASE_DIR.parent / 'build' / 'contracts'))
+
+    # Contract reads cached per (function, args, block) inside BlockchainService.pinned_block().
+    READ_CACHE_SIZE = int(os.getenv('READ_CACHE_SIZE', '10000'))
+    # Where cached reads live: 'memory' (per worker), 'sqlite' (shared by the workers on
+    # a host) or 'redis' (shared by every host pointing at CACHE_REDIS_URL).
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', str(BASE_DIR / 'app' / 'data' / 'read_cache.sqlite3'))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/1')
+    # Issuer info is cached until an IssuerRegistry log changes it; logs are polled at least
+    # this often (and on every new head when the head tracker runs).
+    ISSUER_CACHE_SYNC_INTERVAL = float(os.getenv('ISSUER_CACHE_SYNC_INTERVAL', '5'))
+    ISSUER_CACHE_SIZE = int(os.getenv('ISSUER_CACHE_SIZE', '10000'))
+    # Active issuers, stats and verifications read at "latest" are reused for this long.
+    LATEST_READ_TTL = float(os.getenv('LATEST_READ_TTL', '2'))
+    # Reads at least CONFIRMATIONS blocks behind the head are cached without expiry;
+    # newer ones expire after RECENT_READ_TTL seconds or on a reorg. 0 (the default)
+    # disables the head tracker; an idle dev chain never reaches 12 confirmations.
+    CONFIRMATIONS = int(os.getenv('CONFIRMATIONS', '0'))
+    HEAD_POLL_INTERVAL = float(os.getenv('HEAD_POLL_INTERVAL', '2'))
+    RECENT_READ_TTL = float(os.getenv('RECENT_READ_TTL', '5'))
+    FINALIZED_CACHE_SIZE = int(os.getenv('FINALIZED_CACHE_SIZE', '100000'))
+
+    # Raw eth_call path for verifyCertificate, getCertificateDetails and issuer registration checks.
+    FAST_CALLS_ENABLED = os.getenv('FAST_CALLS_ENABLED', 'true').lower() == 'true'
+
+    # Sorted on-disk hash index (see build_hash_index.py) answering /api/verify/status; off
+    # unless set. Ignored when missing or not refreshed within HASH_INDEX_MAX_AGE seconds.
+    HASH_INDEX_PATH = os.getenv('HASH_INDEX_PATH')
+    HASH_INDEX_MAX_AGE = float(os.getenv('HASH_INDEX_MAX_AGE', '30'))
+
+    # In-memory Bloom filter of issued hashes, kept current by a log-scanning thread;
+    # a definite miss skips the eth_call.
+    BLOOM_FILTER_ENABLED = os.getenv('BLOOM_FILTER_ENABLED', 'false').lower() == 'true'
+    BLOOM_FALSE_POSITIVE_RATE = float(os.getenv('BLOOM_FALSE_POSITIVE_RATE', '0.001'))
+    BLOOM_CAPACITY = int(os.getenv('BLOOM_CAPACITY', '100000'))
+    BLOOM_SYNC_INTERVAL = float(os.getenv('BLOOM_SYNC_INTERVAL', '5'))
+    BLOOM_REBUILD_INTERVAL = float(os.getenv('BLOOM_REBUILD_INTERVAL', '3600'))
+    # Block the CertificateStore was deployed in; log scans start here instead of genesis.
+    DEPLOYMENT_BLOCK = int(os.getenv('DEPLOYMENT_BLOCK', '0'))
+
+    # Seconds between revocation-log syncs; also the revocation list's Cache-Control max-age.
+    REVOCATION_SYNC_INTERVAL = float(os.getenv('REVOCATION_SYNC_INTERVAL', '15'))
+
+    # /api/certificate/events: one log poller per worker shared by all SSE clients.
+    EVENT_POLL_INTERVAL = float(os.getenv('EVENT_POLL_INTERVAL', '2'))
+    EVENT_HEARTBEAT_INTERVAL = float(os.getenv('EVENT_HEARTBEAT_INTERVAL', '15'))
+    EVENT_REPLAY_SIZE = int(os.getenv('EVENT_REPLAY_SIZE', '1000'))
+    EVENT_MAX_SUBSCRIBERS = int(os.getenv('EVENT_MAX_SUBSCRIBERS', '500'))
 
     DEPLOYER_ADDRESS = os.environ['DEPLOYER_ADDRESS']
     DEPLOYER_PRIVATE_KEY = os.environ['DEPLOYER_PRIVATE_KEY']
 
+    # 'rpc' reads the chain; 'snapshot' serves reads from a signed state snapshot
+    # (see export_snapshot.py) plus any *.delta files next to it.
+    CHAIN_BACKEND = os.getenv('CHAIN_BACKEND', 'rpc')
+    SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', str(BASE_DIR / 'app' / 'data' / 'snapshots' / 'state.snapshot'))
+    # Snapshots are signed with a key of their own (never the deployer's), so exporting
+    # them does not put the contract owner's key on another host. No defaults.
+    SNAPSHOT_SIGNER_ADDRESS = os.getenv('SNAPSHOT_SIGNER_ADDRESS')
+    SNAPSHOT_SIGNING_KEY = os.getenv('SNAPSHOT_SIGNING_KEY')
+    # Chain id snapshots and deltas must carry; others are refused.
+    SNAPSHOT_CHAIN_ID = int(os.getenv('SNAPSHOT_CHAIN_ID', str(NETWORK_ID)))
+
+    # A Merkle batch that was never anchored can be replaced by its issuer at any time,
+    # and by another issuer once it is this many seconds old.
+    MERKLE_BATCH_TTL = float(os.getenv('MERKLE_BATCH_TTL', str(7 * 24 * 3600)))
+
+    # Connect to the chain in a background thread as soon as the app is created instead of
+    # on the first request; create_app() itself never blocks on the network.
+    BLOCKCHAIN_WARMUP = os.getenv('BLOCKCHAIN_WARMUP', 'false').lower() == 'true'
+
+    # Idempotency-Key records for write routes, shared by the workers on a host.
+    IDEMPOTENCY_DB_PATH = os.getenv('IDEMPOTENCY_DB_PATH', str(BASE_DIR / 'app' / 'data' / 'idempotency.sqlite3'))
+    IDEMPOTENCY_TTL = float(os.getenv('IDEMPOTENCY_TTL', '86400'))
+    # A claim older than this is treated as abandoned by a dead worker and can be taken over.
+    IDEMPOTENCY_PENDING_TIMEOUT = float(os.getenv('IDEMPOTENCY_PENDING_TIMEOUT', '600'))
+
+    # Signed verification receipts; the signer address is published at /api/verify/receipt-key.
+    # Needs a key of its own (never the deployer's); receipt routes answer 503 without one.
+    RECEIPT_SIGNING_KEY = os.getenv('RECEIPT_SIGNING_KEY')
+    RECEIPT_TTL = int(os.getenv('RECEIPT_TTL', '60'))
+
 def get_config():
     return Config
\ No newline at end of file
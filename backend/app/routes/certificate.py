@@ -1,24 +1,31 @@
-from flask import Blueprint, request, jsonify
-from app.services.blockchain import get_blockchain_service
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from app.services.blockchain import get_blockchain_service, ChainDataUnavailable
+from app.services.events import get_event_hub
 from app.services.pdf_handler import get_pdf_handler
+from app.services.merkle import get_merkle_store, recover_root_signer, MerkleBatchConflict
+from app.services.uploads import pdf_upload
+from app.services.upload_spool import validate_and_hash
+from app.services.idempotency import idempotent
+from eth_utils import is_address, to_checksum_address
+from datetime import datetime, timedelta
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 bp = Blueprint('certificate', __name__)
 
 @bp.route('/calculate-hash', methods=['POST'])
+@pdf_upload
 def calculate_hash():
     try:
         if 'file' not in request.files:
             return jsonify({'success': False, 'message': 'No file provided'}), 400
         
         file = request.files['file']
-        pdf_handler = get_pdf_handler()
-        is_valid, error = pdf_handler.validate_pdf(file)
+        is_valid, error, hash_hex = validate_and_hash(file)
         if not is_valid:
             return jsonify({'success': False, 'message': error}), 400
         
-        hash_hex = pdf_handler.calculate_hash(file)
         return jsonify({'success': True,
                         'data': {'hash': hash_hex, 'hash_with_prefix': '0x' + hash_hex},
                         'message': 'Hash calculated successfully'}), 200
@@ -31,16 +38,49 @@ def calculate_hash():
 def get_recipient_certificates(address):
     try:
         blockchain = get_blockchain_service()
-        certificates = blockchain.get_certificates_for_recipient(address)
+        cursor = request.args.get('cursor', type=int)
+        if cursor is None:
+            certificates = blockchain.get_certificates_for_recipient(address)
+            return jsonify({
+                'success': True,
+                'data': {'certificates': certificates, 'count': len(certificates)}
+            }), 200
+
+        if cursor < 0:
+            return jsonify({'success': False, 'message': 'cursor must be >= 0'}), 400
+        certificates, next_cursor = blockchain.get_certificates_for_recipient_page(address, cursor)
         return jsonify({
             'success': True,
-            'data': {'certificates': certificates, 'count': len(certificates)}
+            'data': {'certificates': certificates, 'count': len(certificates), 'next_cursor': next_cursor}
         }), 200
     
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting certificates: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
     
+@bp.route('/issuer/<address>', methods=['GET'])
+def get_issuer_certificates(address):
+    try:
+        start = request.args.get('start', 0, type=int)
+        limit = request.args.get('limit', 50, type=int)
+        if start < 0 or not 0 < limit <= 100:
+            return jsonify({'success': False, 'message': 'start must be >= 0 and limit between 1 and 100'}), 400
+
+        blockchain = get_blockchain_service()
+        page = blockchain.get_certificates_issued_by(address, start, limit)
+        next_start = start + len(page['certificates']) if page['has_more'] else None
+        return jsonify({
+            'success': True,
+            'data': {**page, 'count': len(page['certificates']), 'next_start': next_start}
+        }), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error getting issuer certificates: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @bp.route('/stats', methods=['GET'])
 def get_stats():
     try:
@@ -49,4 +89,161 @@ def get_stats():
         return jsonify({'success': True, 'data': stats}), 200
     
     except Exception as e:
-        return jsonify({'success': False, 'message': str(e)}), 500
\ No newline at end of file
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@bp.route('/events', methods=['GET'])
+def stream_events():
+    """Server-Sent Events for issuance and revocation, optionally filtered by recipient, issuer or hash."""
+    try:
+        if get_blockchain_service().w3 is None:
+            return jsonify({'success': False, 'message': 'Event stream requires an RPC backend'}), 503
+        filters = {}
+        for field in ('recipient', 'issuer'):
+            address = request.args.get(field)
+            if address:
+                if not is_address(address):
+                    return jsonify({'success': False, 'message': f'Invalid {field} address'}), 400
+                filters[field] = to_checksum_address(address)
+        cert_hash = request.args.get('hash')
+        if cert_hash:
+            pdf_handler = get_pdf_handler()
+            filters['cert_hash'] = pdf_handler.bytes_to_hash(pdf_handler.hash_to_bytes(cert_hash))
+
+        hub = get_event_hub()
+        subscription = hub.subscribe(last_event_id=request.headers.get('Last-Event-ID'), **filters)
+    except OverflowError as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Event stream error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+    heartbeat = current_app.config['EVENT_HEARTBEAT_INTERVAL']
+
+    def generate():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = subscription.get(timeout=heartbeat)
+                except EOFError:
+                    return
+                if event is None:
+                    # Comment line keeps proxies from closing an idle connection.
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            hub.unsubscribe(subscription)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@bp.route('/merkle/build', methods=['POST'])
+@idempotent()
+def build_merkle_batch():
+    try:
+        data = request.get_json()
+        issuer_address = data.get('issuer_address')
+        entries = data.get('certificates') or []
+        signature = data.get('signature')
+
+        if not issuer_address or not is_address(issuer_address):
+            return jsonify({'success': False, 'message': 'Invalid issuer_address'}), 400
+        if not entries:
+            return jsonify({'success': False, 'message': 'No certificates provided'}), 400
+        if not signature:
+            return jsonify({'success': False, 'message': 'signature over the Merkle root is required'}), 400
+
+        issuer_address = to_checksum_address(issuer_address)
+        blockchain = get_blockchain_service()
+        if not blockchain.is_registered_issuer(issuer_address):
+            return jsonify({'success': False, 'message': 'Issuer is not registered'}), 400
+
+        pdf_handler = get_pdf_handler()
+        certificates = []
+        seen = set()
+        for entry in entries:
+            hash_str = entry.get('hash') or ''
+            recipient = entry.get('recipient')
+            try:
+                hash_bytes = pdf_handler.hash_to_bytes(hash_str)
+            except ValueError:
+                hash_bytes = b''
+            if len(hash_bytes) != 32:
+                return jsonify({'success': False, 'message': f'Invalid hash: {hash_str}'}), 400
+            if not recipient or not is_address(recipient):
+                return jsonify({'success': False, 'message': f'Invalid recipient for {hash_str}'}), 400
+            if hash_bytes in seen:
+                return jsonify({'success': False, 'message': f'Duplicate hash in batch: {hash_str}'}), 400
+            seen.add(hash_bytes)
+            certificates.append((hash_bytes, to_checksum_address(recipient)))
+
+        # The issuer signs the root it will anchor, so nobody else can claim hashes in its name.
+        merkle_store = get_merkle_store()
+        try:
+            signer = recover_root_signer(merkle_store.batch_root(certificates), signature)
+        except Exception:
+            signer = None
+        if signer != issuer_address:
+            return jsonify({'success': False, 'message': 'signature is not the issuer\'s signature of the Merkle root'}), 403
+
+        hashes = [cert_hash for cert_hash, _ in certificates]
+        issued = [h for h, v in zip(hashes, blockchain.verify_certificates(hashes)) if v['is_valid']]
+        expired_before = datetime.now() - timedelta(seconds=current_app.config['MERKLE_BATCH_TTL'])
+        batched = {}
+        replace = set()
+        for cert_hash in hashes:
+            existing = merkle_store.lookup(cert_hash)
+            if existing is None:
+                continue
+            if blockchain.is_merkle_root_anchored(pdf_handler.hash_to_bytes(existing['merkle_root'])):
+                issued.append(cert_hash)
+            elif existing['issuer'] == issuer_address or datetime.fromisoformat(existing['created_at']) < expired_before:
+                # An unanchored batch of this issuer, or an abandoned one, is rebuilt.
+                replace.add(existing['merkle_root'])
+            else:
+                batched[pdf_handler.bytes_to_hash(cert_hash)] = existing['merkle_root']
+        if issued:
+            return jsonify({
+                'success': False,
+                'message': 'Some certificates are already issued',
+                'data': {'issued': [pdf_handler.bytes_to_hash(h) for h in issued]}
+            }), 409
+
+        try:
+            if batched:
+                raise MerkleBatchConflict(batched)
+            batch = merkle_store.build_batch(issuer_address, certificates, replace)
+        except MerkleBatchConflict as e:
+            return jsonify({
+                'success': False,
+                'message': 'Some certificates already belong to a Merkle batch',
+                'data': {'batched': e.batched}
+            }), 409
+        return jsonify({
+            'success': True,
+            'data': batch,
+            'message': 'Merkle batch built, anchor the root with anchorMerkleRoot'
+        }), 201
+    except ChainDataUnavailable as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    except Exception as e:
+        logger.error(f"Merkle batch error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@bp.route('/merkle/proof/<cert_hash>', methods=['GET'])
+def get_merkle_proof(cert_hash):
+    try:
+        proof = get_merkle_store().lookup(get_pdf_handler().hash_to_bytes(cert_hash))
+        if proof is None:
+            return jsonify({'success': False, 'message': 'No Merkle proof for this hash'}), 404
+        return jsonify({'success': True, 'data': proof}), 200
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Merkle proof error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
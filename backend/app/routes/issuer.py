@@ -1,6 +1,7 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from app.services.blockchain import get_blockchain_service
-from web3 import Web3
+from app.services.idempotency import idempotent, record_transaction, get_idempotency_store
+from eth_utils import is_address, to_checksum_address
 import logging
 import json
 from pathlib import Path
@@ -9,6 +10,8 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 bp = Blueprint('issuer', __name__)
 
+MAX_BULK_CHECK = 500
+
 # Pending registrations storage (file-based)
 PENDING_FILE = Path(__file__).resolve().parent.parent / 'data' / 'pending_registrations.json'
 
@@ -45,6 +48,7 @@ def remove_pending_registration(issuer_address):
         save_pending_registrations(pending)
 
 @bp.route('/register', methods=['POST'])
+@idempotent()
 def register_issuer():
     try:
         data = request.get_json()
@@ -59,13 +63,13 @@ def register_issuer():
                 'message': 'Missing required fields'
             }), 400
 
-        if not Web3.is_address(issuer_address):
+        if not is_address(issuer_address):
             return jsonify({
                 'success': False,
                 'message': 'Invalid issuer_address'
             }), 400
 
-        issuer_address = Web3.to_checksum_address(issuer_address)
+        issuer_address = to_checksum_address(issuer_address)
         blockchain = get_blockchain_service()
         
         # Check if already registered on blockchain
@@ -108,15 +112,16 @@ def get_pending_registrations_route():
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @bp.route('/approve/<address>', methods=['POST'])
+@idempotent(operation_key=lambda address: address.lower())
 def approve_issuer(address):
     try:
-        if not Web3.is_address(address):
+        if not is_address(address):
             return jsonify({
                 'success': False,
                 'message': 'Invalid address'
             }), 400
         
-        address = Web3.to_checksum_address(address)
+        address = to_checksum_address(address)
         pending = get_pending_registrations()
         
         if address.lower() not in pending:
@@ -128,8 +133,12 @@ def approve_issuer(address):
         pending_reg = pending[address.lower()]
         blockchain = get_blockchain_service()
         
-        # Register on blockchain
-        result = blockchain.register_issuer_admin(address, pending_reg['name'], pending_reg['location'])
+        # Register on blockchain; a retry that took over a stale claim resumes its transaction
+        result = blockchain.register_issuer_admin(
+            address, pending_reg['name'], pending_reg['location'],
+            on_submitted=record_transaction,
+            pending_transaction=get_idempotency_store().transaction_hash(g.idempotency_key)
+        )
         if result['success']:
             # Remove from pending
             remove_pending_registration(address)
@@ -158,6 +167,32 @@ def get_active_issuers():
         logger.error(f"Error getting issuers: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@bp.route('/check', methods=['POST'])
+def check_issuers():
+    try:
+        data = request.get_json() or {}
+        addresses = data.get('addresses')
+        if not isinstance(addresses, list) or not addresses:
+            return jsonify({'success': False, 'message': 'addresses must be a non-empty list'}), 400
+        if len(addresses) > MAX_BULK_CHECK:
+            return jsonify({'success': False, 'message': f'At most {MAX_BULK_CHECK} addresses per request'}), 400
+        invalid = [a for a in addresses if not isinstance(a, str) or not is_address(a)]
+        if invalid:
+            return jsonify({'success': False, 'message': 'Invalid address', 'data': {'invalid': invalid}}), 400
+
+        blockchain = get_blockchain_service()
+        issuers = blockchain.get_issuers_info(addresses)
+        return jsonify({
+            'success': True,
+            'data': {
+                address: {'is_registered': bool(info and info['is_active']), 'info': info}
+                for address, info in issuers.items()
+            }
+        }), 200
+    except Exception as e:
+        logger.error(f"Bulk issuer check error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @bp.route('/check/<address>', methods=['GET'])
 def check_issuer(address):
     try:
@@ -165,6 +200,7 @@ def check_issuer(address):
         is_registered = blockchain.is_registered_issuer(address)
         info = None
         if is_registered:
+            # Served from the issuer cache that is_registered_issuer just filled.
             info = blockchain.get_issuer_info(address)
         return jsonify({
             'success': True,
@@ -1,33 +1,92 @@
-from flask import Blueprint, request, jsonify
-from app.services.blockchain import get_blockchain_service
+from flask import Blueprint, request, jsonify, current_app
+from app.services.blockchain import get_blockchain_service, ChainDataUnavailable
 from app.services.pdf_handler import get_pdf_handler
+from app.services.merkle import get_merkle_store
+from app.services.receipts import get_receipt_signer, check_receipt, ReceiptSigningUnavailable
+from app.services.uploads import pdf_upload
+from app.services.upload_spool import validate_and_hash
 import logging
+import gzip
+import json
+import struct
+import time
 from datetime import datetime, timezone
+from functools import wraps
 
 logger = logging.getLogger(__name__)
 bp = Blueprint('verification', __name__)
 
+# Binary revocation list: magic, block_number, since, count, then count 32-byte hashes.
+REVOCATION_LIST_HEADER = struct.Struct('<4sQqI')
+REVOCATION_LIST_MAGIC = b'CRL1'
+
+def verify_merkle_certificate(blockchain, hash_bytes):
+    """Checks a hash that is not stored individually against its anchored Merkle batch."""
+    proof = get_merkle_store().lookup(hash_bytes)
+    if proof is None:
+        return None
+    pdf_handler = get_pdf_handler()
+    verification = blockchain.verify_merkle_certificate(
+        pdf_handler.hash_to_bytes(proof['merkle_root']),
+        hash_bytes,
+        proof['recipient'],
+        [pdf_handler.hash_to_bytes(node) for node in proof['proof']]
+    )
+    if not verification['is_valid']:
+        return None
+    verification['merkle_root'] = proof['merkle_root']
+    verification['merkle_proof'] = proof['proof']
+    return verification
+
+def pinned_reads(view):
+    """Serves every chain read in the view from one block, so composite answers agree."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            blockchain = get_blockchain_service()
+        except Exception as e:
+            logger.error(f"Blockchain service unavailable: {e}")
+            return jsonify({'success': False, 'message': str(e)}), 500
+        with blockchain.pinned_block():
+            return view(*args, **kwargs)
+    return wrapper
+
+def wants_receipt():
+    return request.args.get('receipt', '').lower() in ('1', 'true')
+
+def sign_receipt(blockchain, hash_bytes, verification):
+    if not verification['is_valid']:
+        status = 'NOT_FOUND'
+    else:
+        status = 'REVOKED' if verification['is_revoked'] else 'ACTIVE'
+    return get_receipt_signer().sign(hash_bytes, status, verification['issuer'], blockchain.get_block_number())
+
 @bp.route('/file', methods=['POST'])
+@pdf_upload
+@pinned_reads
 def verify_by_file():
     try:
         if 'file' not in request.files:
             return jsonify({'success': False, 'message': 'No file provided'}), 400
         file = request.files['file']
         pdf_handler = get_pdf_handler()
-        is_valid, error = pdf_handler.validate_pdf(file)
+        is_valid, error, hash_hex = validate_and_hash(file)
         if not is_valid:
             return jsonify({'success': False, 'message': error}), 400
-        hash_hex = pdf_handler.calculate_hash(file)
         hash_bytes = pdf_handler.hash_to_bytes(hash_hex)
         blockchain = get_blockchain_service()
         verification = blockchain.verify_certificate(hash_bytes)
+        merkle = None
+        if not verification['is_valid']:
+            merkle = verify_merkle_certificate(blockchain, hash_bytes)
+            verification = merkle or verification
 
         if verification['is_valid']:
             status = 'REVOKED' if verification['is_revoked'] else 'ACTIVE'
             revocation_time = 0
             revoked_at = None
             if verification['is_revoked']:
-                details = blockchain.get_certificate_details(hash_bytes)
+                details = merkle or blockchain.get_certificate_details(hash_bytes)
                 revocation_time = details.get('revocation_time', 0)
                 if revocation_time:
                     revoked_at = datetime.fromtimestamp(revocation_time, tz=timezone.utc).isoformat()
@@ -37,30 +96,39 @@ def verify_by_file():
             else:
                 message = f"Certificate is {status}"
 
+            data = {
+                'is_valid': not verification['is_revoked'],
+                'certificate_hash': '0x' + hash_hex,
+                'issuer_name': verification['issuer_name'],
+                'issuer': verification['issuer'],
+                'recipient': verification['recipient'],
+                'issuance_time': verification['issuance_time'],
+                'is_revoked': verification['is_revoked'],
+                'revocation_time': revocation_time,
+                'revoked_at': revoked_at,
+                'status': status,
+                'merkle_root': merkle['merkle_root'] if merkle else None
+            }
+            if wants_receipt():
+                data['receipt'] = sign_receipt(blockchain, hash_bytes, verification)
             return jsonify({
                 'success': True,
-                'data': {
-                    'is_valid': not verification['is_revoked'],
-                    'certificate_hash': '0x' + hash_hex,
-                    'issuer_name': verification['issuer_name'],
-                    'issuer': verification['issuer'],
-                    'recipient': verification['recipient'],
-                    'issuance_time': verification['issuance_time'],
-                    'is_revoked': verification['is_revoked'],
-                    'revocation_time': revocation_time,
-                    'revoked_at': revoked_at,
-                    'status': status
-                },
+                'data': data,
                 'message': message
             }), 200
         else:
+            data = {'is_valid': False,
+                    'certificate_hash': '0x' + hash_hex,
+                    'status': 'NOT_FOUND'}
+            if wants_receipt():
+                data['receipt'] = sign_receipt(blockchain, hash_bytes, verification)
             return jsonify({
                 'success': True,
-                'data': {'is_valid': False,
-                         'certificate_hash': '0x' + hash_hex,
-                         'status': 'NOT_FOUND'},
+                'data': data,
                 'message': 'Certificate NOT FOUND - Never Issued'
             }), 200
+    except (ReceiptSigningUnavailable, ChainDataUnavailable) as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
     except Exception as e:
         logger.error(f"Verification error: {e}")
         return jsonify({
@@ -69,6 +137,7 @@ def verify_by_file():
         }), 500
     
 @bp.route('/hash', methods=['POST'])
+@pinned_reads
 def verify_by_hash():
     try:
         data = request.get_json()
@@ -83,6 +152,10 @@ def verify_by_hash():
         hash_bytes = pdf_handler.hash_to_bytes(hash_Str)
         blockchain = get_blockchain_service()
         verification = blockchain.verify_certificate(hash_bytes)
+        merkle = None
+        if not verification['is_valid']:
+            merkle = verify_merkle_certificate(blockchain, hash_bytes)
+            verification = merkle or verification
         if verification['is_valid']:
             status = 'REVOKED' if verification['is_revoked'] else 'ACTIVE'
 
@@ -90,31 +163,171 @@ def verify_by_hash():
             revoked_at = None
             message = f"Certificate is {status}"
             if verification['is_revoked']:
-                details = blockchain.get_certificate_details(hash_bytes)
+                details = merkle or blockchain.get_certificate_details(hash_bytes)
                 revocation_time = details.get('revocation_time', 0)
                 if revocation_time:
                     revoked_at = datetime.fromtimestamp(revocation_time, tz=timezone.utc).isoformat()
                 message = f"Verification failed, certificate exists but was revoked at {revoked_at or revocation_time}."
 
+            data = {
+                'is_valid': not verification['is_revoked'],
+                'issuer_name': verification['issuer_name'],
+                'revocation_time': revocation_time,
+                'revoked_at': revoked_at,
+                'status': status,
+                **verification
+            }
+            if wants_receipt():
+                data['receipt'] = sign_receipt(blockchain, hash_bytes, verification)
             return jsonify({
                 'success': True,
-                'data': {
-                    'is_valid': not verification['is_revoked'],
-                    'issuer_name': verification['issuer_name'],
-                    'revocation_time': revocation_time,
-                    'revoked_at': revoked_at,
-                    'status': status,
-                    **verification
-                },
+                'data': data,
                 'message': message
             }), 200
         else:
+            data = {'is_valid': False, 'status': 'NOT_FOUND'}
+            if wants_receipt():
+                data['receipt'] = sign_receipt(blockchain, hash_bytes, verification)
             return jsonify({
                 'success': True,
-                'data': {'is_valid': False, 'status': 'NOT_FOUND'}
+                'data': data
             }), 200
+    except (ReceiptSigningUnavailable, ChainDataUnavailable) as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
     except Exception as e:
         return jsonify({
             'success': False,
             'message': str(e)
         }), 500
+
+
+@bp.route('/status/<cert_hash>', methods=['GET'])
+def get_status(cert_hash):
+    """ACTIVE, REVOKED or NOT_FOUND only, from the hash index and revocation log when they are current."""
+    try:
+        hash_bytes = get_pdf_handler().hash_to_bytes(cert_hash)
+        if len(hash_bytes) != 32:
+            return jsonify({'success': False, 'message': 'Invalid hash'}), 400
+        blockchain = get_blockchain_service()
+        status = blockchain.get_certificate_status(hash_bytes)
+        if status == 'NOT_FOUND':
+            merkle = verify_merkle_certificate(blockchain, hash_bytes)
+            if merkle:
+                status = 'REVOKED' if merkle['is_revoked'] else 'ACTIVE'
+        return jsonify({'success': True, 'data': {'certificate_hash': '0x' + hash_bytes.hex(), 'status': status}}), 200
+    except ChainDataUnavailable as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Status error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@bp.route('/receipt/<cert_hash>', methods=['GET'])
+@pinned_reads
+def get_receipt(cert_hash):
+    try:
+        hash_bytes = get_pdf_handler().hash_to_bytes(cert_hash)
+        signer = get_receipt_signer()
+        receipt = signer.cached(hash_bytes)
+        if receipt is None:
+            blockchain = get_blockchain_service()
+            verification = blockchain.verify_certificate(hash_bytes)
+            if not verification['is_valid']:
+                verification = verify_merkle_certificate(blockchain, hash_bytes) or verification
+            receipt = sign_receipt(blockchain, hash_bytes, verification)
+
+        response = jsonify({'success': True, 'data': receipt})
+        response.cache_control.public = True
+        response.cache_control.max_age = max(0, int(receipt['expires_at'] - time.time()))
+        response.set_etag(receipt['signature'][2:18])
+        return response.make_conditional(request)
+    except (ReceiptSigningUnavailable, ChainDataUnavailable) as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    except Exception as e:
+        logger.error(f"Receipt error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@bp.route('/receipt/check', methods=['POST'])
+def check_presented_receipt():
+    try:
+        receipt = request.get_json() or {}
+        signer = get_receipt_signer()
+        return jsonify({
+            'success': True,
+            'data': {'is_valid': check_receipt(receipt, signer.address), 'signer': signer.address}
+        }), 200
+    except ReceiptSigningUnavailable as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@bp.route('/receipt-key', methods=['GET'])
+def get_receipt_key():
+    try:
+        signer = get_receipt_signer()
+    except ReceiptSigningUnavailable as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    response = jsonify({
+        'success': True,
+        'data': {
+            'signer': signer.address,
+            'chain_id': signer.chain_id,
+            'certificate_store': signer.certificate_store,
+            'ttl': signer.ttl
+        }
+    })
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
+
+
+@bp.route('/filter-stats', methods=['GET'])
+def get_filter_stats():
+    try:
+        blockchain = get_blockchain_service()
+        return jsonify({'success': True, 'data': blockchain.get_filter_metrics()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@bp.route('/revocations', methods=['GET'])
+def get_revocation_list():
+    try:
+        since = request.args.get('since', -1, type=int)
+        fmt = request.args.get('format', 'bin')
+        if fmt not in ('bin', 'json'):
+            return jsonify({'success': False, 'message': 'format must be bin or json'}), 400
+
+        blockchain = get_blockchain_service()
+        block_number, hashes = blockchain.get_revocations(since)
+        if fmt == 'bin':
+            body = REVOCATION_LIST_HEADER.pack(REVOCATION_LIST_MAGIC, block_number, since, len(hashes)) + b''.join(hashes)
+            response = current_app.response_class(body, mimetype='application/octet-stream')
+        else:
+            body = json.dumps({
+                'block_number': block_number,
+                'since': since,
+                'count': len(hashes),
+                'revoked': ['0x' + h.hex() for h in hashes]
+            }).encode()
+            response = current_app.response_class(body, mimetype='application/json')
+            # Both encodings vary on Accept-Encoding, and each has its own ETag, so caches never mix them.
+            response.vary.add('Accept-Encoding')
+            if request.accept_encodings['gzip']:
+                response.set_data(gzip.compress(body))
+                response.headers['Content-Encoding'] = 'gzip'
+
+        # Clients resume with since=<X-Block-Number>; a given (since, block, format) never changes.
+        response.headers['X-Block-Number'] = str(block_number)
+        response.cache_control.public = True
+        response.cache_control.max_age = int(current_app.config['REVOCATION_SYNC_INTERVAL'])
+        encoding = '-gzip' if response.headers.get('Content-Encoding') == 'gzip' else ''
+        response.set_etag(f"{fmt}-{since}-{block_number}{encoding}")
+        return response.make_conditional(request)
+    except Exception as e:
+        logger.error(f"Revocation list error: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
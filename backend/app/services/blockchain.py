@@ -1,45 +1,145 @@
-from web3 import Web3
-import json
-from pathlib import Path
+from eth_utils import is_address, to_checksum_address
+from hexbytes import HexBytes
 from flask import current_app
+from app.services.contract_abi import load_abi
+from app.services.hash_index import HashIndex
+from app.services.bloom import IssuedHashFilter
+from app.services.revocations import RevocationLog
+from app.services.read_cache import create_read_cache, read_key
+from app.services.head_tracker import HeadTracker
+from app.services.issuer_cache import IssuerCache
+from contextlib import contextmanager
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class ChainDataUnavailable(Exception):
+    """The chain backend cannot answer this read, e.g. Merkle batches in snapshot mode."""
+
+
 class BlockchainService:
+    # Hashes per verifyCertificates eth_call; keeps each call well under node gas caps.
+    VERIFY_BATCH_SIZE = 250
+    # Records per getCertificatesForRecipientDetailed eth_call.
+    RECIPIENT_PAGE_SIZE = 100
+
     def __init__(self):
         self.w3 = None
+        self.chain_id = None
         self.issuer_registry = None
         self.certificate_store = None
+        self.hash_index = None
+        self.issued_filter = None
+        self.revocation_log = None
+        self.read_cache = None
+        self.head_tracker = None
+        self.finalized_certificates = None
+        self.issuer_cache = None
+        self.fast_calls = None
+        self._pin = threading.local()
         self._initialize()
     
     def _initialize(self):
+        # web3 (and eth_account under it) takes most of a second to import, so it is
+        # loaded with the first blockchain request rather than by create_app().
+        from web3 import Web3
+        from app.services.rpc_provider import MultiEndpointProvider
+        from app.services.fast_calls import FastCalls
         try:
-            provider_uri = current_app.config['WEB3_PROVIDER_URI']
-            self.w3 = Web3(Web3.HTTPProvider(provider_uri))
+            provider_uris = current_app.config.get('WEB3_PROVIDER_URIS') or [current_app.config['WEB3_PROVIDER_URI']]
+            if len(provider_uris) > 1:
+                provider = MultiEndpointProvider(
+                    provider_uris,
+                    timeout=current_app.config['RPC_TIMEOUT'],
+                    hedge_percentile=current_app.config['RPC_HEDGE_PERCENTILE'],
+                    hedge_min_delay=current_app.config['RPC_HEDGE_MIN_DELAY'],
+                    failure_threshold=current_app.config['RPC_FAILURE_THRESHOLD'],
+                    cooldown=current_app.config['RPC_ENDPOINT_COOLDOWN']
+                )
+            else:
+                provider = Web3.HTTPProvider(provider_uris[0])
+            self.w3 = Web3(provider)
             if not self.w3.is_connected():
-                raise ConnectionError(f"Cannot connect to {provider_uri}")
-            logger.info(f"Connected to Ganache at {provider_uri}")
+                raise ConnectionError(f"Cannot connect to {', '.join(provider_uris)}")
+            logger.info(f"Connected to Ganache at {', '.join(provider_uris)}")
+            self.chain_id = self.w3.eth.chain_id
             self._load_contracts()
+            self.read_cache = create_read_cache(current_app.config, 'reads', current_app.config['READ_CACHE_SIZE'])
+            self.latest_read_ttl = current_app.config.get('LATEST_READ_TTL', 0)
+            if current_app.config.get('HASH_INDEX_PATH'):
+                self.hash_index = HashIndex(current_app.config['HASH_INDEX_PATH'], current_app.config['HASH_INDEX_MAX_AGE'])
+            self.revocation_log = RevocationLog(
+                self.w3, self.certificate_store, current_app.config['REVOCATION_SYNC_INTERVAL']
+            )
+            if current_app.config.get('FAST_CALLS_ENABLED'):
+                self.fast_calls = FastCalls(self.w3, self.certificate_store.address, self.issuer_registry.address)
+            self.issuer_cache = IssuerCache(
+                self.w3, self.issuer_registry, current_app.config['ISSUER_CACHE_SYNC_INTERVAL'], self.fast_calls,
+                current_app.config['ISSUER_CACHE_SIZE']
+            )
+            if current_app.config.get('CONFIRMATIONS', 0) > 0:
+                self._start_head_tracker()
+            if current_app.config.get('BLOOM_FILTER_ENABLED'):
+                self.issued_filter = IssuedHashFilter(
+                    self.w3, self.certificate_store,
+                    capacity=current_app.config['BLOOM_CAPACITY'],
+                    fp_rate=current_app.config['BLOOM_FALSE_POSITIVE_RATE'],
+                    sync_interval=current_app.config['BLOOM_SYNC_INTERVAL'],
+                    rebuild_interval=current_app.config['BLOOM_REBUILD_INTERVAL'],
+                    from_block=current_app.config['DEPLOYMENT_BLOCK']
+                ).start()
         
         except Exception as e:
             logger.error(f"Blockchain initialization failed: {e}")
             raise
 
+    def _start_head_tracker(self):
+        self.recent_read_ttl = current_app.config['RECENT_READ_TTL']
+        self.finalized_certificates = create_read_cache(
+            current_app.config, 'finalized', current_app.config['FINALIZED_CACHE_SIZE']
+        )
+        self.head_tracker = HeadTracker(
+            self.w3, current_app.config['CONFIRMATIONS'], current_app.config['HEAD_POLL_INTERVAL']
+        )
+        self.head_tracker.on_head(self._handle_new_head)
+        self.head_tracker.on_reorg(self._handle_reorg)
+        self.head_tracker.start()
+
+    def _handle_new_head(self, head: int):
+        self.revocation_log.sync()
+        self.issuer_cache.sync()
+        self.read_cache.trim_below(self.head_tracker.safe_block)
+        if self.issued_filter is not None:
+            self.issued_filter.sync()
+
+    def _handle_reorg(self, fork_block: int):
+        dropped = self.read_cache.invalidate_from(fork_block)
+        self.revocation_log.rewind(fork_block)
+        self.issuer_cache.rewind(fork_block)
+        if self.issued_filter is not None:
+            self.issued_filter.rewind(fork_block)
+        # Finalized records, and reads whose block was trimmed from the index, assume no
+        # reorg deeper than CONFIRMATIONS; if one happens, start over.
+        if fork_block <= self.head_tracker.safe_block:
+            self.finalized_certificates.clear()
+            self.read_cache.clear()
+        logger.info(f"Reorg from block {fork_block}: dropped {dropped} cached reads")
+
     def _to_checksum_address(self, address: str, field_name: str) -> str:
-        if not address or not isinstance(address, str) or not Web3.is_address(address):
+        if not address or not isinstance(address, str) or not is_address(address):
             raise ValueError(f"Invalid or missing {field_name}")
-        return Web3.to_checksum_address(address)
+        return to_checksum_address(address)
 
     def _load_contracts(self):
-        build_dir = Path(current_app.root_path).parent.parent / 'build' / 'contracts'
+        abi_dir = current_app.config['ABI_DIR']
+        build_dir = current_app.config['CONTRACTS_BUILD_DIR']
         issuer_address = current_app.config['ISSUER_REGISTRY_ADDRESS']
         cert_address = current_app.config['CERTIFICATE_STORE_ADDRESS']
 
-        with open(build_dir / 'IssuerRegistry.json', 'r') as f:
-            issuer_abi = json.load(f)['abi']
-        with open(build_dir / 'CertificateStore.json', 'r') as f:
-            cert_abi = json.load(f)['abi']
+        issuer_abi = load_abi(abi_dir, build_dir, 'IssuerRegistry')
+        cert_abi = load_abi(abi_dir, build_dir, 'CertificateStore')
 
         self.issuer_registry = self.w3.eth.contract(
             address=self._to_checksum_address(issuer_address, 'issuer registry contract address'), abi=issuer_abi
@@ -49,7 +149,100 @@ class BlockchainService:
         )
         logger.info("Contract loaded successfully")
     
-    def register_issuer_admin(self, issuer_address:str, name:str,location:str) -> dict:
+    @contextmanager
+    def pinned_block(self, block_number: int = None):
+        """Runs every contract read in the block at one block number.
+
+        Without block_number the latest block is fetched on the first read, so a
+        request answered entirely from local indexes costs no extra RPC. Reads
+        inside are cached by (function, args, block); nested pins share the outer one.
+        """
+        if getattr(self._pin, 'active', False):
+            yield
+            return
+        self._pin.active, self._pin.block = True, block_number
+        try:
+            yield
+        finally:
+            self._pin.active, self._pin.block = False, None
+
+    def _pinned_block_number(self):
+        if not getattr(self._pin, 'active', False):
+            return None
+        if self._pin.block is None:
+            # The tracked head is at most a poll interval old and saves an eth_blockNumber per request.
+            if self.head_tracker is not None and self.head_tracker.is_current():
+                self._pin.block = self.head_tracker.head
+            else:
+                self._pin.block = self.w3.eth.block_number
+        return self._pin.block
+
+    def _read(self, contract_function, cache_latest: bool = False):
+        """Calls a view function; pinned reads are cached by block, and cache_latest
+        reuses an unpinned result for LATEST_READ_TTL seconds."""
+        block = self._pinned_block_number()
+        if block is None:
+            if not cache_latest or not self.latest_read_ttl:
+                return contract_function.call()
+            key = read_key(contract_function, 'latest')
+            hit, value = self.read_cache.get(key)
+            if not hit:
+                value = contract_function.call()
+                self.read_cache.set(key, value, ttl=self.latest_read_ttl)
+            return value
+        key = read_key(contract_function, block)
+        hit, value = self.read_cache.get(key)
+        if not hit:
+            value = contract_function.call(block_identifier=block)
+            self.read_cache.set(key, value, block, ttl=self._read_ttl(block))
+        return value
+
+    def _verify_certificate_call(self, cert_hash: bytes):
+        if self.fast_calls is not None:
+            return self.fast_calls.verify_certificate(cert_hash)
+        return self.certificate_store.functions.verifyCertificate(cert_hash)
+
+    def _certificate_details_call(self, cert_hash: bytes):
+        if self.fast_calls is not None:
+            return self.fast_calls.get_certificate_details(cert_hash)
+        return self.certificate_store.functions.getCertificateDetails(cert_hash)
+
+    def _read_ttl(self, block_number: int):
+        """None (keep) for confirmed blocks, a short TTL for blocks that could still reorg."""
+        if self.head_tracker is None:
+            return None
+        safe_block = self.head_tracker.safe_block
+        if safe_block is not None and block_number <= safe_block:
+            return None
+        return self.recent_read_ttl
+
+    def _finalized_verification(self, cert_hash: bytes):
+        """Serves a confirmed, unrevoked certificate from memory while the revocation log is current."""
+        if self.finalized_certificates is None or not self.head_tracker.is_current():
+            return None
+        hit, record = self.finalized_certificates.get(bytes(cert_hash))
+        if not hit or self.revocation_log.last_block < self.head_tracker.head:
+            return None
+        if self.revocation_log.revocation_block(cert_hash) is not None:
+            return None
+        # Issuer names can change; take the current one from the issuer cache.
+        issuer = self.issuer_cache.get(record['issuer'])
+        return dict(record, is_revoked=False, issuer_name=issuer['name'] if issuer else 'Unknown Issuer')
+
+    def _remember_if_finalized(self, cert_hash: bytes, verification: dict):
+        if self.finalized_certificates is None or not verification['is_valid'] or verification['is_revoked']:
+            return
+        safe_timestamp = self.head_tracker.safe_timestamp()
+        if safe_timestamp is not None and verification['issuance_time'] <= safe_timestamp:
+            self.finalized_certificates.set(bytes(cert_hash), dict(verification))
+
+    def register_issuer_admin(self, issuer_address:str, name:str,location:str,
+                              on_submitted=None, pending_transaction: str = None) -> dict:
+        """Registers an issuer from the deployer account and waits for the receipt.
+
+        on_submitted(tx_hash) is called as soon as the transaction is sent. Passing
+        pending_transaction waits for that earlier submission instead of sending again.
+        """
         try:
             deployer = current_app.config['DEPLOYER_ADDRESS']
             private_key = current_app.config['DEPLOYER_PRIVATE_KEY']
@@ -59,6 +252,15 @@ class BlockchainService:
             issuer_checksum = self._to_checksum_address(issuer_address, 'issuer_address')
             deployer_checksum = self._to_checksum_address(deployer, 'DEPLOYER_ADDRESS')
 
+            if pending_transaction:
+                receipt = self.w3.eth.wait_for_transaction_receipt(HexBytes(pending_transaction))
+                self.issuer_cache.invalidate(issuer_checksum)
+                return {
+                    'success': receipt['status'] == 1,
+                    'transaction_hash': pending_transaction,
+                    'gas_used': receipt['gasUsed']
+                }
+
             txn = self.issuer_registry.functions.registerIssuer(
                 issuer_checksum, name, location
             ).build_transaction({
@@ -72,7 +274,10 @@ class BlockchainService:
             if raw_transaction is None:
                 raise AttributeError('Signed transaction missing raw transaction payload')
             tx_hash = self.w3.eth.send_raw_transaction(raw_transaction)
+            if on_submitted is not None:
+                on_submitted(tx_hash.hex())
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            self.issuer_cache.invalidate(issuer_checksum)
             return{
                 'success': receipt['status'] == 1,
                 'transaction_hash': tx_hash.hex(),
@@ -83,7 +288,7 @@ class BlockchainService:
             raise
     def get_active_issuers(self) -> list:
         try:
-            addresses, names, _ = self.issuer_registry.functions.getActiveIssuers(0,50).call()
+            addresses, names, _ = self._read(self.issuer_registry.functions.getActiveIssuers(0,50), cache_latest=True)
             return [{'address': addr, 'name': name} for addr, name in zip(addresses, names)]
         except Exception as e:
             logger.error(f"Error getting issuers: {e}")
@@ -91,28 +296,114 @@ class BlockchainService:
     
     def is_registered_issuer(self, address: str) -> bool:
         try:
-            return self.issuer_registry.functions.isRegisteredIssuer(Web3.to_checksum_address(address)).call()
+            info = self.issuer_cache.get(to_checksum_address(address))
+            return bool(info and info['is_active'])
         except Exception as e:
             return False
     
     def get_issuer_info(self, address: str) -> dict:
         try:
-            info = self.issuer_registry.functions.getIssuerInfo(Web3.to_checksum_address(address)).call()
-            return {
-                'name': info[0],
-                'location': info[1],
-                'registration_time': info[2],
-                'is_active': info[3],
-                'total_certificate': info[4]
-            }
+            info = self.issuer_cache.get(to_checksum_address(address))
+            if info is None:
+                raise ValueError('IssuerRegistry: Address not registered')
+            return info
         except Exception as e:
             logger.error(f"Error getting issuer info: {e}")
             raise
+
+    def get_issuers_info(self, addresses: list) -> dict:
+        """Maps each address (checksummed) to its issuer info, or None if it is not registered."""
+        try:
+            return self.issuer_cache.get_many([self._to_checksum_address(a, 'address') for a in addresses])
+        except Exception as e:
+            logger.error(f"Error getting issuers info: {e}")
+            raise
     
+    def _definitely_not_issued(self, cert_hash: bytes) -> bool:
+        # A miss only counts once the filter has reached the head, which needs the head tracker.
+        if self.issued_filter is None or self.head_tracker is None or not self.head_tracker.is_current():
+            return False
+        try:
+            return self.issued_filter.definitely_absent(cert_hash, self.head_tracker.head)
+        except Exception as e:
+            logger.error(f"Bloom filter check failed: {e}")
+            return False
+
+    def get_revocations(self, since: int = -1) -> tuple:
+        try:
+            return self.revocation_log.revoked_since(since)
+        except Exception as e:
+            logger.error(f"Error syncing revocation list: {e}")
+            raise
+
+    def get_block_number(self) -> int:
+        pinned = self._pinned_block_number()
+        return pinned if pinned is not None else self.w3.eth.block_number
+
+    def get_cache_stats(self) -> dict:
+        return {
+            'reads': self.read_cache.stats(),
+            'finalized_certificates': self.finalized_certificates.stats() if self.finalized_certificates else {},
+            'issuers': self.issuer_cache.stats(),
+            'head': self.head_tracker.stats() if self.head_tracker else {}
+        }
+
+    def get_rpc_stats(self) -> list:
+        endpoint_stats = getattr(self.w3.provider, 'endpoint_stats', None)
+        return endpoint_stats() if endpoint_stats else []
+
+    def get_filter_metrics(self) -> dict:
+        return self.issued_filter.metrics() if self.issued_filter else {}
+
+    def get_indexed_status(self, cert_hash: bytes):
+        """ACTIVE/REVOKED/NOT_FOUND from local indexes, or None if they cannot answer."""
+        if self._definitely_not_issued(cert_hash):
+            return 'NOT_FOUND'
+        if self.hash_index is None:
+            return None
+        try:
+            status = self.hash_index.lookup(cert_hash)
+        except Exception as e:
+            logger.error(f"Hash index lookup failed: {e}")
+            return None
+        if status != 'ACTIVE':
+            return status
+        # The index lags the head, so ACTIVE needs the revocation log to cover the blocks since.
+        if self.head_tracker is None or not self.head_tracker.is_current() or \
+                self.revocation_log.last_block < self.head_tracker.head:
+            return None
+        return 'REVOKED' if self.revocation_log.revocation_block(cert_hash) is not None else 'ACTIVE'
+
+    def get_certificate_status(self, cert_hash: bytes) -> str:
+        status = self.get_indexed_status(cert_hash)
+        if status is not None:
+            return status
+        verification = self.verify_certificate(cert_hash)
+        if not verification['is_valid']:
+            return 'NOT_FOUND'
+        return 'REVOKED' if verification['is_revoked'] else 'ACTIVE'
+
     def verify_certificate(self, cert_hash:bytes) -> dict:
         try:
-            result = self.certificate_store.functions.verifyCertificate(cert_hash).call()
-            return{
+            # Only the Bloom filter's definite miss is used here; the hash index serves get_certificate_status.
+            if self._definitely_not_issued(cert_hash):
+                return {
+                    'is_valid': False,
+                    'issuer': None,
+                    'recipient': None,
+                    'issuance_time': 0,
+                    'is_revoked': False,
+                    'issuer_name': ''
+                }
+            finalized = self._finalized_verification(cert_hash)
+            if finalized is not None:
+                return finalized
+            from app.services.rpc_provider import hedged_reads
+            with hedged_reads():
+                result = self._read(self._verify_certificate_call(cert_hash), cache_latest=True)
+            if not result[0] and self.issued_filter is not None:
+                self.issued_filter.record_false_positive()
+            verification = {
                 'is_valid': result[0],
                 'issuer': result[1],
                 'recipient': result[2],
@@ -120,13 +411,63 @@ class BlockchainService:
                 'is_revoked': result[4],
                 'issuer_name': result[5]
             }
+            self._remember_if_finalized(cert_hash, verification)
+            return verification
         except Exception as e:
             logger.error(f"Error verifying certificate: {e}")
             raise
 
+    def verify_certificates(self, cert_hashes: list) -> list:
+        results = []
+        try:
+            for start in range(0, len(cert_hashes), self.VERIFY_BATCH_SIZE):
+                chunk = cert_hashes[start:start + self.VERIFY_BATCH_SIZE]
+                exists, issuers, recipients, issuance_times, revoked, revocation_times, names = \
+                    self._read(self.certificate_store.functions.verifyCertificates(chunk))
+                for i in range(len(chunk)):
+                    results.append({
+                        'is_valid': exists[i],
+                        'issuer': issuers[i],
+                        'recipient': recipients[i],
+                        'issuance_time': issuance_times[i],
+                        'is_revoked': revoked[i],
+                        'revocation_time': revocation_times[i],
+                        'issuer_name': names[i]
+                    })
+            return results
+        except Exception as e:
+            logger.error(f"Error verifying certificates: {e}")
+            raise
+
+    def verify_merkle_certificate(self, merkle_root: bytes, cert_hash: bytes, recipient: str, proof: list) -> dict:
+        try:
+            result = self._read(self.certificate_store.functions.verifyMerkleCertificate(
+                merkle_root, cert_hash, self._to_checksum_address(recipient, 'recipient'), proof
+            ))
+            return {
+                'is_valid': result[0],
+                'issuer': result[1],
+                'recipient': recipient,
+                'issuance_time': result[2],
+                'is_revoked': result[3],
+                'revocation_time': result[4],
+                'issuer_name': result[5]
+            }
+        except Exception as e:
+            logger.error(f"Error verifying Merkle certificate: {e}")
+            raise
+
+    def is_merkle_root_anchored(self, merkle_root: bytes) -> bool:
+        try:
+            issuer, _ = self._read(self.certificate_store.functions.getMerkleBatch(merkle_root))
+            return int(issuer, 16) != 0
+        except Exception as e:
+            logger.error(f"Error getting Merkle batch: {e}")
+            raise
+
     def get_certificate_details(self, cert_hash: bytes) -> dict:
         try:
-            details = self.certificate_store.functions.getCertificateDetails(cert_hash).call()
+            details = self._read(self._certificate_details_call(cert_hash))
             return {
                 'certificate_hash': details[0],
                 'issuer': details[1],
@@ -139,27 +480,78 @@ class BlockchainService:
             logger.error(f"Error getting certificate details: {e}")
             raise
     
+    def get_certificates_for_recipient_page(self, recipient_address: str, cursor: int = 0, limit: int = RECIPIENT_PAGE_SIZE) -> tuple:
+        """Returns one page of full certificate records and the cursor of the next page (None at the end)."""
+        try:
+            records, has_more = self._read(self.certificate_store.functions.getCertificatesForRecipientDetailed(
+                self._to_checksum_address(recipient_address, 'recipient_address'), cursor, limit
+            ))
+            certificates = [{
+                'hash': '0x' + record[0].hex(),
+                'issuer': record[1],
+                'issuer_name': record[6],
+                'issuance_time': record[3],
+                'is_revoked': record[4],
+                'revocation_time': record[5]
+            } for record in records]
+            next_cursor = cursor + len(certificates) if has_more else None
+            return certificates, next_cursor
+        except Exception as e:
+            logger.error(f"Error getting recipient certificates page: {e}")
+            raise
+
     def get_certificates_for_recipient(self, recipient_address: str) -> list:
         try:
-            hashes, _ = self.certificate_store.functions.getCertificatesForRecipient(Web3.to_checksum_address(recipient_address), 0, 100).call()
             certificates = []
-            for cert_hash in hashes:
-                verification = self.verify_certificate(cert_hash)
+            cursor = 0
+            while cursor is not None:
+                page, cursor = self.get_certificates_for_recipient_page(recipient_address, cursor)
+                certificates.extend(page)
+            return certificates
+        except Exception as e:
+            logger.error(f"Error getting recipient certificates: {e}")
+            return []
+    
+    def get_certificates_issued_by(self, issuer_address: str, start: int = 0, limit: int = 50) -> dict:
+        try:
+            issuer = self._to_checksum_address(issuer_address, 'issuer_address')
+            # Totals, the page and its verifications all come from one block, so a
+            # certificate issued between reads cannot shift or duplicate page entries.
+            with self.pinned_block():
+                total_issued, total_revoked = self._read(self.certificate_store.functions.getIssuerCertificateStats(issuer))
+                merkle_issued, merkle_revoked = self._read(self.certificate_store.functions.getIssuerMerkleStats(issuer))
+                if start >= total_issued:
+                    hashes = []
+                else:
+                    hashes, _ = self._read(self.certificate_store.functions.getCertificatesIssuedBy(issuer, start, limit))
+                verifications = self.verify_certificates(hashes)
+            certificates = []
+            for cert_hash, verification in zip(hashes, verifications):
                 certificates.append({
                     'hash': '0x' + cert_hash.hex(),
+                    'recipient': verification['recipient'],
                     'issuer_name': verification['issuer_name'],
                     'issuance_time': verification['issuance_time'],
-                    'is_revoked': verification['is_revoked']
+                    'is_revoked': verification['is_revoked'],
+                    'revocation_time': verification['revocation_time']
                 })
-            return certificates
+            return {
+                'certificates': certificates,
+                'start': start,
+                'has_more': start + len(hashes) < total_issued,
+                'total_issued': total_issued,
+                'total_revoked': total_revoked,
+                'merkle_issued': merkle_issued,
+                'merkle_revoked': merkle_revoked
+            }
         except Exception as e:
-            logger.error(f"Error getting recipient certificates: {e}")
-            return []
-    
+            logger.error(f"Error getting issuer certificates: {e}")
+            raise
+
     def get_contract_stats(self) -> dict:
         try:
-            issuer_stats = self.issuer_registry.functions.getContractStats().call()
-            cert_stats = self.certificate_store.functions.getContractStats().call()
+            issuer_stats = self._read(self.issuer_registry.functions.getContractStats(), cache_latest=True)
+            cert_stats = self._read(self.certificate_store.functions.getContractStats(), cache_latest=True)
 
             return {
                 'total_issuers': issuer_stats[0],
@@ -171,9 +563,24 @@ class BlockchainService:
             return {}
 
 _service = None
+_service_lock = threading.Lock()
 
 def get_blockchain_service():
     global _service
-    if _service is None:
-        _service = BlockchainService()
+    if _service is not None:
+        return _service
+    # The warm-up thread and the first requests may all get here at once.
+    with _service_lock:
+        if _service is not None:
+            return _service
+        if current_app.config.get('CHAIN_BACKEND') == 'snapshot':
+            from app.services.snapshot import SnapshotBlockchainService
+            if not current_app.config.get('SNAPSHOT_SIGNER_ADDRESS'):
+                raise ValueError('Snapshot backend needs SNAPSHOT_SIGNER_ADDRESS')
+            _service = SnapshotBlockchainService(
+                current_app.config['SNAPSHOT_PATH'], current_app.config['SNAPSHOT_SIGNER_ADDRESS'],
+                current_app.config['SNAPSHOT_CHAIN_ID']
+            )
+        else:
+            _service = BlockchainService()
     return _service
\ No newline at end of file
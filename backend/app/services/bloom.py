@@ -0,0 +1,177 @@
+from app.services.chain_logs import iter_logs
+import hashlib
+import math
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        # Per-process salt so callers cannot precompute hashes that land on set bits.
+        self._salt = os.urandom(16)
+
+    def _positions(self, item: bytes):
+        digest = hashlib.blake2b(item, digest_size=16, key=self._salt).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: bytes):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: bytes) -> bool:
+        return all(self.bits[pos >> 3] >> (pos & 7) & 1 for pos in self._positions(item))
+
+    def estimated_fp_rate(self) -> float:
+        # Standard approximation from the number of inserted items.
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class IssuedHashFilter:
+    """Bloom filter of every issued certificate hash, kept current from CertificateIssued logs.
+
+    The filter is built, and periodically rebuilt, from from_block on a background
+    thread; until the first build finishes every lookup goes to the node. A miss
+    is only trusted when the filter has caught up with the caller's head block.
+    """
+
+    def __init__(self, w3, certificate_store, capacity: int, fp_rate: float,
+                 sync_interval: float, rebuild_interval: float, from_block: int = 0):
+        self.w3 = w3
+        self.certificate_store = certificate_store
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.from_block = from_block
+        # _lock guards the filter and counters; _sync_lock serialises builds and syncs,
+        # which read logs without holding _lock.
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._rebuild_requested = threading.Event()
+        self._filter = None
+        self._last_block = -1
+        # Lowest block rewound to while a build or sync was reading logs.
+        self._rewound_to = math.inf
+        self._synced_at = 0
+        self._rebuilt_at = 0
+        self._thread = None
+        self.definite_misses = 0
+        self.maybe_hits = 0
+        self.unsynced_lookups = 0
+        self.false_positives = 0
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='bloom-filter', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                if self._filter is None or time.time() - self._rebuilt_at >= self.rebuild_interval \
+                        or self._rebuild_requested.is_set():
+                    self.rebuild()
+                else:
+                    self.sync()
+            except Exception as e:
+                logger.error(f"Bloom filter update failed: {e}")
+            self._rebuild_requested.wait(self.sync_interval)
+
+    def rebuild(self):
+        with self._sync_lock:
+            self._rebuild_requested.clear()
+            with self._lock:
+                self._rewound_to = math.inf
+            head = self.w3.eth.block_number
+            hashes = [bytes(event['args']['certificateHash'])
+                      for event in iter_logs(self.certificate_store.events.CertificateIssued, self.from_block, head)]
+            # Leave room to grow so the false-positive rate holds until the next rebuild.
+            self.capacity = max(self.capacity, 2 * len(hashes))
+            bloom = BloomFilter(self.capacity, self.fp_rate)
+            for cert_hash in hashes:
+                bloom.add(cert_hash)
+            with self._lock:
+                self._filter, self._last_block = bloom, min(head, self._rewound_to)
+                self._rebuilt_at = self._synced_at = time.time()
+        logger.info(f"Bloom filter rebuilt at block {head}: {len(hashes)} hashes, {len(bloom.bits)} bytes")
+
+    def sync(self):
+        """Adds hashes issued since the last synced block; skipped while a build is running."""
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if self._filter is None:
+                return
+            with self._lock:
+                self._rewound_to = math.inf
+                last_block = self._last_block
+            head = self.w3.eth.block_number
+            if head > last_block:
+                hashes = [bytes(event['args']['certificateHash'])
+                          for event in iter_logs(self.certificate_store.events.CertificateIssued, last_block + 1, head)]
+                with self._lock:
+                    for cert_hash in hashes:
+                        self._filter.add(cert_hash)
+                    self._last_block = min(head, self._rewound_to)
+                if self._filter.count >= self._filter.capacity:
+                    self._rebuild_requested.set()
+            self._synced_at = time.time()
+        finally:
+            self._sync_lock.release()
+
+    def rewind(self, block_number: int):
+        """Re-reads logs from block_number on at the next sync, after a reorg replaced them."""
+        with self._lock:
+            self._last_block = min(self._last_block, block_number - 1)
+            self._rewound_to = min(self._rewound_to, block_number - 1)
+
+    def definitely_absent(self, cert_hash: bytes, head: int) -> bool:
+        """True only if cert_hash was not issued in any block up to head."""
+        with self._lock:
+            if self._filter is None or self._last_block < head:
+                self.unsynced_lookups += 1
+                return False
+            if cert_hash in self._filter:
+                self.maybe_hits += 1
+                return False
+            self.definite_misses += 1
+            return True
+
+    def record_false_positive(self):
+        with self._lock:
+            self.false_positives += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            bloom = self._filter
+            return {
+                'size_bytes': len(bloom.bits) if bloom else 0,
+                'num_hashes': bloom.num_hashes if bloom else 0,
+                'items': bloom.count if bloom else 0,
+                'capacity': bloom.capacity if bloom else self.capacity,
+                'configured_fp_rate': self.fp_rate,
+                'estimated_fp_rate': bloom.estimated_fp_rate() if bloom else 0.0,
+                # Every hash that was never issued is either a definite miss or a false positive.
+                'observed_fp_rate': (self.false_positives / (self.definite_misses + self.false_positives)
+                                     if self.false_positives else 0.0),
+                'definite_misses': self.definite_misses,
+                'maybe_hits': self.maybe_hits,
+                'unsynced_lookups': self.unsynced_lookups,
+                'false_positives': self.false_positives,
+                'last_block': self._last_block,
+                'last_rebuild': self._rebuilt_at
+            }
@@ -0,0 +1,13 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Keeps each eth_getLogs request inside typical node range limits.
+LOG_BLOCK_RANGE = 5000
+
+
+def iter_logs(event, from_block: int, to_block: int, block_range: int = LOG_BLOCK_RANGE):
+    """Yields decoded logs for a contract event over [from_block, to_block] in bounded chunks."""
+    for start in range(from_block, to_block + 1, block_range):
+        end = min(start + block_range - 1, to_block)
+        yield from event.get_logs(from_block=start, to_block=end)
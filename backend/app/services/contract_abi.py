@@ -0,0 +1,44 @@
+from pathlib import Path
+import json
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Brownie artifacts carry bytecode, AST and full sources next to the ABI and run to
+# megabytes; the backend only needs the ABI, so it is extracted once into a small file.
+CONTRACTS = ('IssuerRegistry', 'CertificateStore')
+
+
+def abi_path(abi_dir, name: str) -> Path:
+    return Path(abi_dir) / f"{name}.abi.json"
+
+
+def extract_abi(build_dir, abi_dir, name: str) -> list:
+    """Reads build/contracts/<name>.json and writes its ABI alone to <abi_dir>/<name>.abi.json."""
+    with open(Path(build_dir) / f"{name}.json", 'r') as f:
+        abi = json.load(f)['abi']
+    target = abi_path(abi_dir, name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp, 'w') as f:
+        json.dump(abi, f, separators=(',', ':'))
+    os.replace(tmp, target)
+    return abi
+
+
+def load_abi(abi_dir, build_dir, name: str) -> list:
+    """Loads the minimal ABI, extracting it first if it is missing or older than the build artifact."""
+    target = abi_path(abi_dir, name)
+    source = Path(build_dir) / f"{name}.json"
+    if target.exists() and (not source.exists() or source.stat().st_mtime <= target.stat().st_mtime):
+        with open(target, 'r') as f:
+            return json.load(f)
+    logger.info(f"Extracting {name} ABI from {source}")
+    try:
+        return extract_abi(build_dir, abi_dir, name)
+    except PermissionError as e:
+        # Read-only deployments can still start from the build artifact.
+        logger.error(f"Could not write {target}: {e}")
+        with open(source, 'r') as f:
+            return json.load(f)['abi']
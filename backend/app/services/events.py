@@ -0,0 +1,186 @@
+from app.services.blockchain import get_blockchain_service
+from app.services.chain_logs import iter_logs
+from collections import deque
+from flask import current_app
+import queue
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = {
+    'CertificateIssued': 'issued',
+    'CertificateRevoked': 'revoked',
+    'MerkleRootAnchored': 'merkle_anchored',
+    'MerkleCertificateRevoked': 'merkle_revoked'
+}
+
+
+def _event_key(event_id: str):
+    block, log_index = event_id.split('-')
+    return int(block), int(log_index)
+
+
+class Subscription:
+    """One connected client: an event queue plus optional recipient/issuer/hash filters."""
+
+    def __init__(self, recipient=None, issuer=None, cert_hash=None, max_queue: int = 1000):
+        self.recipient = recipient
+        self.issuer = issuer
+        self.cert_hash = cert_hash
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.closed = False
+
+    def matches(self, event: dict) -> bool:
+        if self.recipient and event.get('recipient') != self.recipient:
+            return False
+        if self.issuer and event.get('issuer') != self.issuer:
+            return False
+        if self.cert_hash and event.get('certificate_hash') != self.cert_hash:
+            return False
+        return True
+
+    def push(self, event) -> bool:
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self):
+        self.closed = True
+
+    def get(self, timeout: float):
+        """Next event, None on timeout, or raises EOFError once the hub has dropped this client."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            if self.closed:
+                raise EOFError
+            return None
+
+
+class EventHub:
+    """Single per-worker log poller that fans certificate events out to subscribers.
+
+    Polling runs only while at least one client is connected. The most recent
+    events are kept so a reconnecting client can resume from Last-Event-ID.
+    """
+
+    def __init__(self, blockchain, poll_interval: float, replay_size: int, max_subscribers: int):
+        self.blockchain = blockchain
+        self.poll_interval = poll_interval
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=replay_size)
+        self._last_block = None
+        self._thread = None
+
+    def subscribe(self, recipient=None, issuer=None, cert_hash=None, last_event_id=None) -> Subscription:
+        subscription = Subscription(recipient, issuer, cert_hash)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise OverflowError('Too many event subscribers')
+            if last_event_id:
+                after = _event_key(last_event_id)
+                for event in self._recent:
+                    if _event_key(event['id']) > after and subscription.matches(event):
+                        subscription.push(event)
+            self._subscribers.add(subscription)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='certificate-events', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                if not self._subscribers:
+                    # Resume from the head next time instead of replaying the idle gap.
+                    self._last_block = None
+                    continue
+            try:
+                self._poll()
+            except Exception as e:
+                logger.error(f"Event poll failed: {e}")
+
+    def _poll(self):
+        head = self.blockchain.w3.eth.block_number
+        if self._last_block is None:
+            self._last_block = head
+            return
+        if head <= self._last_block:
+            return
+        store = self.blockchain.certificate_store
+        logs = [log for name in EVENT_TYPES
+                for log in iter_logs(getattr(store.events, name), self._last_block + 1, head)]
+        self._last_block = head
+        if not logs:
+            return
+        logs.sort(key=lambda log: (log['blockNumber'], log['logIndex']))
+        self._publish(self._to_events(logs))
+
+    def _to_events(self, logs: list) -> list:
+        events = []
+        for log in logs:
+            args = log['args']
+            event = {
+                'id': f"{log['blockNumber']}-{log['logIndex']}",
+                'type': EVENT_TYPES[log['event']],
+                'issuer': args['issuer'],
+                'block_number': log['blockNumber'],
+                'timestamp': args['timestamp']
+            }
+            if 'certificateHash' in args:
+                event['certificate_hash'] = '0x' + bytes(args['certificateHash']).hex()
+            if 'merkleRoot' in args:
+                event['merkle_root'] = '0x' + bytes(args['merkleRoot']).hex()
+            if 'recipient' in args:
+                event['recipient'] = args['recipient']
+            if 'certificateCount' in args:
+                event['certificate_count'] = args['certificateCount']
+            events.append(event)
+
+        # Revocation logs carry no recipient; look them up so holder streams see their revocations.
+        revoked = [e for e in events if e['type'] == 'revoked']
+        if revoked:
+            results = self.blockchain.verify_certificates([bytes.fromhex(e['certificate_hash'][2:]) for e in revoked])
+            for event, result in zip(revoked, results):
+                event['recipient'] = result['recipient']
+        return events
+
+    def _publish(self, events: list):
+        with self._lock:
+            self._recent.extend(events)
+            for subscription in list(self._subscribers):
+                for event in events:
+                    if subscription.matches(event) and not subscription.push(event):
+                        # A client this far behind reconnects and resumes from its Last-Event-ID.
+                        self._subscribers.discard(subscription)
+                        subscription.close()
+                        break
+
+
+_hub = None
+
+def get_event_hub():
+    global _hub
+    if _hub is None:
+        _hub = EventHub(
+            get_blockchain_service(),
+            poll_interval=current_app.config['EVENT_POLL_INTERVAL'],
+            replay_size=current_app.config['EVENT_REPLAY_SIZE'],
+            max_subscribers=current_app.config['EVENT_MAX_SUBSCRIBERS']
+        )
+    return _hub
@@ -0,0 +1,126 @@
+from web3 import Web3
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+from functools import lru_cache
+
+# Hot-path eth_calls that skip web3's contract-function machinery: calldata is a
+# precomputed selector plus one 32-byte word, and each return shape has its own
+# decoder. Results match what ContractFunction.call() returns for the same method.
+
+
+def selector(signature: str) -> bytes:
+    return bytes(Web3.keccak(text=signature)[:4])
+
+
+VERIFY_CERTIFICATE = selector('verifyCertificate(bytes32)')
+GET_CERTIFICATE_DETAILS = selector('getCertificateDetails(bytes32)')
+IS_REGISTERED_ISSUER = selector('isRegisteredIssuer(address)')
+IS_ADDRESS_REGISTERED = selector('isAddressRegistered(address)')
+ERROR_STRING = selector('Error(string)')
+WORD = 32
+
+
+@lru_cache(maxsize=4096)
+def _address(word: bytes) -> str:
+    # Issuers and recipients repeat a lot; checksumming costs a keccak each time.
+    return Web3.to_checksum_address(word[12:])
+
+
+def _words(data: bytes, count: int):
+    if len(data) < count * WORD:
+        raise BadFunctionCallOutput(f"Expected at least {count * WORD} bytes of return data, got {len(data)}")
+    return [data[i * WORD:(i + 1) * WORD] for i in range(count)]
+
+
+def _uint(word: bytes) -> int:
+    return int.from_bytes(word, 'big')
+
+
+def _string(data: bytes, offset: int) -> str:
+    length = _uint(data[offset:offset + WORD])
+    return data[offset + WORD:offset + WORD + length].decode('utf-8')
+
+
+def decode_bool(data: bytes) -> bool:
+    return _uint(_words(data, 1)[0]) != 0
+
+
+def decode_verify_certificate(data: bytes) -> list:
+    """(bool isValid, address issuer, address recipient, uint256 issuanceTime, bool isRevoked, string issuerName)"""
+    words = _words(data, 6)
+    return [_uint(words[0]) != 0, _address(words[1]), _address(words[2]), _uint(words[3]),
+            _uint(words[4]) != 0, _string(data, _uint(words[5]))]
+
+
+def decode_certificate_details(data: bytes) -> list:
+    """(bytes32 hash, address issuer, address recipient, uint256 issuanceTime, bool isRevoked, uint256 revocationTime)"""
+    words = _words(data, 6)
+    return [words[0], _address(words[1]), _address(words[2]), _uint(words[3]),
+            _uint(words[4]) != 0, _uint(words[5])]
+
+
+def _revert_message(error: dict) -> str:
+    data = error.get('data')
+    if isinstance(data, dict):
+        data = data.get('data') or data.get('result')
+    if isinstance(data, str) and data.startswith('0x' + ERROR_STRING.hex()):
+        payload = bytes.fromhex(data[10:])
+        return f"execution reverted: {_string(payload, _uint(payload[:WORD]))}"
+    return error.get('message', 'execution reverted')
+
+
+class FastCall:
+    """A prebuilt eth_call exposing what BlockchainService._read and read_key() use."""
+
+    __slots__ = ('w3', 'address', 'fn_name', 'args', 'data', 'decoder')
+
+    def __init__(self, w3, address, fn_name, args, data, decoder):
+        self.w3 = w3
+        self.address = address
+        self.fn_name = fn_name
+        self.args = args
+        self.data = data
+        self.decoder = decoder
+
+    def call(self, block_identifier='latest'):
+        if isinstance(block_identifier, int):
+            block_identifier = hex(block_identifier)
+        response = self.w3.provider.make_request('eth_call', [{'to': self.address, 'data': self.data}, block_identifier])
+        if 'error' in response:
+            raise ContractLogicError(_revert_message(response['error']))
+        result = response['result']
+        if result in ('0x', None):
+            raise BadFunctionCallOutput(f"{self.fn_name} returned no data; is {self.address} the right contract?")
+        return self.decoder(bytes.fromhex(result[2:]))
+
+
+class FastCalls:
+    """Builds FastCall objects for the most frequent CertificateStore and IssuerRegistry reads."""
+
+    def __init__(self, w3, certificate_store_address: str, issuer_registry_address: str):
+        self.w3 = w3
+        self.certificate_store = Web3.to_checksum_address(certificate_store_address)
+        self.issuer_registry = Web3.to_checksum_address(issuer_registry_address)
+
+    def _hash_call(self, fn_name, sel, decoder, cert_hash: bytes) -> FastCall:
+        cert_hash = bytes(cert_hash)
+        if len(cert_hash) != WORD:
+            raise ValueError(f"Certificate hash must be 32 bytes, got {len(cert_hash)}")
+        return FastCall(self.w3, self.certificate_store, fn_name, (cert_hash,),
+                        '0x' + (sel + cert_hash).hex(), decoder)
+
+    def _address_call(self, fn_name, sel, address: str) -> FastCall:
+        address = Web3.to_checksum_address(address)
+        return FastCall(self.w3, self.issuer_registry, fn_name, (address,),
+                        '0x' + sel.hex() + '00' * 12 + address[2:].lower(), decode_bool)
+
+    def verify_certificate(self, cert_hash: bytes) -> FastCall:
+        return self._hash_call('verifyCertificate', VERIFY_CERTIFICATE, decode_verify_certificate, cert_hash)
+
+    def get_certificate_details(self, cert_hash: bytes) -> FastCall:
+        return self._hash_call('getCertificateDetails', GET_CERTIFICATE_DETAILS, decode_certificate_details, cert_hash)
+
+    def is_registered_issuer(self, address: str) -> FastCall:
+        return self._address_call('isRegisteredIssuer', IS_REGISTERED_ISSUER, address)
+
+    def is_address_registered(self, address: str) -> FastCall:
+        return self._address_call('isAddressRegistered', IS_ADDRESS_REGISTERED, address)
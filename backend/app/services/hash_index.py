@@ -0,0 +1,152 @@
+from bisect import bisect_left
+from app.services.chain_logs import iter_logs
+from pathlib import Path
+import mmap
+import os
+import struct
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# File layout: 32-byte header, `count` sorted 32-byte hashes, then a revoked
+# bitmap with bit i set when hash i is revoked. Readers mmap the file, so
+# every worker on a host shares one copy through the page cache.
+HEADER = struct.Struct('<4sH2xQQd')
+MAGIC = b'CHIX'
+VERSION = 1
+HASH_SIZE = 32
+
+
+class _HashView:
+    """Sequence view over the mmapped hash array so bisect can search it in place."""
+
+    def __init__(self, buffer, count):
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        offset = HEADER.size + i * HASH_SIZE
+        return self.buffer[offset:offset + HASH_SIZE]
+
+
+class HashIndex:
+    def __init__(self, path, max_age: float, recheck_interval: float = 1.0):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.recheck_interval = recheck_interval
+        # (mmap, count) swapped as one reference so concurrent lookups never see a half-updated view.
+        self._state = None
+        self._identity = None
+        self._mtime = 0
+        self._checked_at = 0
+        self.block_number = 0
+
+    def _refresh(self):
+        now = time.time()
+        if now - self._checked_at < self.recheck_interval:
+            return
+        self._checked_at = now
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._state, self._identity = None, None
+            return
+        self._mtime = st.st_mtime
+        # The updater replaces the file atomically, so a new inode means a new index.
+        identity = (st.st_ino, st.st_size)
+        if identity == self._identity:
+            return
+        with open(self.path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, block_number, _ = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            mm.close()
+            raise ValueError(f"Unsupported hash index format in {self.path}")
+        # The previous map is left to the garbage collector; in-flight lookups may still hold it.
+        self._state, self._identity = (mm, count), identity
+        self.block_number = block_number
+
+    @property
+    def count(self) -> int:
+        return self._state[1] if self._state else 0
+
+    def is_fresh(self) -> bool:
+        self._refresh()
+        return self._state is not None and time.time() - self._mtime <= self.max_age
+
+    def lookup(self, cert_hash: bytes):
+        """Returns 'ACTIVE' or 'REVOKED' as of block_number, or None when the hash is not
+        indexed or the index is missing or stale.
+
+        A miss is not an answer: the hash may have been issued after block_number.
+        """
+        if not self.is_fresh():
+            return None
+        mm, count = self._state
+        hashes = _HashView(mm, count)
+        i = bisect_left(hashes, cert_hash)
+        if i == count or hashes[i] != cert_hash:
+            return None
+        revoked = mm[HEADER.size + count * HASH_SIZE + i // 8] >> (i % 8) & 1
+        return 'REVOKED' if revoked else 'ACTIVE'
+
+
+def read_index(path):
+    path = Path(path)
+    if not path.exists():
+        return [], set(), -1
+    data = path.read_bytes()
+    _, _, count, block_number, _ = HEADER.unpack_from(data, 0)
+    hashes = [data[HEADER.size + i * HASH_SIZE:HEADER.size + (i + 1) * HASH_SIZE] for i in range(count)]
+    bitmap_offset = HEADER.size + count * HASH_SIZE
+    revoked = {h for i, h in enumerate(hashes) if data[bitmap_offset + i // 8] >> (i % 8) & 1}
+    return hashes, revoked, block_number
+
+
+def write_index(path, hashes: list, revoked: set, block_number: int):
+    path = Path(path)
+    bitmap = bytearray((len(hashes) + 7) // 8)
+    for i, cert_hash in enumerate(hashes):
+        if cert_hash in revoked:
+            bitmap[i // 8] |= 1 << (i % 8)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(hashes), block_number, time.time()))
+        f.write(b''.join(hashes))
+        f.write(bitmap)
+    os.replace(tmp, path)
+
+
+def update_index(path, w3, certificate_store, confirmations: int, from_block: int = 0) -> dict:
+    """Folds CertificateIssued/CertificateRevoked logs since the last indexed block into the index.
+
+    Only blocks at least `confirmations` deep are indexed, so an entry is never
+    undone by a reorg shallower than that.
+    """
+    path = Path(path)
+    hashes, revoked, last_block = read_index(path)
+    target = w3.eth.block_number - confirmations
+    start = max(last_block + 1, from_block)
+    if start > target:
+        if path.exists():
+            os.utime(path)
+        return {'count': len(hashes), 'block_number': last_block, 'added': 0, 'revoked': 0}
+
+    issued = {bytes(event['args']['certificateHash'])
+              for event in iter_logs(certificate_store.events.CertificateIssued, start, target)}
+    newly_revoked = {bytes(event['args']['certificateHash'])
+                     for event in iter_logs(certificate_store.events.CertificateRevoked, start, target)}
+
+    known = set(hashes)
+    added = issued - known
+    if added:
+        hashes = sorted(known | added)
+    revoked |= newly_revoked
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_index(path, hashes, revoked, target)
+    logger.info(f"Hash index at block {target}: {len(hashes)} hashes, +{len(added)} issued, +{len(newly_revoked)} revoked")
+    return {'count': len(hashes), 'block_number': target, 'added': len(added), 'revoked': len(newly_revoked)}
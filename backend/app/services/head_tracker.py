@@ -0,0 +1,131 @@
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HeadTracker:
+    """Background poller of the chain head that detects reorganisations.
+
+    Keeps the hashes of the most recent blocks. When a new head does not
+    extend the known chain, it walks back to the fork point and calls every
+    reorg listener with the first block number that changed.
+    """
+
+    def __init__(self, w3, confirmations: int, poll_interval: float, history: int = None):
+        self.w3 = w3
+        self.confirmations = confirmations
+        self.poll_interval = poll_interval
+        self.history = history or max(64, 2 * confirmations)
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self._timestamps = {}
+        self.head = None
+        self.polled_at = 0
+        self.reorgs = 0
+        self._head_listeners = []
+        self._reorg_listeners = []
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='head-tracker', daemon=True)
+            self._thread.start()
+        return self
+
+    def on_head(self, listener):
+        self._head_listeners.append(listener)
+
+    def on_reorg(self, listener):
+        self._reorg_listeners.append(listener)
+
+    def is_current(self) -> bool:
+        return self.head is not None and time.time() - self.polled_at <= 3 * self.poll_interval
+
+    @property
+    def safe_block(self):
+        """Highest block with at least `confirmations` blocks on top of it."""
+        return None if self.head is None else self.head - self.confirmations
+
+    def safe_timestamp(self):
+        """Timestamp of safe_block, or None if it is not known yet."""
+        with self._lock:
+            return self._timestamps.get(self.safe_block)
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Head tracker poll failed: {e}")
+            time.sleep(self.poll_interval)
+
+    def _block(self, number):
+        block = self.w3.eth.get_block(number)
+        return block['number'], bytes(block['hash']), bytes(block['parentHash']), block['timestamp']
+
+    def poll(self):
+        number, block_hash, parent_hash, timestamp = self._block('latest')
+        fork = self._detect_fork(number, block_hash, parent_hash)
+
+        with self._lock:
+            if fork is not None:
+                for stale in [n for n in self._hashes if n >= fork]:
+                    del self._hashes[stale]
+                    self._timestamps.pop(stale, None)
+            self._hashes[number] = block_hash
+            self._timestamps[number] = timestamp
+            for old in [n for n in self._hashes if n < number - self.history]:
+                del self._hashes[old]
+                self._timestamps.pop(old, None)
+            advanced = number != self.head or fork is not None
+            self.head = number
+            self.polled_at = time.time()
+
+        safe = number - self.confirmations
+        if safe >= 0 and safe not in self._timestamps:
+            _, _, _, safe_timestamp = self._block(safe)
+            with self._lock:
+                self._timestamps[safe] = safe_timestamp
+
+        if fork is not None:
+            self.reorgs += 1
+            logger.warning(f"Chain reorganisation detected from block {fork} (new head {number})")
+            for listener in self._reorg_listeners:
+                listener(fork)
+        if advanced:
+            for listener in self._head_listeners:
+                listener(number)
+
+    def _detect_fork(self, number, block_hash, parent_hash):
+        """First block number whose recorded hash is no longer canonical, or None."""
+        if self.head is None:
+            return None
+        if number <= self.head and self._hashes.get(number) == block_hash:
+            # Same head, or the chain shrank back to a block we already had.
+            return None if number == self.head else number + 1
+        # Only polled blocks have recorded hashes, and several blocks may pass between
+        # polls. Walk back through every recorded block until one is still canonical;
+        # the unrecorded blocks after it may have changed too, so the fork is right after it.
+        with self._lock:
+            recorded = sorted((n for n in self._hashes if n < number), reverse=True)
+        fork = recorded[-1] if recorded else number
+        for height in recorded:
+            canonical = parent_hash if height == number - 1 else self._block(height)[1]
+            if self._hashes[height] == canonical:
+                fork = height + 1
+                break
+        else:
+            if recorded:
+                logger.warning(f"Reorganisation reaches past the {len(recorded)} recorded blocks")
+        return fork if fork <= self.head else None
+
+    def stats(self) -> dict:
+        return {
+            'head': self.head,
+            'safe_block': self.safe_block,
+            'confirmations': self.confirmations,
+            'reorgs': self.reorgs,
+            'polled_at': self.polled_at
+        }
@@ -0,0 +1,180 @@
+from flask import request, jsonify, current_app, g
+from functools import wraps
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyStore:
+    """Outcome of each write request by key, in one SQLite file shared by every worker.
+
+    A key is claimed as pending before the view runs. Requests repeating a pending
+    key get the transaction hash recorded so far instead of running again, and
+    requests repeating a completed key get the stored response. Completed records
+    expire after ttl seconds; pending ones can be taken over after pending_timeout,
+    in case the worker that claimed them died.
+    """
+
+    def __init__(self, path, ttl: float, pending_timeout: float):
+        self.path = str(path)
+        self.ttl = ttl
+        self.pending_timeout = pending_timeout
+        self._local = threading.local()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS idempotency (key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, '
+            'state TEXT NOT NULL, status INTEGER, response TEXT, transaction_hash TEXT, '
+            'created_at REAL NOT NULL, updated_at REAL NOT NULL)'
+        )
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def claim(self, key: str, fingerprint: str):
+        """Returns ('new', None) when the caller should run the request, otherwise
+        ('pending' | 'done' | 'mismatch', record)."""
+        now = time.time()
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute('SELECT * FROM idempotency WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                expired = (row['state'] == 'done' and now - row['updated_at'] > self.ttl) or \
+                          (row['state'] == 'pending' and now - row['updated_at'] > self.pending_timeout)
+                if not expired:
+                    db.execute('COMMIT')
+                    if row['fingerprint'] != fingerprint:
+                        return 'mismatch', dict(row)
+                    return row['state'], dict(row)
+            db.execute('INSERT OR REPLACE INTO idempotency VALUES (?, ?, ?, NULL, NULL, ?, ?, ?)',
+                       (key, fingerprint, 'pending', row['transaction_hash'] if row is not None else None, now, now))
+            db.execute('COMMIT')
+            return 'new', None
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+
+    def record_transaction(self, key: str, transaction_hash: str):
+        self._connection().execute('UPDATE idempotency SET transaction_hash = ?, updated_at = ? WHERE key = ?',
+                                   (transaction_hash, time.time(), key))
+
+    def transaction_hash(self, key: str):
+        row = self._connection().execute('SELECT transaction_hash FROM idempotency WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def complete(self, key: str, status: int, response: str):
+        self._connection().execute(
+            "UPDATE idempotency SET state = 'done', status = ?, response = ?, updated_at = ? WHERE key = ?",
+            (status, response, time.time(), key)
+        )
+
+    def release(self, key: str):
+        self._connection().execute("DELETE FROM idempotency WHERE key = ? AND state = 'pending'", (key,))
+
+    def prune(self):
+        now = time.time()
+        self._connection().execute(
+            "DELETE FROM idempotency WHERE (state = 'done' AND updated_at < ?) OR (state = 'pending' AND updated_at < ?)",
+            (now - self.ttl, now - self.pending_timeout)
+        )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_idempotency_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = IdempotencyStore(
+                    current_app.config['IDEMPOTENCY_DB_PATH'],
+                    current_app.config['IDEMPOTENCY_TTL'],
+                    current_app.config['IDEMPOTENCY_PENDING_TIMEOUT']
+                )
+                _store.prune()
+    return _store
+
+
+def record_transaction(transaction_hash: str):
+    """Attaches a submitted transaction to the current request's key, so repeats can return it."""
+    key = g.get('idempotency_key')
+    if key is not None:
+        get_idempotency_store().record_transaction(key, transaction_hash)
+
+
+def idempotent(operation_key=None):
+    """Runs a write view at most once per key.
+
+    The key is the Idempotency-Key header, scoped to the endpoint. operation_key,
+    if given, maps the view's arguments to a key of its own. It is used instead of
+    the header so that separate clients asking for the same operation share one
+    outcome; only successful outcomes are stored for such keys.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if operation_key is not None:
+                key = f"{request.endpoint}:{operation_key(*args, **kwargs)}"
+            else:
+                header = request.headers.get(IDEMPOTENCY_HEADER)
+                if not header:
+                    return view(*args, **kwargs)
+                if len(header) > MAX_KEY_LENGTH:
+                    return jsonify({'success': False, 'message': f'{IDEMPOTENCY_HEADER} is too long'}), 400
+                key = f"{request.endpoint}:{header}"
+            fingerprint = hashlib.sha256(request.method.encode() + request.path.encode() +
+                                         b'\0' + request.get_data()).hexdigest()
+
+            store = get_idempotency_store()
+            state, record = store.claim(key, fingerprint)
+            if state == 'mismatch':
+                return jsonify({'success': False,
+                                'message': f'{IDEMPOTENCY_HEADER} was already used for a different request'}), 422
+            if state == 'done':
+                response = current_app.response_class(record['response'], status=record['status'],
+                                                      mimetype='application/json')
+                response.headers['Idempotent-Replayed'] = 'true'
+                return response
+            if state == 'pending':
+                return jsonify({
+                    'success': False,
+                    'data': {'status': 'pending', 'transaction_hash': record['transaction_hash']},
+                    'message': 'This request is already being processed'
+                }), 409
+
+            g.idempotency_key = key
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+            except Exception:
+                store.release(key)
+                raise
+            if operation_key is not None:
+                # Every client shares an operation's key, so only a success is kept; a rejection
+                # or a reverted transaction leaves the operation open for the next request.
+                keep = 200 <= response.status_code < 300
+            else:
+                # Server errors are retried unless a transaction already went out for this key.
+                keep = response.status_code < 500 or bool(store.transaction_hash(key))
+            if keep:
+                store.complete(key, response.status_code, response.get_data(as_text=True))
+            else:
+                store.release(key)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,147 @@
+from app.services.chain_logs import iter_logs
+from collections import OrderedDict
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# IssuerRegistry events that change what getIssuerInfo returns.
+INVALIDATING_EVENTS = ('IssuerRegistered', 'IssuerUpdated', 'IssuerDeactivated', 'IssuerReactivated')
+_NOT_REGISTERED = object()
+
+
+def _event_address(event):
+    args = event['args']
+    # IssuerUpdated names its indexed address `IssuerAddress`.
+    return args.get('issuerAddress') or args.get('IssuerAddress')
+
+
+class IssuerCache:
+    """Per-address issuer info, kept in memory until an IssuerRegistry log changes it.
+
+    CertificateCountUpdated logs update the cached count in place; the other
+    issuer events drop the entry so the next lookup re-reads it. At most
+    max_entries addresses (registered or not) are kept, least recently used first out.
+    """
+
+    def __init__(self, w3, issuer_registry, sync_interval: float, fast_calls=None, max_entries: int = 10000):
+        self.w3 = w3
+        self.issuer_registry = issuer_registry
+        self.fast_calls = fast_calls
+        self.sync_interval = sync_interval
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._entries = OrderedDict()
+        # Bumped whenever entries may have gone stale, so a load that raced with it is not cached.
+        self._generation = 0
+        self._last_block = None
+        self._synced_at = 0
+        self.hits = 0
+        self.misses = 0
+
+    def sync(self):
+        # One sync at a time; lookups that find it running keep using the cache.
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            # Logs are read without holding _lock, so lookups never wait on a slow node.
+            with self._lock:
+                last_block, generation = self._last_block, self._generation
+            head = self.w3.eth.block_number
+            if last_block is None:
+                with self._lock:
+                    # Nothing is cached before the first sync, so there is nothing older to invalidate.
+                    if self._last_block is None:
+                        self._last_block = head
+            elif head > last_block:
+                invalidated, counts = self._read_logs(last_block + 1, head)
+                with self._lock:
+                    # Dropping entries is always safe. After a rewind or invalidation meanwhile
+                    # the counts may be older than what is cached, so the range is read again.
+                    for address in invalidated:
+                        self._entries.pop(address, None)
+                    if self._generation != generation:
+                        return
+                    for address, count in counts:
+                        info = self._entries.get(address)
+                        if info is not None and info is not _NOT_REGISTERED:
+                            info['total_certificate'] = count
+                    self._last_block = head
+                    self._generation += 1
+            self._synced_at = time.time()
+        finally:
+            self._sync_lock.release()
+
+    def _read_logs(self, from_block: int, to_block: int):
+        """Addresses whose info changed, and (address, new count) pairs in log order."""
+        events = self.issuer_registry.events
+        invalidated = set()
+        for name in INVALIDATING_EVENTS:
+            for event in iter_logs(getattr(events, name), from_block, to_block):
+                invalidated.add(_event_address(event))
+        counts = [(event['args']['issuerAddress'], event['args']['newCount'])
+                  for event in iter_logs(events.CertificateCountUpdated, from_block, to_block)]
+        return invalidated, counts
+
+    def invalidate(self, address: str):
+        with self._lock:
+            self._entries.pop(address, None)
+            self._generation += 1
+
+    def rewind(self, block_number: int):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            if self._last_block is not None:
+                self._last_block = min(self._last_block, block_number - 1)
+
+    def _load(self, address: str):
+        if self.fast_calls is not None:
+            registered = self.fast_calls.is_address_registered(address).call()
+        else:
+            registered = self.issuer_registry.functions.isAddressRegistered(address).call()
+        if not registered:
+            return _NOT_REGISTERED
+        info = self.issuer_registry.functions.getIssuerInfo(address).call()
+        return {
+            'name': info[0],
+            'location': info[1],
+            'registration_time': info[2],
+            'is_active': info[3],
+            'total_certificate': info[4]
+        }
+
+    def get_many(self, addresses: list) -> dict:
+        """Maps each checksummed address to its info dict, or None if it is not registered."""
+        if time.time() - self._synced_at >= self.sync_interval:
+            self.sync()
+        results = {}
+        for address in addresses:
+            with self._lock:
+                info = self._entries.get(address)
+                if info is not None:
+                    self._entries.move_to_end(address)
+                generation = self._generation
+            if info is None:
+                self.misses += 1
+                info = self._load(address)
+                with self._lock:
+                    # A sync, rewind or invalidation during the read may have changed this
+                    # issuer after the value was read; answer with it but do not keep it.
+                    if self._generation == generation:
+                        self._entries[address] = info
+                        while len(self._entries) > self.max_entries:
+                            self._entries.popitem(last=False)
+            else:
+                self.hits += 1
+            results[address] = None if info is _NOT_REGISTERED else dict(info)
+        return results
+
+    def get(self, address: str):
+        return self.get_many([address])[address]
+
+    def stats(self) -> dict:
+        return {'entries': len(self._entries), 'max_entries': self.max_entries, 'hits': self.hits, 'misses': self.misses,
+                'last_block': self._last_block}
@@ -0,0 +1,213 @@
+from eth_abi import encode
+from eth_utils import keccak
+from pathlib import Path
+from datetime import datetime
+import json
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Built batches and the certificate hash -> batch index (batches.sqlite3).
+MERKLE_DIR = Path(__file__).resolve().parent.parent / 'data' / 'merkle_batches'
+
+
+def merkle_leaf(cert_hash: bytes, recipient: str) -> bytes:
+    # Mirrors CertificateStore.merkleLeaf: double-hashed to rule out second preimages.
+    return keccak(keccak(encode(['bytes32', 'address'], [cert_hash, recipient])))
+
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    # OpenZeppelin MerkleProof hashes sorted pairs, so proofs carry no left/right flags.
+    return keccak(a + b if a < b else b + a)
+
+
+def recover_root_signer(merkle_root: bytes, signature: str) -> str:
+    """Address that signed merkle_root as an EIP-191 personal message."""
+    # eth_account pulls in py_ecc and is slow to import; only batch building needs it.
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+    return Account.recover_message(encode_defunct(primitive=merkle_root), signature=signature)
+
+
+class MerkleTree:
+    def __init__(self, leaves: list):
+        if not leaves:
+            raise ValueError('Merkle tree needs at least one leaf')
+        self.layers = [list(leaves)]
+        while len(self.layers[-1]) > 1:
+            level = self.layers[-1]
+            parents = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.layers.append(parents)
+
+    @property
+    def root(self) -> bytes:
+        return self.layers[-1][0]
+
+    def proof(self, index: int) -> list:
+        proof = []
+        for level in self.layers[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append(level[sibling])
+            index //= 2
+        return proof
+
+    @staticmethod
+    def verify(proof: list, root: bytes, leaf: bytes) -> bool:
+        computed = leaf
+        for node in proof:
+            computed = _hash_pair(computed, node)
+        return computed == root
+
+
+class MerkleBatchConflict(Exception):
+    """Raised when certificates in a new batch already belong to another batch."""
+
+    def __init__(self, batched: dict):
+        super().__init__(f"{len(batched)} certificates already belong to a Merkle batch")
+        self.batched = batched
+
+
+class MerkleBatchStore:
+    """Built batches in one SQLite file shared by every worker.
+
+    Each batch row keeps its leaves so proofs can be rebuilt; the leaves table maps
+    a certificate hash to its batch and position. A hash belongs to at most one
+    batch at a time; a batch that was never anchored can be replaced (see
+    build_batch), which frees every hash it held.
+    """
+
+    def __init__(self, directory: Path = MERKLE_DIR):
+        self.directory = directory
+        self.path = str(directory / 'batches.sqlite3')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._trees = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        db = self._connection()
+        db.execute('CREATE TABLE IF NOT EXISTS merkle_batches (merkle_root TEXT PRIMARY KEY, issuer TEXT NOT NULL, '
+                   'created_at TEXT NOT NULL, leaves TEXT NOT NULL)')
+        db.execute('CREATE TABLE IF NOT EXISTS merkle_leaves (certificate_hash TEXT PRIMARY KEY, '
+                   'merkle_root TEXT NOT NULL, leaf_index INTEGER NOT NULL)')
+        self._import_json_batches(db)
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            self._local.db = db
+        return db
+
+    def _import_json_batches(self, db):
+        # Batches used to be stored as <root>.json files next to an index.json.
+        for batch_file in self.directory.glob('0x*.json'):
+            with open(batch_file, 'r') as f:
+                batch = json.load(f)
+            try:
+                self._insert(db, batch)
+            except MerkleBatchConflict:
+                pass
+            batch_file.rename(batch_file.with_suffix('.json.imported'))
+        index_file = self.directory / 'index.json'
+        if index_file.exists():
+            index_file.rename(index_file.with_suffix('.json.imported'))
+
+    def _insert(self, db, batch: dict, replace=()):
+        hashes = [cert_hash.lower() for cert_hash, _ in batch['leaves']]
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            batched = {}
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                rows = db.execute('SELECT certificate_hash, merkle_root FROM merkle_leaves WHERE certificate_hash IN '
+                                  f"({','.join('?' * len(chunk))})", chunk).fetchall()
+                batched.update(rows)
+            conflicts = {cert_hash: root for cert_hash, root in batched.items() if root not in replace}
+            if conflicts:
+                raise MerkleBatchConflict(conflicts)
+            replaced = set(batched.values())
+            for root in replaced:
+                db.execute('DELETE FROM merkle_leaves WHERE merkle_root = ?', (root,))
+                db.execute('DELETE FROM merkle_batches WHERE merkle_root = ?', (root,))
+            db.execute('INSERT INTO merkle_batches VALUES (?, ?, ?, ?)',
+                       (batch['merkle_root'], batch['issuer'], batch['created_at'], json.dumps(batch['leaves'])))
+            db.executemany('INSERT INTO merkle_leaves VALUES (?, ?, ?)',
+                           [(cert_hash, batch['merkle_root'], i) for i, cert_hash in enumerate(hashes)])
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        if replaced:
+            with self._lock:
+                for root in replaced:
+                    self._trees.pop(root, None)
+            logger.info(f"Replaced unanchored Merkle batches {sorted(replaced)}")
+
+    def _load_batch(self, root_hex: str):
+        with self._lock:
+            cached = self._trees.get(root_hex)
+        if cached is None:
+            issuer, created_at, leaves = self._connection().execute(
+                'SELECT issuer, created_at, leaves FROM merkle_batches WHERE merkle_root = ?', (root_hex,)
+            ).fetchone()
+            leaves = json.loads(leaves)
+            tree = MerkleTree([merkle_leaf(bytes.fromhex(h[2:]), r) for h, r in leaves])
+            cached = ({'merkle_root': root_hex, 'issuer': issuer, 'created_at': created_at, 'leaves': leaves}, tree)
+            with self._lock:
+                self._trees[root_hex] = cached
+        return cached
+
+    def lookup(self, cert_hash: bytes):
+        row = self._connection().execute(
+            'SELECT merkle_root, leaf_index FROM merkle_leaves WHERE certificate_hash = ?', ('0x' + cert_hash.hex(),)
+        ).fetchone()
+        if row is None:
+            return None
+        root_hex, index = row
+        batch, tree = self._load_batch(root_hex)
+        return {
+            'merkle_root': batch['merkle_root'],
+            'issuer': batch['issuer'],
+            'created_at': batch['created_at'],
+            'recipient': batch['leaves'][index][1],
+            'leaf_index': index,
+            'proof': ['0x' + node.hex() for node in tree.proof(index)]
+        }
+
+    @staticmethod
+    def batch_root(certificates: list) -> bytes:
+        return MerkleTree([merkle_leaf(cert_hash, recipient) for cert_hash, recipient in certificates]).root
+
+    def build_batch(self, issuer: str, certificates: list, replace=()) -> dict:
+        """Builds and stores a batch from (hash bytes, checksum recipient) pairs.
+
+        Batches whose roots are in replace are dropped along with all their hashes.
+        The caller must have checked that none of them is anchored. Raises
+        MerkleBatchConflict if any hash is in another batch.
+        """
+        root_hex = '0x' + self.batch_root(certificates).hex()
+        batch = {
+            'merkle_root': root_hex,
+            'issuer': issuer,
+            'created_at': datetime.now().isoformat(),
+            'leaves': [['0x' + cert_hash.hex(), recipient] for cert_hash, recipient in certificates]
+        }
+        self._insert(self._connection(), batch, set(replace))
+        logger.info(f"Built Merkle batch {root_hex} with {len(certificates)} certificates")
+        return {'merkle_root': root_hex, 'certificate_count': len(certificates)}
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_merkle_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MerkleBatchStore()
+    return _store
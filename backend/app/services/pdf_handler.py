@@ -1,6 +1,5 @@
 import hashlib
 from werkzeug.datastructures import FileStorage
-import PyPDF2
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,6 +23,8 @@ class PDFHandler:
         if size == 0:
             return False, "File is empty"
         
+        # Imported on the first upload; most requests never parse a PDF.
+        import PyPDF2
         try:
             pdf = PyPDF2.PdfReader(file)
             if len(pdf.pages) == 0:
@@ -0,0 +1,242 @@
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    return value
+
+
+def read_key(contract_function, block_number: int) -> tuple:
+    """Cache key for a contract read: (contract, function, arguments, block)."""
+    return (contract_function.address, contract_function.fn_name,
+            _freeze(contract_function.args or ()), block_number)
+
+
+class BlockReadCache:
+    """LRU cache of contract reads at fixed block numbers.
+
+    State at a confirmed block never changes, so those entries have no TTL and
+    only fall out when the cache is full. Reads at recent blocks can be stored
+    with a TTL and are dropped by invalidate_from() when those blocks reorg.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns (True, value) on a hit and (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[2] is None or entry[2] > time.time()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, block_number: int = None, ttl: float = None):
+        """Stores value; with ttl it expires, and block_number lets a reorg drop it."""
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, block_number, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_from(self, block_number: int) -> int:
+        """Drops every entry read at block_number or later; returns how many were dropped."""
+        with self._lock:
+            stale = [k for k, entry in self._entries.items() if entry[1] is not None and entry[1] >= block_number]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def trim_below(self, block_number: int):
+        """Nothing to do here: entries carry their own block number."""
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'backend': 'memory', 'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'permanent': sum(1 for entry in self._entries.values() if entry[2] is None),
+                    'hits': self.hits, 'misses': self.misses}
+
+
+def _encode(value) -> str:
+    def default(obj):
+        if isinstance(obj, (bytes, bytearray)):
+            return {'__bytes__': bytes(obj).hex()}
+        raise TypeError(f"Cannot cache {type(obj).__name__}")
+    return json.dumps(value, default=default, separators=(',', ':'))
+
+
+def _decode(data):
+    return json.loads(data, object_hook=lambda d: bytes.fromhex(d['__bytes__']) if '__bytes__' in d else d)
+
+
+def _key_string(namespace: str, key) -> str:
+    return f"{namespace}:{hashlib.blake2b(_encode(key).encode(), digest_size=16).hexdigest()}"
+
+
+class SQLiteReadCache:
+    """BlockReadCache backed by one SQLite file shared by every worker on a host.
+
+    Values are stored as JSON, so tuples come back as lists. Expired rows and
+    the oldest rows beyond max_entries are pruned every PRUNE_EVERY writes.
+    """
+
+    PRUNE_EVERY = 500
+
+    def __init__(self, path, namespace: str, max_entries: int):
+        self.path = str(path)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS read_cache (key TEXT PRIMARY KEY, namespace TEXT NOT NULL, '
+                       'value TEXT NOT NULL, block INTEGER, expires_at REAL, stored_at REAL NOT NULL)')
+            db.execute('CREATE INDEX IF NOT EXISTS read_cache_block ON read_cache (namespace, block)')
+            db.execute('CREATE INDEX IF NOT EXISTS read_cache_stored ON read_cache (namespace, stored_at)')
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value, expires_at FROM read_cache WHERE key = ?', (_key_string(self.namespace, key),)
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, _decode(row[0])
+
+    def set(self, key, value, block_number: int = None, ttl: float = None):
+        now = time.time()
+        db = self._connection()
+        db.execute('INSERT OR REPLACE INTO read_cache VALUES (?, ?, ?, ?, ?, ?)',
+                   (_key_string(self.namespace, key), self.namespace, _encode(value), block_number,
+                    now + ttl if ttl is not None else None, now))
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune(db, now)
+
+    def _prune(self, db, now):
+        db.execute('DELETE FROM read_cache WHERE namespace = ? AND expires_at <= ?', (self.namespace, now))
+        db.execute('DELETE FROM read_cache WHERE key IN (SELECT key FROM read_cache WHERE namespace = ? '
+                   'ORDER BY stored_at DESC LIMIT -1 OFFSET ?)', (self.namespace, self.max_entries))
+
+    def invalidate_from(self, block_number: int) -> int:
+        return self._connection().execute('DELETE FROM read_cache WHERE namespace = ? AND block >= ?',
+                                          (self.namespace, block_number)).rowcount
+
+    def trim_below(self, block_number: int):
+        """Nothing to do here: rows carry their own block number."""
+
+    def clear(self):
+        self._connection().execute('DELETE FROM read_cache WHERE namespace = ?', (self.namespace,))
+
+    def stats(self) -> dict:
+        entries, permanent = self._connection().execute(
+            'SELECT COUNT(*), COUNT(*) - COUNT(expires_at) FROM read_cache WHERE namespace = ?', (self.namespace,)
+        ).fetchone()
+        return {'backend': 'sqlite', 'entries': entries, 'max_entries': self.max_entries,
+                'permanent': permanent, 'hits': self.hits, 'misses': self.misses}
+
+
+class RedisReadCache:
+    """BlockReadCache backed by Redis or any server speaking its protocol.
+
+    Entries without a TTL are evicted by the server's maxmemory policy
+    (allkeys-lru is recommended). A sorted set per namespace maps keys to
+    their block so invalidate_from() can find them; trim_below() drops members
+    for finalized blocks, which no reorg is expected to reach.
+    """
+
+    def __init__(self, client, namespace: str, max_entries: int):
+        self.client = client
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.blocks_key = f"{namespace}:blocks"
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        data = self.client.get(_key_string(self.namespace, key))
+        if data is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, _decode(data)
+
+    def set(self, key, value, block_number: int = None, ttl: float = None):
+        key = _key_string(self.namespace, key)
+        pipe = self.client.pipeline()
+        if ttl is not None:
+            pipe.set(key, _encode(value), px=max(1, int(ttl * 1000)))
+        else:
+            pipe.set(key, _encode(value))
+        if block_number is not None:
+            pipe.zadd(self.blocks_key, {key: block_number})
+        pipe.execute()
+
+    def invalidate_from(self, block_number: int) -> int:
+        keys = self.client.zrangebyscore(self.blocks_key, block_number, '+inf')
+        if not keys:
+            return 0
+        pipe = self.client.pipeline()
+        pipe.delete(*keys)
+        pipe.zremrangebyscore(self.blocks_key, block_number, '+inf')
+        pipe.execute()
+        return len(keys)
+
+    def trim_below(self, block_number: int):
+        """Removes index members for blocks below block_number; the cached values stay."""
+        return self.client.zremrangebyscore(self.blocks_key, '-inf', f"({block_number}")
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.namespace}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {'backend': 'redis', 'max_entries': self.max_entries, 'hits': self.hits, 'misses': self.misses}
+
+
+def create_read_cache(config, namespace: str, max_entries: int):
+    """Builds the cache selected by CACHE_BACKEND: memory (per worker), sqlite or redis (shared)."""
+    backend = config.get('CACHE_BACKEND', 'memory')
+    if backend == 'sqlite':
+        return SQLiteReadCache(config['CACHE_SQLITE_PATH'], namespace, max_entries)
+    if backend == 'redis':
+        import redis
+        return RedisReadCache(redis.Redis.from_url(config['CACHE_REDIS_URL']), namespace, max_entries)
+    return BlockReadCache(max_entries)
@@ -0,0 +1,122 @@
+from eth_abi.packed import encode_packed
+from eth_utils import keccak, to_checksum_address, ValidationError
+from flask import current_app
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A receipt signs keccak256(abi.encodePacked(chainId, certificateStore, certificateHash,
+# status, issuer, blockNumber, expiresAt)) as an EIP-191 personal message, so it can be
+# checked offline with any Ethereum library or with ecrecover in a contract.
+RECEIPT_TYPES = ['uint256', 'address', 'bytes32', 'uint8', 'address', 'uint64', 'uint64']
+STATUS_CODES = {'NOT_FOUND': 0, 'ACTIVE': 1, 'REVOKED': 2}
+ZERO_ADDRESS = '0x' + '00' * 20
+
+
+def receipt_digest(receipt: dict) -> bytes:
+    return keccak(encode_packed(RECEIPT_TYPES, [
+        receipt['chain_id'],
+        to_checksum_address(receipt['certificate_store']),
+        bytes.fromhex(receipt['certificate_hash'][2:]),
+        STATUS_CODES[receipt['status']],
+        to_checksum_address(receipt['issuer'] or ZERO_ADDRESS),
+        receipt['block_number'],
+        receipt['expires_at']
+    ]))
+
+
+def recover_receipt_signer(receipt: dict) -> str:
+    # eth_account pulls in py_ecc and is slow to import; only signing and recovery need it.
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+    return Account.recover_message(encode_defunct(primitive=receipt_digest(receipt)),
+                                   signature=receipt['signature'])
+
+
+def check_receipt(receipt: dict, signer_address: str, now: float = None) -> bool:
+    """True when the receipt is signed by signer_address and has not expired."""
+    try:
+        if recover_receipt_signer(receipt).lower() != signer_address.lower():
+            return False
+        return (now if now is not None else time.time()) < receipt['expires_at']
+    except (KeyError, ValueError, TypeError, ValidationError):
+        return False
+
+
+class ReceiptSigningUnavailable(Exception):
+    pass
+
+
+class ReceiptSigner:
+    """Signs verification results and reuses them until they are close to expiry."""
+
+    def __init__(self, private_key: str, chain_id: int, certificate_store: str, ttl: int, max_entries: int = 10000):
+        from eth_account import Account
+        self._account = Account.from_key(private_key)
+        self.chain_id = chain_id
+        self.certificate_store = to_checksum_address(certificate_store)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    @property
+    def address(self) -> str:
+        return self._account.address
+
+    def cached(self, cert_hash: bytes):
+        """Returns a previously signed receipt with at least half its lifetime left."""
+        with self._lock:
+            receipt = self._cache.get(bytes(cert_hash))
+        if receipt and receipt['expires_at'] - time.time() >= self.ttl / 2:
+            return receipt
+        return None
+
+    def sign(self, cert_hash: bytes, status: str, issuer, block_number: int) -> dict:
+        from eth_account.messages import encode_defunct
+        receipt = {
+            'chain_id': self.chain_id,
+            'certificate_store': self.certificate_store,
+            'certificate_hash': '0x' + bytes(cert_hash).hex(),
+            'status': status,
+            'issuer': issuer or ZERO_ADDRESS,
+            'block_number': block_number,
+            'expires_at': int(time.time()) + self.ttl
+        }
+        signed = self._account.sign_message(encode_defunct(primitive=receipt_digest(receipt)))
+        receipt['signature'] = '0x' + bytes(signed.signature).hex()
+        receipt['signer'] = self.address
+        with self._lock:
+            if len(self._cache) >= self.max_entries:
+                now = time.time()
+                self._cache = {h: r for h, r in self._cache.items() if r['expires_at'] > now}
+                if len(self._cache) >= self.max_entries:
+                    self._cache.clear()
+            self._cache[bytes(cert_hash)] = receipt
+        return receipt
+
+
+_signer = None
+_signer_lock = threading.Lock()
+
+def get_receipt_signer():
+    global _signer
+    if _signer is None:
+        key = current_app.config.get('RECEIPT_SIGNING_KEY')
+        if not key:
+            raise ReceiptSigningUnavailable('Receipt signing is not configured (RECEIPT_SIGNING_KEY)')
+        if key.lower().removeprefix('0x') == current_app.config['DEPLOYER_PRIVATE_KEY'].lower().removeprefix('0x'):
+            raise ReceiptSigningUnavailable('RECEIPT_SIGNING_KEY must not be the deployer key')
+        from app.services.blockchain import get_blockchain_service
+        with _signer_lock:
+            if _signer is None:
+                # Signed over the chain the node reports, not the configured NETWORK_ID.
+                _signer = ReceiptSigner(
+                    key,
+                    get_blockchain_service().chain_id,
+                    current_app.config['CERTIFICATE_STORE_ADDRESS'],
+                    current_app.config['RECEIPT_TTL']
+                )
+    return _signer
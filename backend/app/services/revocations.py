@@ -0,0 +1,73 @@
+from app.services.chain_logs import iter_logs
+from bisect import bisect_left, bisect_right
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationLog:
+    """Revoked certificate hashes ordered by block, synced from revocation logs.
+
+    Covers both CertificateRevoked and MerkleCertificateRevoked so a relying
+    party can check any certificate hash against one list.
+    """
+
+    def __init__(self, w3, certificate_store, sync_interval: float):
+        self.w3 = w3
+        self.certificate_store = certificate_store
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._blocks = []
+        self._hashes = []
+        self._revoked = {}
+        self._last_block = -1
+        self._synced_at = 0
+
+    @property
+    def last_block(self) -> int:
+        return self._last_block
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+            self._synced_at = time.time()
+
+    def rewind(self, block_number: int):
+        """Forgets revocations from block_number on so the next sync re-reads them."""
+        with self._lock:
+            keep = bisect_left(self._blocks, block_number)
+            for cert_hash in self._hashes[keep:]:
+                self._revoked.pop(cert_hash, None)
+            del self._blocks[keep:], self._hashes[keep:]
+            self._last_block = min(self._last_block, block_number - 1)
+
+    def revocation_block(self, cert_hash: bytes):
+        """Block in which cert_hash was revoked, or None if it is not revoked as of last_block."""
+        return self._revoked.get(bytes(cert_hash))
+
+    def _sync(self):
+        head = self.w3.eth.block_number
+        if head <= self._last_block:
+            return
+        events = self.certificate_store.events
+        entries = [(e['blockNumber'], e['logIndex'], bytes(e['args']['certificateHash']))
+                   for event in (events.CertificateRevoked, events.MerkleCertificateRevoked)
+                   for e in iter_logs(event, self._last_block + 1, head)]
+        for block, _, cert_hash in sorted(entries):
+            self._blocks.append(block)
+            self._hashes.append(cert_hash)
+            self._revoked[cert_hash] = block
+        self._last_block = head
+        if entries:
+            logger.info(f"Revocation list at block {head}: {len(self._hashes)} revoked (+{len(entries)})")
+
+    def revoked_since(self, since: int = -1) -> tuple:
+        """Returns (block_number, hashes revoked in (since, block_number])."""
+        with self._lock:
+            if time.time() - self._synced_at >= self.sync_interval:
+                self._sync()
+                self._synced_at = time.time()
+            start = bisect_right(self._blocks, since)
+            return self._last_block, self._hashes[start:]
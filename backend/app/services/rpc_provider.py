@@ -0,0 +1,199 @@
+from web3 import Web3
+from web3.providers.base import BaseProvider
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from collections import deque
+import random
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Anything that touches the deployer's nonce or a just-sent transaction goes to the
+# primary endpoint, so a write and its follow-up reads see the same mempool.
+PINNED_METHODS = {
+    'eth_sendRawTransaction',
+    'eth_sendTransaction',
+    'eth_getTransactionCount',
+    'eth_getTransactionReceipt',
+    'eth_getTransactionByHash'
+}
+
+_local = threading.local()
+
+
+class NodeError(Exception):
+    """A JSON-RPC error response caused by the node (missing state, rate limit, internal
+    error) rather than by the call itself; the read is retried on another endpoint."""
+
+    def __init__(self, uri: str, response: dict):
+        super().__init__(f"{uri}: {response['error']}")
+        self.response = response
+
+
+def is_execution_error(error) -> bool:
+    """True for errors the EVM produced (reverts, invalid opcodes), which every node reports alike."""
+    if not isinstance(error, dict):
+        return False
+    if error.get('code') == 3:
+        return True
+    message = str(error.get('message', '')).lower()
+    return 'revert' in message or 'vm exception' in message or 'invalid opcode' in message
+
+
+@contextmanager
+def hedged_reads():
+    """Reads issued inside this block send a second request if the first is slow."""
+    previous = getattr(_local, 'hedged', False)
+    _local.hedged = True
+    try:
+        yield
+    finally:
+        _local.hedged = previous
+
+
+class Endpoint:
+    def __init__(self, uri: str, timeout: float, window: int = 200):
+        self.uri = uri
+        # Failover is handled here, so the per-endpoint provider does not retry on its own.
+        self.provider = Web3.HTTPProvider(uri, request_kwargs={'timeout': timeout},
+                                          exception_retry_configuration=None)
+        self.latencies = deque(maxlen=window)
+        self.ewma = None
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.down_until = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.down_until
+
+    def record(self, latency: float):
+        self.latencies.append(latency)
+        self.ewma = latency if self.ewma is None else 0.8 * self.ewma + 0.2 * latency
+        self.consecutive_failures = 0
+
+    def percentile(self, pct: float):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class MultiEndpointProvider(BaseProvider):
+    """Spreads JSON-RPC reads over several nodes, failing over and hedging slow calls.
+
+    Reads go to the better of two randomly chosen healthy endpoints by recent
+    latency. Writes and transaction lookups stay on the first endpoint. A JSON-RPC
+    error response on a read counts as an endpoint failure unless the EVM raised it.
+    """
+
+    def __init__(self, uris: list, timeout: float = 10, hedge_percentile: float = 95,
+                 hedge_min_delay: float = 0.02, failure_threshold: int = 3, cooldown: float = 10):
+        super().__init__()
+        if not uris:
+            raise ValueError('At least one RPC endpoint is required')
+        self.endpoints = [Endpoint(uri, timeout) for uri in uris]
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4 * len(uris) + 4, thread_name_prefix='rpc-hedge')
+
+    def __str__(self):
+        return f"MultiEndpointProvider({', '.join(e.uri for e in self.endpoints)})"
+
+    def _call(self, endpoint: Endpoint, method, params, node_errors_fail: bool = True):
+        started = time.monotonic()
+        try:
+            response = endpoint.provider.make_request(method, params)
+            if node_errors_fail and 'error' in response and not is_execution_error(response['error']):
+                raise NodeError(endpoint.uri, response)
+        except Exception:
+            with self._lock:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.failure_threshold:
+                    endpoint.down_until = time.time() + self.cooldown
+                    logger.warning(f"RPC endpoint {endpoint.uri} marked down for {self.cooldown}s")
+            raise
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.record(time.monotonic() - started)
+        return response
+
+    def _ranked(self) -> list:
+        """Healthy endpoints, best first; falls back to every endpoint if none are healthy."""
+        now = time.time()
+        healthy = [e for e in self.endpoints if e.is_healthy(now)] or list(self.endpoints)
+        if len(healthy) > 2:
+            first, second = random.sample(healthy, 2)
+        else:
+            first, second = (healthy + healthy)[:2]
+        best = min((first, second), key=lambda e: e.ewma if e.ewma is not None else 0)
+        return [best] + [e for e in healthy if e is not best]
+
+    def _hedge_delay(self, endpoint: Endpoint) -> float:
+        threshold = endpoint.percentile(self.hedge_percentile)
+        return max(self.hedge_min_delay, threshold if threshold is not None else 0)
+
+    def _hedged(self, candidates: list, method, params):
+        primary = self._executor.submit(self._call, candidates[0], method, params)
+        done, _ = wait([primary], timeout=self._hedge_delay(candidates[0]))
+        if done and primary.exception() is None:
+            return primary.result()
+        pending = [primary] if not done else []
+        pending.append(self._executor.submit(self._call, candidates[1], method, params))
+        error = primary.exception() if done else None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            pending = list(pending)
+        return self._give_up(error)
+
+    @staticmethod
+    def _give_up(error: Exception):
+        # Once every endpoint has failed, a node error goes back to web3 as the response
+        # it was, so callers see the usual Web3RPCError.
+        if isinstance(error, NodeError):
+            return error.response
+        raise error
+
+    def make_request(self, method, params):
+        if method in PINNED_METHODS:
+            # Errors such as "nonce too low" belong to the transaction, not the endpoint.
+            return self._call(self.endpoints[0], method, params, node_errors_fail=False)
+
+        candidates = self._ranked()
+        if getattr(_local, 'hedged', False) and len(candidates) > 1:
+            return self._hedged(candidates, method, params)
+
+        error = None
+        for endpoint in candidates:
+            try:
+                return self._call(endpoint, method, params)
+            except Exception as e:
+                logger.warning(f"RPC {method} failed on {endpoint.uri}: {e}")
+                error = e
+        return self._give_up(error)
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(e.provider.is_connected(show_traceback) for e in self.endpoints)
+
+    def endpoint_stats(self) -> list:
+        now = time.time()
+        with self._lock:
+            return [{
+                'uri': e.uri,
+                'healthy': e.is_healthy(now),
+                'requests': e.requests,
+                'failures': e.failures,
+                'ewma_ms': round(e.ewma * 1000, 2) if e.ewma is not None else None,
+                'p50_ms': round(e.percentile(50) * 1000, 2) if e.latencies else None,
+                f'p{self.hedge_percentile:g}_ms': round(e.percentile(self.hedge_percentile) * 1000, 2) if e.latencies else None
+            } for e in self.endpoints]
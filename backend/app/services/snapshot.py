@@ -0,0 +1,413 @@
+from web3 import Web3
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from app.services.chain_logs import iter_logs
+from app.services.blockchain import ChainDataUnavailable
+from pathlib import Path
+from contextlib import contextmanager
+from typing import NamedTuple
+import struct
+import threading
+import time
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Snapshot file: plain header, zlib-compressed body, 65-byte signature over
+# keccak(header + body). The body holds the issuer table followed by the
+# certificate table sorted by hash. A delta has FLAG_DELTA set and carries only
+# records that changed in (base_block, block_number]; issuers are always complete.
+MAGIC = b'CSNP'
+VERSION = 1
+FLAG_DELTA = 1
+HEADER = struct.Struct('<4sHHQQQ32sdII')
+ISSUER = struct.Struct('<20sQQB')
+CERTIFICATE = struct.Struct('<32sI20sQQ')
+STRING_LENGTH = struct.Struct('<H')
+SIGNATURE_SIZE = 65
+LOOKUP_SIZE = 250
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _pack_string(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return STRING_LENGTH.pack(len(data)) + data
+
+
+def _unpack_string(body: bytes, offset: int):
+    (length,) = STRING_LENGTH.unpack_from(body, offset)
+    offset += STRING_LENGTH.size
+    return body[offset:offset + length].decode('utf-8'), offset + length
+
+
+def encode_snapshot(meta: dict, issuers: list, certificates: list, private_key: str) -> bytes:
+    issuer_index = {issuer['address']: i for i, issuer in enumerate(issuers)}
+    body = bytearray()
+    for issuer in issuers:
+        body += ISSUER.pack(bytes.fromhex(issuer['address'][2:]), issuer['registration_time'],
+                            issuer['total_certificate'], issuer['is_active'])
+        body += _pack_string(issuer['name']) + _pack_string(issuer['location'])
+    for cert in sorted(certificates, key=lambda c: c['hash']):
+        body += CERTIFICATE.pack(cert['hash'], issuer_index[cert['issuer']], bytes.fromhex(cert['recipient'][2:]),
+                                 cert['issuance_time'], cert['revocation_time'])
+
+    header = HEADER.pack(MAGIC, VERSION, FLAG_DELTA if meta.get('base_block') is not None else 0,
+                         meta['chain_id'], meta['block_number'], meta.get('base_block') or 0,
+                         meta['block_hash'], time.time(), len(issuers), len(certificates))
+    payload = header + zlib.compress(bytes(body), 9)
+    signed = Account.sign_message(encode_defunct(primitive=Web3.keccak(payload)), private_key)
+    return payload + bytes(signed.signature)
+
+
+def decode_snapshot(data: bytes, signer_address: str) -> dict:
+    payload, signature = data[:-SIGNATURE_SIZE], data[-SIGNATURE_SIZE:]
+    recovered = Account.recover_message(encode_defunct(primitive=Web3.keccak(payload)), signature=signature)
+    if recovered.lower() != signer_address.lower():
+        raise SnapshotError(f"Snapshot signed by {recovered}, expected {signer_address}")
+
+    magic, version, flags, chain_id, block_number, base_block, block_hash, created_at, issuer_count, cert_count = \
+        HEADER.unpack_from(payload, 0)
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot format (version {version})")
+    body = zlib.decompress(payload[HEADER.size:])
+
+    issuers, offset = [], 0
+    for _ in range(issuer_count):
+        address, registration_time, total, active = ISSUER.unpack_from(body, offset)
+        name, offset = _unpack_string(body, offset + ISSUER.size)
+        location, offset = _unpack_string(body, offset)
+        issuers.append({
+            'address': Web3.to_checksum_address(address),
+            'name': name,
+            'location': location,
+            'registration_time': registration_time,
+            'is_active': bool(active),
+            'total_certificate': total
+        })
+
+    certificates = []
+    for _ in range(cert_count):
+        cert_hash, issuer_idx, recipient, issuance_time, revocation_time = CERTIFICATE.unpack_from(body, offset)
+        offset += CERTIFICATE.size
+        certificates.append({
+            'hash': cert_hash,
+            'issuer': issuers[issuer_idx]['address'],
+            'recipient': Web3.to_checksum_address(recipient),
+            'issuance_time': issuance_time,
+            'revocation_time': revocation_time
+        })
+
+    return {
+        'is_delta': bool(flags & FLAG_DELTA),
+        'chain_id': chain_id,
+        'block_number': block_number,
+        'base_block': base_block if flags & FLAG_DELTA else None,
+        'block_hash': '0x' + block_hash.hex(),
+        'created_at': created_at,
+        'issuers': issuers,
+        'certificates': certificates
+    }
+
+
+def export_snapshot(blockchain, private_key: str, block_number: int = None, base_block: int = None) -> bytes:
+    """Exports registry and certificate state at block_number (default: latest).
+
+    With base_block the result is a delta holding only certificates issued or
+    revoked after base_block. Merkle-anchored batches are not included.
+    """
+    w3 = blockchain.w3
+    block = w3.eth.get_block(block_number if block_number is not None else 'latest')
+    at = block['number']
+    store, registry = blockchain.certificate_store, blockchain.issuer_registry
+
+    start = base_block + 1 if base_block is not None else 0
+    changed = {bytes(e['args']['certificateHash']) for e in iter_logs(store.events.CertificateIssued, start, at)}
+    changed |= {bytes(e['args']['certificateHash']) for e in iter_logs(store.events.CertificateRevoked, start, at)}
+    changed = sorted(changed)
+
+    certificates = []
+    for i in range(0, len(changed), LOOKUP_SIZE):
+        chunk = changed[i:i + LOOKUP_SIZE]
+        exists, issuers, recipients, issuance, _, revocation, _ = \
+            store.functions.verifyCertificates(chunk).call(block_identifier=at)
+        for j, cert_hash in enumerate(chunk):
+            if exists[j]:
+                certificates.append({'hash': cert_hash, 'issuer': issuers[j], 'recipient': recipients[j],
+                                     'issuance_time': issuance[j], 'revocation_time': revocation[j]})
+
+    issuers = []
+    total = registry.functions.getTotalIssuers().call(block_identifier=at)
+    for page_start in range(0, total, 100):
+        addresses, _ = registry.functions.getAllIssuers(page_start, 100).call(block_identifier=at)
+        for address in addresses:
+            info = registry.functions.getIssuerInfo(address).call(block_identifier=at)
+            issuers.append({'address': address, 'name': info[0], 'location': info[1],
+                            'registration_time': info[2], 'is_active': info[3], 'total_certificate': info[4]})
+
+    meta = {'chain_id': w3.eth.chain_id, 'block_number': at, 'block_hash': bytes(block['hash']),
+            'base_block': base_block}
+    logger.info(f"Exported snapshot at block {at}: {len(issuers)} issuers, {len(certificates)} certificates")
+    return encode_snapshot(meta, issuers, certificates, private_key)
+
+
+class SnapshotState(NamedTuple):
+    """One consistent view of the snapshot; replaced as a whole when a delta is applied."""
+    block_number: int
+    issuers: dict
+    certificates: dict
+    recipients: dict
+
+
+def apply_snapshot(state: SnapshotState, snapshot: dict) -> SnapshotState:
+    """Returns a new state with snapshot applied on top of state (None for a full snapshot)."""
+    certificates = dict(state.certificates) if state else {}
+    recipients = dict(state.recipients) if state else {}
+    added = {}
+    for cert in snapshot['certificates']:
+        if cert['hash'] not in certificates:
+            added.setdefault(cert['recipient'], []).append(cert)
+        certificates[cert['hash']] = cert
+    # Recipients list certificates in issuance order like the contract; a delta only
+    # holds blocks after the current state, so its certificates go after existing ones.
+    for recipient, certs in added.items():
+        certs.sort(key=lambda c: (c['issuance_time'], c['hash']))
+        recipients[recipient] = recipients.get(recipient, []) + [c['hash'] for c in certs]
+    issuers = {issuer['address']: issuer for issuer in snapshot['issuers']}
+    return SnapshotState(snapshot['block_number'], issuers, certificates, recipients)
+
+
+class SnapshotBlockchainService:
+    """Read-only BlockchainService backed by a signed snapshot plus delta files.
+
+    Deltas named <anything>.delta in the snapshot's directory are applied in
+    block order whenever their base_block matches the current state. Each read
+    works on one SnapshotState, so applying a delta never changes data under it.
+    """
+
+    VERIFY_BATCH_SIZE = 250
+    RECIPIENT_PAGE_SIZE = 100
+
+    def __init__(self, snapshot_path, signer_address: str, chain_id: int, recheck_interval: float = 5.0):
+        self.snapshot_path = Path(snapshot_path)
+        self.signer_address = signer_address
+        self.chain_id = chain_id
+        self.recheck_interval = recheck_interval
+        self.w3 = None
+        self._lock = threading.Lock()
+        self._checked_at = 0
+        self._state = None
+        self._load_base()
+
+    @property
+    def block_number(self) -> int:
+        return self._state.block_number
+
+    @property
+    def issuers(self) -> dict:
+        return self._state.issuers
+
+    @property
+    def certificates(self) -> dict:
+        return self._state.certificates
+
+    def _decode(self, path: Path) -> dict:
+        snapshot = decode_snapshot(path.read_bytes(), self.signer_address)
+        if snapshot['chain_id'] != self.chain_id:
+            raise SnapshotError(f"{path.name} is for chain {snapshot['chain_id']}, expected {self.chain_id}")
+        return snapshot
+
+    def _load_base(self):
+        snapshot = self._decode(self.snapshot_path)
+        if snapshot['is_delta']:
+            raise SnapshotError(f"{self.snapshot_path} is a delta, expected a full snapshot")
+        self._state = apply_snapshot(None, snapshot)
+        logger.info(f"Loaded snapshot at block {self.block_number}: {len(self.certificates)} certificates")
+
+    def _refresh(self) -> SnapshotState:
+        now = time.time()
+        if now - self._checked_at < self.recheck_interval:
+            return self._state
+        with self._lock:
+            self._checked_at = now
+            deltas = []
+            for path in self.snapshot_path.parent.glob('*.delta'):
+                try:
+                    deltas.append(self._decode(path))
+                except (SnapshotError, ValueError, zlib.error) as e:
+                    logger.error(f"Skipping snapshot delta {path.name}: {e}")
+            state = self._state
+            for delta in sorted(deltas, key=lambda d: d['block_number']):
+                if delta['base_block'] == state.block_number:
+                    state = apply_snapshot(state, delta)
+                    logger.info(f"Applied snapshot delta up to block {state.block_number}")
+            self._state = state
+        return self._state
+
+    def _checksum(self, address: str) -> str:
+        if not address or not isinstance(address, str) or not Web3.is_address(address):
+            raise ValueError("Invalid address")
+        return Web3.to_checksum_address(address)
+
+    def register_issuer_admin(self, issuer_address: str, name: str, location: str,
+                              on_submitted=None, pending_transaction: str = None) -> dict:
+        raise SnapshotError('Snapshot backend is read-only')
+
+    def get_active_issuers(self) -> list:
+        state = self._refresh()
+        return [{'address': i['address'], 'name': i['name']} for i in state.issuers.values() if i['is_active']]
+
+    def is_registered_issuer(self, address: str) -> bool:
+        state = self._refresh()
+        try:
+            issuer = state.issuers.get(self._checksum(address))
+        except ValueError:
+            return False
+        return bool(issuer and issuer['is_active'])
+
+    def get_issuer_info(self, address: str) -> dict:
+        state = self._refresh()
+        issuer = state.issuers.get(self._checksum(address))
+        if issuer is None:
+            raise ValueError('IssuerRegistry: Address not registered')
+        return {key: issuer[key] for key in ('name', 'location', 'registration_time', 'is_active', 'total_certificate')}
+
+    def get_issuers_info(self, addresses: list) -> dict:
+        state = self._refresh()
+        results = {}
+        for address in addresses:
+            issuer = state.issuers.get(self._checksum(address))
+            results[self._checksum(address)] = {key: issuer[key] for key in (
+                'name', 'location', 'registration_time', 'is_active', 'total_certificate')} if issuer else None
+        return results
+
+    def _verification(self, state: SnapshotState, cert):
+        if cert is None:
+            return {'is_valid': False, 'issuer': None, 'recipient': None, 'issuance_time': 0,
+                    'is_revoked': False, 'revocation_time': 0, 'issuer_name': ''}
+        issuer = state.issuers.get(cert['issuer'])
+        return {
+            'is_valid': True,
+            'issuer': cert['issuer'],
+            'recipient': cert['recipient'],
+            'issuance_time': cert['issuance_time'],
+            'is_revoked': cert['revocation_time'] != 0,
+            'revocation_time': cert['revocation_time'],
+            'issuer_name': issuer['name'] if issuer else 'Unknown Issuer'
+        }
+
+    def get_indexed_status(self, cert_hash: bytes):
+        cert = self._refresh().certificates.get(bytes(cert_hash))
+        if cert is None:
+            return 'NOT_FOUND'
+        return 'REVOKED' if cert['revocation_time'] else 'ACTIVE'
+
+    def get_certificate_status(self, cert_hash: bytes) -> str:
+        return self.get_indexed_status(cert_hash)
+
+    def verify_certificate(self, cert_hash: bytes) -> dict:
+        state = self._refresh()
+        result = self._verification(state, state.certificates.get(bytes(cert_hash)))
+        del result['revocation_time']
+        return result
+
+    def verify_certificates(self, cert_hashes: list) -> list:
+        state = self._refresh()
+        return [self._verification(state, state.certificates.get(bytes(h))) for h in cert_hashes]
+
+    def verify_merkle_certificate(self, merkle_root: bytes, cert_hash: bytes, recipient: str, proof: list) -> dict:
+        # Merkle batches are not part of snapshots; "not issued" would be a false negative.
+        raise ChainDataUnavailable('Merkle certificates cannot be verified in snapshot mode')
+
+    def is_merkle_root_anchored(self, merkle_root: bytes) -> bool:
+        raise ChainDataUnavailable('Merkle batches cannot be checked in snapshot mode')
+
+    def get_certificate_details(self, cert_hash: bytes) -> dict:
+        cert = self._refresh().certificates.get(bytes(cert_hash))
+        if cert is None:
+            raise ValueError('CertificateStore: Certificate does not exist')
+        return {
+            'certificate_hash': cert['hash'],
+            'issuer': cert['issuer'],
+            'recipient': cert['recipient'],
+            'issuance_time': cert['issuance_time'],
+            'is_revoked': cert['revocation_time'] != 0,
+            'revocation_time': cert['revocation_time']
+        }
+
+    def _records(self, state: SnapshotState, hashes: list) -> list:
+        records = []
+        for cert_hash in hashes:
+            verification = self._verification(state, state.certificates[cert_hash])
+            records.append({
+                'hash': '0x' + cert_hash.hex(),
+                'issuer': verification['issuer'],
+                'recipient': verification['recipient'],
+                'issuer_name': verification['issuer_name'],
+                'issuance_time': verification['issuance_time'],
+                'is_revoked': verification['is_revoked'],
+                'revocation_time': verification['revocation_time']
+            })
+        return records
+
+    def get_certificates_for_recipient_page(self, recipient_address: str, cursor: int = 0, limit: int = RECIPIENT_PAGE_SIZE) -> tuple:
+        state = self._refresh()
+        hashes = state.recipients.get(self._checksum(recipient_address), [])
+        page = hashes[cursor:cursor + limit]
+        next_cursor = cursor + len(page) if cursor + len(page) < len(hashes) else None
+        return [{k: v for k, v in r.items() if k != 'recipient'} for r in self._records(state, page)], next_cursor
+
+    def get_certificates_for_recipient(self, recipient_address: str) -> list:
+        try:
+            certificates, _ = self.get_certificates_for_recipient_page(recipient_address, 0, len(self.certificates) or 1)
+            return certificates
+        except Exception as e:
+            logger.error(f"Error getting recipient certificates: {e}")
+            return []
+
+    def get_certificates_issued_by(self, issuer_address: str, start: int = 0, limit: int = 50) -> dict:
+        state = self._refresh()
+        issuer = self._checksum(issuer_address)
+        hashes = sorted((c for c in state.certificates.values() if c['issuer'] == issuer),
+                        key=lambda c: (c['issuance_time'], c['hash']))
+        page = [c['hash'] for c in hashes[start:start + limit]]
+        return {
+            'certificates': [{k: v for k, v in r.items() if k != 'issuer'} for r in self._records(state, page)],
+            'start': start,
+            'has_more': start + limit < len(hashes),
+            'total_issued': len(hashes),
+            'total_revoked': sum(1 for c in hashes if c['revocation_time']),
+            # Merkle batches are not part of snapshots.
+            'merkle_issued': 0,
+            'merkle_revoked': 0
+        }
+
+    def get_revocations(self, since: int = -1) -> tuple:
+        # Snapshots do not record revocation blocks, so any older client gets the full list.
+        state = self._refresh()
+        if since >= state.block_number:
+            return state.block_number, []
+        return state.block_number, sorted(h for h, c in state.certificates.items() if c['revocation_time'])
+
+    @contextmanager
+    def pinned_block(self, block_number: int = None):
+        # Every read already comes from the one snapshot block.
+        yield
+
+    def get_block_number(self) -> int:
+        return self._refresh().block_number
+
+    def get_filter_metrics(self) -> dict:
+        return {}
+
+    def get_contract_stats(self) -> dict:
+        state = self._refresh()
+        return {
+            'total_issuers': len(state.issuers),
+            'active_issuers': sum(1 for i in state.issuers.values() if i['is_active']),
+            'total_certificates': len(state.certificates),
+            'total_revoked': sum(1 for c in state.certificates.values() if c['revocation_time'])
+        }
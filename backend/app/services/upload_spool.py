@@ -0,0 +1,155 @@
+from app.services.pdf_handler import get_pdf_handler
+from flask import current_app
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSpool:
+    """Validation results of uploaded PDFs, keyed by content.
+
+    Uploads are looked up by a cheap pre-key (size plus a digest of the first and
+    last SAMPLE_SIZE bytes) and a hit only counts once the upload's SHA-256 matches
+    the stored one, so a repeat upload costs one hash instead of a PDF parse.
+    Each result is a <pre-key>.json record. The directory is shared by the workers
+    on a host, so its size is rescanned after every tenth of max_bytes written here
+    and the least recently used records are evicted once it grows past max_bytes.
+    """
+
+    SAMPLE_SIZE = 64 * 1024
+
+    def __init__(self, directory, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._bytes = self._scan()[0]
+        self._written = 0
+        self.hits = 0
+        self.misses = 0
+
+    def pre_key(self, file) -> str:
+        file.seek(0, 2)
+        size = file.tell()
+        digest = hashlib.blake2b(size.to_bytes(8, 'big'), digest_size=16)
+        file.seek(0)
+        digest.update(file.read(self.SAMPLE_SIZE))
+        if size > self.SAMPLE_SIZE:
+            file.seek(max(self.SAMPLE_SIZE, size - self.SAMPLE_SIZE))
+            digest.update(file.read(self.SAMPLE_SIZE))
+        file.seek(0)
+        return f"{size:x}-{digest.hexdigest()}"
+
+    def _record_path(self, pre_key: str) -> Path:
+        return self.directory / f"{pre_key}.json"
+
+    def lookup(self, pre_key: str):
+        """Returns the stored record for pre_key, or None; the caller must still compare sha256."""
+        path = self._record_path(pre_key)
+        try:
+            with open(path, 'r') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return record
+
+    def store(self, pre_key: str, sha256: str, is_valid: bool, error: str):
+        record = {'sha256': sha256, 'is_valid': is_valid, 'error': error}
+        path = self._record_path(pre_key)
+        tmp = path.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+        with open(tmp, 'w') as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+        written = path.stat().st_size
+        with self._lock:
+            self._bytes += written
+            self._written += written
+            # Other workers write to the same directory; pick their records up now and then.
+            if self._written >= self.max_bytes / 10:
+                self._bytes = self._scan()[0]
+                self._written = 0
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """Total size of the directory and its records, oldest first."""
+        records = []
+        total = 0
+        for path in self.directory.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            total += stat.st_size
+            if path.suffix == '.json':
+                records.append((stat.st_mtime, stat.st_size, path))
+        records.sort()
+        return total, records
+
+    def _evict(self):
+        """Drops the least recently used records down to 90% of max_bytes."""
+        total, records = self._scan()
+        for _, size, path in records:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._bytes = total
+        self._written = 0
+
+    def stats(self) -> dict:
+        return {'bytes': self._bytes, 'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+_spool = None
+
+def get_upload_spool():
+    """The shared UploadSpool, or None when UPLOAD_SPOOL_ENABLED is off."""
+    global _spool
+    if _spool is None and current_app.config.get('UPLOAD_SPOOL_ENABLED'):
+        _spool = UploadSpool(current_app.config['UPLOAD_FOLDER'], current_app.config['UPLOAD_SPOOL_MAX_BYTES'])
+    return _spool
+
+
+def validate_and_hash(file) -> tuple[bool, str, str]:
+    """validate_pdf() followed by calculate_hash(), answered from the spool for repeat uploads.
+
+    Returns (is_valid, error, sha256 hex); the hash is None when the upload was
+    rejected before it was read.
+    """
+    pdf_handler = get_pdf_handler()
+    spool = get_upload_spool()
+    # Filename checks depend on the request, not the content, so they are never cached.
+    if spool is None or not file or not file.filename.lower().endswith('.pdf'):
+        is_valid, error = pdf_handler.validate_pdf(file)
+        return is_valid, error, pdf_handler.calculate_hash(file) if is_valid else None
+
+    pre_key = spool.pre_key(file)
+    record = spool.lookup(pre_key)
+    hash_hex = None
+    if record is not None:
+        hash_hex = pdf_handler.calculate_hash(file)
+        if hash_hex == record['sha256']:
+            spool.hits += 1
+            return record['is_valid'], record['error'], hash_hex
+    spool.misses += 1
+    is_valid, error = pdf_handler.validate_pdf(file)
+    if hash_hex is None:
+        hash_hex = pdf_handler.calculate_hash(file)
+    try:
+        spool.store(pre_key, hash_hex, is_valid, error)
+    except OSError as e:
+        logger.error(f"Upload spool write failed: {e}")
+    return is_valid, error, hash_hex
@@ -0,0 +1,84 @@
+from flask import Request, request, jsonify, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+from functools import wraps
+import tempfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+PDF_MAGIC = b'%PDF-'
+
+
+class RejectedUpload(Exception):
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+class PDFUploadStream:
+    """Spool for one uploaded file that checks the PDF magic as the first bytes arrive.
+
+    Raising from write() stops Werkzeug's multipart parser, so the rest of the
+    body is never read. Small files stay in memory; larger ones roll over to disk
+    at UPLOAD_SPOOL_THRESHOLD bytes.
+    """
+
+    def __init__(self, spool_threshold: int):
+        self._file = tempfile.SpooledTemporaryFile(max_size=spool_threshold)
+        self._head = b''
+
+    def write(self, data: bytes):
+        if self._head is not None:
+            self._head += data
+            if len(self._head) >= len(PDF_MAGIC):
+                if not self._head.startswith(PDF_MAGIC):
+                    raise RejectedUpload('Invalid PDF file', 415)
+                self._head = None
+        return self._file.write(data)
+
+    def check_complete(self):
+        """Rejects a part that ended before the magic was complete; an empty file is left to validate_pdf."""
+        if self._head:
+            raise RejectedUpload('Invalid PDF file', 415)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """Request whose file parts use a configurable spool, and are screened on pdf_upload routes."""
+
+    screen_pdf = False
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        threshold = current_app.config['UPLOAD_SPOOL_THRESHOLD']
+        if not self.screen_pdf:
+            return tempfile.SpooledTemporaryFile(max_size=threshold)
+        if not filename or not filename.lower().endswith('.pdf'):
+            raise RejectedUpload('File must be PDF', 415)
+        return PDFUploadStream(threshold)
+
+
+def pdf_upload(view):
+    """Rejects oversized and non-PDF uploads before the body is buffered."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        max_size = current_app.config['MAX_CONTENT_LENGTH']
+        if request.mimetype != 'multipart/form-data':
+            return jsonify({'success': False, 'message': 'Expected multipart/form-data'}), 415
+        if request.content_length is None:
+            return jsonify({'success': False, 'message': 'Content-Length required'}), 411
+        if request.content_length > max_size:
+            return jsonify({'success': False, 'message': f'File too large (max {max_size // (1024 * 1024)}MB)'}), 413
+        request.screen_pdf = True
+        try:
+            for _, file in request.files.items(multi=True):
+                if isinstance(file.stream, PDFUploadStream):
+                    file.stream.check_complete()
+        except RejectedUpload as e:
+            logger.info(f"Rejected upload: {e}")
+            return jsonify({'success': False, 'message': str(e)}), e.status
+        except RequestEntityTooLarge:
+            return jsonify({'success': False, 'message': f'File too large (max {max_size // (1024 * 1024)}MB)'}), 413
+        return view(*args, **kwargs)
+    return wrapper
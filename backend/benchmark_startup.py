@@ -0,0 +1,46 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Measures cold-start time: each sample is a fresh interpreter, as for a new worker.
+#   python benchmark_startup.py          create_app() only
+#   python benchmark_startup.py --runs 20 --first-request
+# --first-request also times the first /api/health call, which imports web3 and
+# connects to WEB3_PROVIDER_URI (or loads SNAPSHOT_PATH with CHAIN_BACKEND=snapshot).
+
+CREATE_APP = '''
+import time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+print(time.perf_counter() - start)
+'''
+
+FIRST_REQUEST = CREATE_APP + '''
+start = time.perf_counter()
+app.test_client().get('/api/health')
+print(time.perf_counter() - start)
+'''
+
+
+def sample(code: str) -> list:
+    result = subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).resolve().parent,
+                            capture_output=True, text=True, check=True)
+    return [float(line) for line in result.stdout.split()]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark backend cold start')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--first-request', action='store_true')
+    args = parser.parse_args()
+
+    code = FIRST_REQUEST if args.first_request else CREATE_APP
+    samples = [sample(code) for _ in range(args.runs)]
+    labels = ['create_app()', 'first request']
+    for i, label in enumerate(labels[:len(samples[0])]):
+        times = sorted(s[i] * 1000 for s in samples)
+        print(f"{label:>14}: median {statistics.median(times):7.1f} ms  "
+              f"min {times[0]:7.1f} ms  max {times[-1]:7.1f} ms  ({args.runs} runs)")
@@ -0,0 +1,38 @@
+import sys
+import time
+from eth_utils import to_checksum_address
+from web3 import Web3
+from app import create_app
+from app.services.contract_abi import load_abi
+from app.services.hash_index import update_index
+
+# Builds the on-disk certificate hash index from chain logs and keeps it current.
+#   python build_hash_index.py            one incremental update
+#   python build_hash_index.py <seconds>  update every <seconds> until interrupted
+# Run a single updater per host; API workers only read (mmap) the file.
+# Blocks newer than CONFIRMATIONS are left out so reorgs cannot invalidate entries.
+
+app = create_app()
+
+def connect():
+    # Only the node and the CertificateStore logs are needed, not BlockchainService and its threads.
+    w3 = Web3(Web3.HTTPProvider(app.config['WEB3_PROVIDER_URI'], request_kwargs={'timeout': app.config['RPC_TIMEOUT']}))
+    abi = load_abi(app.config['ABI_DIR'], app.config['CONTRACTS_BUILD_DIR'], 'CertificateStore')
+    return w3, w3.eth.contract(address=to_checksum_address(app.config['CERTIFICATE_STORE_ADDRESS']), abi=abi)
+
+def run_update(w3, certificate_store):
+    return update_index(app.config['HASH_INDEX_PATH'], w3, certificate_store,
+                        app.config['CONFIRMATIONS'], app.config['DEPLOYMENT_BLOCK'])
+
+if __name__ == '__main__':
+    interval = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    if not app.config.get('HASH_INDEX_PATH'):
+        sys.exit('Set HASH_INDEX_PATH to the index file to build')
+    w3, certificate_store = connect()
+    while True:
+        result = run_update(w3, certificate_store)
+        print(f"Indexed {result['count']} hashes at block {result['block_number']} "
+              f"(+{result['added']} issued, +{result['revoked']} revoked)")
+        if interval is None:
+            break
+        time.sleep(interval)
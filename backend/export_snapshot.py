@@ -0,0 +1,36 @@
+import argparse
+from pathlib import Path
+import sys
+from app import create_app
+from app.services.blockchain import BlockchainService
+from app.services.snapshot import export_snapshot
+
+# Writes a signed state snapshot for the offline (CHAIN_BACKEND=snapshot) backend.
+#   python export_snapshot.py state.snapshot                   full snapshot at latest block
+#   python export_snapshot.py 0042.delta --base 1200 --block 1300
+# Deltas go next to the full snapshot; the snapshot backend applies them in block order.
+
+app = create_app()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export a signed certificate state snapshot')
+    parser.add_argument('output', help='output file (.snapshot for full, .delta for deltas)')
+    parser.add_argument('--block', type=int, default=None, help='block to export at (default: latest)')
+    parser.add_argument('--base', type=int, default=None, help='write a delta on top of this block')
+    args = parser.parse_args()
+
+    key = app.config['SNAPSHOT_SIGNING_KEY']
+    if not key:
+        sys.exit('Set SNAPSHOT_SIGNING_KEY to the snapshot signer\'s private key')
+    if key.lower().removeprefix('0x') == app.config['DEPLOYER_PRIVATE_KEY'].lower().removeprefix('0x'):
+        sys.exit('SNAPSHOT_SIGNING_KEY must not be the deployer key')
+
+    with app.app_context():
+        blockchain = BlockchainService()
+        data = export_snapshot(blockchain, key, args.block, args.base)
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_suffix(output.suffix + '.tmp')
+        tmp.write_bytes(data)
+        tmp.replace(output)
+        print(f"Wrote {len(data):,} bytes to {output}")
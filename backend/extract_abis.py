@@ -0,0 +1,17 @@
+import argparse
+from app.config import Config
+from app.services.contract_abi import CONTRACTS, abi_path, extract_abi
+
+# Writes the minimal ABI files the backend loads at startup, from the brownie build.
+#   brownie compile && python extract_abis.py
+# Run it as part of the deploy step so workers never open the full build artifacts.
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extract contract ABIs from brownie build artifacts')
+    parser.add_argument('--build-dir', default=Config.CONTRACTS_BUILD_DIR, help='brownie build/contracts directory')
+    parser.add_argument('--abi-dir', default=Config.ABI_DIR, help='where to write <Contract>.abi.json')
+    args = parser.parse_args()
+
+    for name in CONTRACTS:
+        abi = extract_abi(args.build_dir, args.abi_dir, name)
+        print(f"Wrote {len(abi)} ABI entries to {abi_path(args.abi_dir, name)}")
@@ -0,0 +1,71 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Config reads these at import time; nothing here talks to a node.
+os.environ.setdefault('SECRET_KEY', 'test')
+os.environ.setdefault('WEB3_PROVIDER_URI', 'http://127.0.0.1:1')
+os.environ.setdefault('NETWORK_ID', '1337')
+os.environ.setdefault('DEPLOYER_ADDRESS', '0x0000000000000000000000000000000000000001')
+os.environ.setdefault('CERTIFICATE_STORE_ADDRESS', '0x0000000000000000000000000000000000000002')
+os.environ.setdefault('ISSUER_REGISTRY_ADDRESS', '0x0000000000000000000000000000000000000003')
+os.environ.setdefault('DEPLOYER_PRIVATE_KEY', '0x4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318')
+
+
+@pytest.fixture
+def app(tmp_path):
+    from app import create_app
+    app = create_app()
+    app.config.update(TESTING=True, UPLOAD_FOLDER=str(tmp_path / 'uploads'),
+                      IDEMPOTENCY_DB_PATH=str(tmp_path / 'idempotency.sqlite3'))
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class FakeEvent:
+    def __init__(self, chain, name):
+        self.chain = chain
+        self.name = name
+
+    def get_logs(self, from_block, to_block):
+        self.chain.log_requests.append((self.name, from_block, to_block))
+        return [{'blockNumber': block, 'logIndex': i, 'args': {'certificateHash': cert_hash}}
+                for i, (block, name, cert_hash) in enumerate(self.chain.logs)
+                if name == self.name and from_block <= block <= to_block]
+
+
+class FakeChain:
+    """Stands in for both w3 and the CertificateStore contract: a block height and a list of logs."""
+
+    EVENTS = ('CertificateIssued', 'CertificateRevoked', 'MerkleCertificateRevoked')
+
+    def __init__(self):
+        self.block_number = 0
+        self.logs = []
+        self.log_requests = []
+        self.eth = self
+        self.events = type('Events', (), {name: FakeEvent(self, name) for name in self.EVENTS})()
+
+    def emit(self, name, cert_hash, block=None):
+        self.block_number = self.block_number + 1 if block is None else block
+        self.logs.append((self.block_number, name, cert_hash))
+
+    def mine(self, blocks=1):
+        self.block_number += blocks
+
+    def reorg(self, fork_block):
+        """Drops every log from fork_block on, as if those blocks were replaced by empty ones."""
+        self.logs = [log for log in self.logs if log[0] < fork_block]
+
+
+@pytest.fixture
+def chain():
+    return FakeChain()
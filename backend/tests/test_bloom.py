@@ -0,0 +1,70 @@
+import hashlib
+
+from app.services.bloom import BloomFilter, IssuedHashFilter
+
+
+def make_hashes(count, prefix):
+    return [hashlib.sha256(f"{prefix}-{i}".encode()).digest() for i in range(count)]
+
+
+def make_filter(chain, **kwargs):
+    options = dict(capacity=1000, fp_rate=0.001, sync_interval=5, rebuild_interval=3600)
+    options.update(kwargs)
+    return IssuedHashFilter(chain, chain, **options)
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(5000, 0.01)
+    issued = make_hashes(5000, 'issued')
+    for cert_hash in issued:
+        bloom.add(cert_hash)
+    assert all(cert_hash in bloom for cert_hash in issued)
+
+    false_positives = sum(cert_hash in bloom for cert_hash in make_hashes(20000, 'never-issued'))
+    assert false_positives / 20000 < 0.03
+
+
+def test_miss_untrusted_until_built(chain):
+    chain.emit('CertificateIssued', make_hashes(1, 'a')[0])
+    issued_filter = make_filter(chain)
+    assert not issued_filter.definitely_absent(make_hashes(1, 'b')[0], chain.block_number)
+
+
+def test_miss_trusted_only_up_to_synced_block(chain):
+    issued = make_hashes(3, 'issued')
+    chain.emit('CertificateIssued', issued[0])
+    issued_filter = make_filter(chain)
+    issued_filter.rebuild()
+    assert not issued_filter.definitely_absent(issued[0], chain.block_number)
+    assert issued_filter.definitely_absent(issued[1], chain.block_number)
+
+    # Issued after the last sync: the filter has not seen the head, so it must not answer.
+    chain.emit('CertificateIssued', issued[1])
+    assert not issued_filter.definitely_absent(issued[1], chain.block_number)
+    issued_filter.sync()
+    assert not issued_filter.definitely_absent(issued[1], chain.block_number)
+    assert issued_filter.definitely_absent(issued[2], chain.block_number)
+
+
+def test_rewind_picks_up_reorged_issuance(chain):
+    issued = make_hashes(2, 'issued')
+    chain.emit('CertificateIssued', issued[0], block=5)
+    chain.block_number = 10
+    issued_filter = make_filter(chain)
+    issued_filter.rebuild()
+
+    # Block 8 is replaced by one that issues a certificate; the head does not move.
+    chain.reorg(8)
+    chain.emit('CertificateIssued', issued[1], block=8)
+    chain.block_number = 10
+    issued_filter.rewind(8)
+    assert not issued_filter.definitely_absent(issued[1], 10)
+    issued_filter.sync()
+    assert not issued_filter.definitely_absent(issued[1], 10)
+
+
+def test_rebuild_starts_at_deployment_block(chain):
+    chain.block_number = 100
+    issued_filter = make_filter(chain, from_block=90)
+    issued_filter.rebuild()
+    assert chain.log_requests == [('CertificateIssued', 90, 100)]
@@ -0,0 +1,86 @@
+import os
+import time
+
+from app.services.hash_index import HashIndex, read_index, update_index, write_index
+
+ISSUED = [bytes([i]) * 32 for i in range(1, 6)]
+
+
+def test_lookup(tmp_path):
+    path = tmp_path / 'hashes.idx'
+    write_index(path, sorted(ISSUED), {ISSUED[1]}, 10)
+    index = HashIndex(path, max_age=30, recheck_interval=0)
+
+    assert index.lookup(ISSUED[0]) == 'ACTIVE'
+    assert index.lookup(ISSUED[1]) == 'REVOKED'
+    # A miss may have been issued after the indexed block, so it is never NOT_FOUND.
+    assert index.lookup(b'\x00' * 32) is None
+    assert index.lookup(b'\xff' * 32) is None
+    assert index.block_number == 10
+
+
+def test_lookup_missing_or_stale(tmp_path):
+    path = tmp_path / 'hashes.idx'
+    index = HashIndex(path, max_age=30, recheck_interval=0)
+    assert index.lookup(ISSUED[0]) is None
+
+    write_index(path, sorted(ISSUED), set(), 10)
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    assert index.lookup(ISSUED[0]) is None
+
+
+def test_update_stops_at_confirmed_block(tmp_path, chain):
+    path = tmp_path / 'hashes.idx'
+    chain.emit('CertificateIssued', ISSUED[0], block=3)
+    chain.emit('CertificateIssued', ISSUED[1], block=8)
+    chain.block_number = 10
+
+    result = update_index(path, chain, chain, confirmations=4)
+    assert result == {'count': 1, 'block_number': 6, 'added': 1, 'revoked': 0}
+    assert read_index(path) == ([ISSUED[0]], set(), 6)
+
+    chain.emit('CertificateRevoked', ISSUED[0], block=11)
+    chain.block_number = 15
+    result = update_index(path, chain, chain, confirmations=4)
+    assert result == {'count': 2, 'block_number': 11, 'added': 1, 'revoked': 1}
+    hashes, revoked, block_number = read_index(path)
+    assert hashes == sorted(ISSUED[:2]) and revoked == {ISSUED[0]} and block_number == 11
+    # Only the new range was read.
+    assert chain.log_requests[-1] == ('CertificateRevoked', 7, 11)
+
+
+def test_update_without_new_confirmed_blocks(tmp_path, chain):
+    path = tmp_path / 'hashes.idx'
+    chain.emit('CertificateIssued', ISSUED[0], block=2)
+    chain.block_number = 3
+    assert update_index(path, chain, chain, confirmations=12)['added'] == 0
+    assert not path.exists()
+
+
+class IndexedService:
+    """Answers status from an index, and fails if anything asks the node."""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+
+    def get_certificate_status(self, cert_hash):
+        return self.statuses.get(cert_hash, 'NOT_FOUND')
+
+    def verify_merkle_certificate(self, *args):
+        raise AssertionError('no Merkle batch should be consulted')
+
+
+def test_status_route_uses_indexed_status(client, tmp_path, monkeypatch):
+    from app.routes import verification
+    from app.services import blockchain
+    from app.services.merkle import MerkleBatchStore
+    monkeypatch.setattr(blockchain, '_service', IndexedService({ISSUED[0]: 'ACTIVE', ISSUED[1]: 'REVOKED'}))
+    monkeypatch.setattr(verification, 'get_merkle_store', lambda: MerkleBatchStore(tmp_path))
+
+    for cert_hash, status in ((ISSUED[0], 'ACTIVE'), (ISSUED[1], 'REVOKED'), (ISSUED[2], 'NOT_FOUND')):
+        response = client.get(f"/api/verify/status/0x{cert_hash.hex()}")
+        assert response.status_code == 200
+        assert response.get_json()['data'] == {'certificate_hash': '0x' + cert_hash.hex(), 'status': status}
+    assert client.get('/api/verify/status/0x1234').status_code == 400
+    assert client.get('/api/verify/status/not-hex').status_code == 400
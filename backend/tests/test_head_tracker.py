@@ -0,0 +1,119 @@
+from app.services.head_tracker import HeadTracker
+from app.services.read_cache import BlockReadCache
+from app.services.revocations import RevocationLog
+
+
+class FakeBlocks:
+    """w3 stand-in serving eth.get_block from a list of block hashes; index = block number."""
+
+    def __init__(self, length):
+        self.hashes = [self._hash('main', n) for n in range(length)]
+        self.eth = self
+
+    @staticmethod
+    def _hash(branch, number):
+        return f"{branch}-{number}".encode().ljust(32, b'\0')
+
+    def get_block(self, number):
+        if number == 'latest':
+            number = len(self.hashes) - 1
+        return {'number': number, 'hash': self.hashes[number],
+                'parentHash': self.hashes[number - 1] if number else b'\0' * 32, 'timestamp': 1000 + number}
+
+    def extend(self, count, branch='main'):
+        start = len(self.hashes)
+        self.hashes += [self._hash(branch, n) for n in range(start, start + count)]
+
+    def fork(self, from_block, length, branch='fork'):
+        """Replaces every block from from_block on with a new branch of `length` blocks."""
+        del self.hashes[from_block:]
+        self.extend(length, branch)
+
+
+def make_tracker(w3):
+    tracker = HeadTracker(w3, confirmations=3, poll_interval=1)
+    heads, forks = [], []
+    tracker.on_head(heads.append)
+    tracker.on_reorg(forks.append)
+    return tracker, heads, forks
+
+
+def test_new_heads_without_reorg():
+    w3 = FakeBlocks(10)
+    tracker, heads, forks = make_tracker(w3)
+    tracker.poll()
+    tracker.poll()
+    w3.extend(2)
+    tracker.poll()
+    assert heads == [9, 11] and forks == []
+    assert tracker.safe_block == 8 and tracker.safe_timestamp() == 1008
+
+
+def test_reorg_reports_fork_block():
+    w3 = FakeBlocks(10)
+    tracker, heads, forks = make_tracker(w3)
+    for _ in range(3):
+        w3.extend(1)
+        tracker.poll()
+
+    # Blocks 10..12 are replaced by a longer branch.
+    w3.fork(10, 4)
+    tracker.poll()
+    assert forks == [10]
+    assert heads[-1] == 13 and tracker.reorgs == 1
+
+
+def test_reorg_between_sparse_polls():
+    w3 = FakeBlocks(11)
+    tracker, _, forks = make_tracker(w3)
+    tracker.poll()
+    w3.extend(5)
+    tracker.poll()
+
+    # Only heads 10 and 15 were recorded; the fork at 12 lies between them.
+    w3.fork(12, 6)
+    tracker.poll()
+    assert forks == [11]
+
+
+def test_reorg_to_shorter_chain():
+    w3 = FakeBlocks(12)
+    tracker, _, forks = make_tracker(w3)
+    tracker.poll()
+    w3.fork(11, 0)
+    w3.fork(10, 1)
+    tracker.poll()
+    assert forks == [10]
+
+
+def test_reorg_rolls_back_cached_reads_and_revocations(chain):
+    w3 = FakeBlocks(10)
+    tracker, _, _ = make_tracker(w3)
+    cache = BlockReadCache(100)
+    revocations = RevocationLog(chain, chain, sync_interval=0)
+    tracker.on_reorg(cache.invalidate_from)
+    tracker.on_reorg(revocations.rewind)
+
+    for block in range(10, 13):
+        w3.extend(1)
+        tracker.poll()
+    cache.set('confirmed', 'a', 8)
+    cache.set('recent', 'b', 11, ttl=60)
+    chain.emit('CertificateRevoked', b'\x01' * 32, block=8)
+    chain.emit('CertificateRevoked', b'\x02' * 32, block=11)
+    chain.block_number = 12
+    revocations.sync()
+    assert revocations.revocation_block(b'\x02' * 32) == 11
+
+    # The revocation in block 11 does not survive the reorg.
+    chain.reorg(11)
+    w3.fork(11, 2)
+    tracker.poll()
+
+    assert cache.get('confirmed') == (True, 'a')
+    assert cache.get('recent') == (False, None)
+    assert revocations.last_block == 10
+    assert revocations.revocation_block(b'\x02' * 32) is None
+    revocations.sync()
+    assert revocations.revocation_block(b'\x01' * 32) == 8
+    assert revocations.revocation_block(b'\x02' * 32) is None
@@ -0,0 +1,63 @@
+import threading
+from unittest import mock
+
+from web3 import Web3
+
+from app.services import blockchain
+from app.services.blockchain import BlockchainService
+from app.services.issuer_cache import IssuerCache
+from app.services.read_cache import BlockReadCache
+from app.services.rpc_provider import MultiEndpointProvider
+
+
+def make_service(provider):
+    # A service wired up without _initialize(), so nothing talks to a node.
+    service = BlockchainService.__new__(BlockchainService)
+    service.w3 = Web3(provider)
+    service.read_cache = BlockReadCache(100)
+    service.finalized_certificates = None
+    service.issuer_cache = IssuerCache(None, None, sync_interval=60)
+    service.head_tracker = None
+    return service
+
+
+def test_rpc_stats_for_multi_endpoint_provider():
+    service = make_service(MultiEndpointProvider(['http://127.0.0.1:1', 'http://127.0.0.1:2']))
+    assert [e['uri'] for e in service.get_rpc_stats()] == ['http://127.0.0.1:1', 'http://127.0.0.1:2']
+
+
+def test_rpc_stats_for_plain_provider():
+    assert make_service(Web3.HTTPProvider('http://127.0.0.1:1')).get_rpc_stats() == []
+
+
+def test_health_reports_endpoints(client, monkeypatch):
+    monkeypatch.setattr(blockchain, '_service', make_service(MultiEndpointProvider(['http://127.0.0.1:1'])))
+    response = client.get('/api/health')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'healthy'
+    assert body['blockchain_connected'] is False
+    assert body['rpc_endpoints'][0]['uri'] == 'http://127.0.0.1:1'
+
+
+def test_health_unhealthy_without_node(client, monkeypatch):
+    monkeypatch.setattr(blockchain, '_service', None)
+    assert client.get('/api/health').status_code == 503
+
+
+def test_pinned_block_uses_current_tracked_head():
+    service = make_service(MultiEndpointProvider(['http://127.0.0.1:1']))
+    service._pin = threading.local()
+    service.head_tracker = mock.Mock(head=120, **{'is_current.return_value': True})
+    with service.pinned_block():
+        # No eth_blockNumber: the endpoint is unreachable, so a request would fail.
+        assert service._pinned_block_number() == 120
+
+
+def test_pinned_route_reports_unavailable_service(client, monkeypatch):
+    def unavailable():
+        raise ConnectionError('Cannot connect to http://127.0.0.1:1')
+    monkeypatch.setattr('app.routes.verification.get_blockchain_service', unavailable)
+    response = client.post('/api/verify/hash', json={'hash': '0x' + '11' * 32})
+    assert response.status_code == 500
+    assert response.get_json() == {'success': False, 'message': 'Cannot connect to http://127.0.0.1:1'}
@@ -0,0 +1,115 @@
+import hashlib
+import threading
+import time
+
+import pytest
+from flask import jsonify, request
+
+from app.services import idempotency
+from app.services.idempotency import idempotent, record_transaction
+
+
+@pytest.fixture
+def store(app, monkeypatch):
+    monkeypatch.setattr(idempotency, '_store', None)
+    with app.app_context():
+        yield idempotency.get_idempotency_store()
+
+
+@pytest.fixture
+def idem_client(app, store):
+    calls = []
+
+    @app.route('/test-write', methods=['POST'])
+    @idempotent()
+    def write():
+        calls.append(request.get_json())
+        return jsonify({'success': True, 'data': {'call': len(calls)}}), 201
+
+    @app.route('/test-operation/<name>', methods=['POST'])
+    @idempotent(operation_key=lambda name: name.lower())
+    def operation(name):
+        calls.append(name)
+        outcome = request.get_json()['outcome']
+        if outcome == 'sent':
+            record_transaction('0x' + 'ab' * 32)
+            return jsonify({'success': True, 'data': {'call': len(calls)}}), 200
+        if outcome == 'reverted':
+            record_transaction('0x' + 'cd' * 32)
+            return jsonify({'success': False, 'message': 'Failed to register issuer on blockchain'}), 500
+        return jsonify({'success': False, 'message': 'No pending registration found for this address'}), 404
+
+    client = app.test_client()
+    client.calls = calls
+    return client
+
+
+def write(client, key, body=None):
+    return client.post('/test-write', json=body or {'name': 'University'}, headers={'Idempotency-Key': key})
+
+
+def test_header_key_replays_response(idem_client):
+    first = write(idem_client, 'key-1')
+    second = write(idem_client, 'key-1')
+    assert first.status_code == second.status_code == 201
+    assert second.get_json() == first.get_json()
+    assert second.headers['Idempotent-Replayed'] == 'true'
+    assert len(idem_client.calls) == 1
+
+
+def test_header_key_reused_for_different_body(idem_client):
+    write(idem_client, 'key-1')
+    assert write(idem_client, 'key-1', {'name': 'Other'}).status_code == 422
+
+
+def test_concurrent_claim_gets_pending(app, idem_client):
+    started, finish = threading.Event(), threading.Event()
+
+    @app.route('/test-slow', methods=['POST'])
+    @idempotent()
+    def slow():
+        record_transaction('0x' + 'ef' * 32)
+        started.set()
+        finish.wait(5)
+        return jsonify({'success': True}), 200
+
+    def post():
+        return idem_client.post('/test-slow', json={}, headers={'Idempotency-Key': 'slow'})
+
+    results = []
+    worker = threading.Thread(target=lambda: results.append(post()))
+    worker.start()
+    assert started.wait(5)
+    response = post()
+    assert response.status_code == 409
+    assert response.get_json()['data'] == {'status': 'pending', 'transaction_hash': '0x' + 'ef' * 32}
+    finish.set()
+    worker.join(5)
+    assert results[0].status_code == 200
+    assert post().headers['Idempotent-Replayed'] == 'true'
+
+
+def test_stale_claim_taken_over(idem_client, store):
+    key = 'operation:bob'
+    body = b'{"outcome": "sent"}'
+    fingerprint = hashlib.sha256(b'POST/test-operation/bob\0' + body).hexdigest()
+    assert store.claim(key, fingerprint) == ('new', None)
+    store.record_transaction(key, '0x' + 'ef' * 32)
+    assert store.claim(key, fingerprint)[0] == 'pending'
+
+    # The claiming worker died; once its claim is stale the next request runs the operation.
+    store.pending_timeout = 0
+    time.sleep(0.01)
+    response = idem_client.post('/test-operation/bob', data=body, content_type='application/json')
+    assert response.status_code == 200
+    assert idem_client.calls == ['bob']
+    assert store.claim(key, fingerprint)[0] == 'done'
+
+
+def test_operation_key_keeps_only_success(idem_client):
+    assert idem_client.post('/test-operation/Carol', json={'outcome': 'missing'}).status_code == 404
+    assert idem_client.post('/test-operation/carol', json={'outcome': 'reverted'}).status_code == 500
+    # Neither the 404 nor the revert was stored, so the operation runs again.
+    assert idem_client.post('/test-operation/carol', json={'outcome': 'sent'}).status_code == 200
+    assert idem_client.calls == ['Carol', 'carol', 'carol']
+
@@ -0,0 +1,140 @@
+import threading
+
+from app.services.issuer_cache import IssuerCache
+
+ISSUERS = [f"0x{i:040x}" for i in range(1, 6)]
+
+
+class FakeCall:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def call(self, block_identifier='latest'):
+        return self.fn()
+
+
+class FakeRegistry:
+    """IssuerRegistry stand-in: issuer state, a block height and IssuerRegistry logs."""
+
+    EVENTS = ('IssuerRegistered', 'IssuerUpdated', 'IssuerDeactivated', 'IssuerReactivated', 'CertificateCountUpdated')
+
+    def __init__(self):
+        self.block_number = 1
+        self.issuers = {}
+        self.logs = []
+        self.reads = 0
+        self.on_read = None
+        self.eth = self
+        registry = self
+        self.functions = type('Functions', (), {
+            'isAddressRegistered': staticmethod(lambda a: FakeCall(lambda: a in registry.issuers)),
+            'getIssuerInfo': staticmethod(lambda a: FakeCall(lambda: registry._read(a))),
+        })()
+        self.events = type('Events', (), {name: self._event(name) for name in self.EVENTS})()
+
+    def _event(self, name):
+        registry = self
+
+        class Event:
+            def get_logs(self, from_block, to_block):
+                return [{'args': args} for block, event, args in registry.logs
+                        if event == name and from_block <= block <= to_block]
+        return Event()
+
+    def _read(self, address):
+        self.reads += 1
+        info = list(self.issuers[address])
+        if self.on_read is not None:
+            hook, self.on_read = self.on_read, None
+            hook()
+        return info
+
+    def register(self, address, name):
+        self.block_number += 1
+        self.issuers[address] = (name, 'Somewhere', 100, True, 0)
+        self.logs.append((self.block_number, 'IssuerRegistered', {'issuerAddress': address}))
+
+    def rename(self, address, name):
+        self.block_number += 1
+        self.issuers[address] = (name,) + self.issuers[address][1:]
+        self.logs.append((self.block_number, 'IssuerUpdated', {'IssuerAddress': address}))
+
+
+def make_cache(registry, **kwargs):
+    return IssuerCache(registry, registry, sync_interval=3600, **kwargs)
+
+
+def test_cached_until_event():
+    registry = FakeRegistry()
+    registry.register(ISSUERS[0], 'Old Name')
+    cache = make_cache(registry)
+    assert cache.get(ISSUERS[0])['name'] == 'Old Name'
+    assert cache.get(ISSUERS[0])['name'] == 'Old Name'
+    assert registry.reads == 1
+
+    registry.rename(ISSUERS[0], 'New Name')
+    assert cache.get(ISSUERS[0])['name'] == 'Old Name'
+    cache.sync()
+    assert cache.get(ISSUERS[0])['name'] == 'New Name'
+    assert cache.get(ISSUERS[1]) is None
+
+
+def test_lru_cap_includes_unregistered():
+    registry = FakeRegistry()
+    registry.register(ISSUERS[0], 'University')
+    cache = make_cache(registry, max_entries=2)
+    cache.get(ISSUERS[0])
+    cache.get(ISSUERS[1])
+    cache.get(ISSUERS[0])
+    cache.get(ISSUERS[2])
+    assert cache.stats()['entries'] == 2
+    # ISSUERS[1] was least recently used, so it went first.
+    assert list(cache._entries) == [ISSUERS[0], ISSUERS[2]]
+
+
+def test_load_racing_with_sync_is_not_cached():
+    registry = FakeRegistry()
+    registry.register(ISSUERS[0], 'Old Name')
+    cache = make_cache(registry)
+    cache.sync()
+
+    def rename_and_sync():
+        # The rename lands, and is synced, after the read saw the old state.
+        registry.rename(ISSUERS[0], 'New Name')
+        cache.sync()
+    registry.on_read = rename_and_sync
+
+    assert cache.get(ISSUERS[0])['name'] == 'Old Name'
+    assert cache.get(ISSUERS[0])['name'] == 'New Name'
+    assert registry.reads == 2
+
+
+def test_slow_sync_does_not_block_lookups():
+    registry = FakeRegistry()
+    registry.register(ISSUERS[0], 'University')
+    cache = make_cache(registry)
+    cache.sync()
+    cache.get(ISSUERS[0])
+
+    entered, release = threading.Event(), threading.Event()
+    get_logs = registry.events.IssuerRegistered.get_logs
+
+    def slow_get_logs(from_block, to_block):
+        entered.set()
+        release.wait(5)
+        return get_logs(from_block, to_block)
+    registry.events.IssuerRegistered.get_logs = slow_get_logs
+
+    registry.rename(ISSUERS[0], 'Renamed')
+    syncing = threading.Thread(target=cache.sync)
+    syncing.start()
+    assert entered.wait(5)
+    # The sync is stuck on the node; cached lookups still answer.
+    assert cache.get(ISSUERS[0])['name'] == 'University'
+    # A rewind meanwhile means the sync's range is read again next time.
+    cache.rewind(registry.block_number)
+    release.set()
+    syncing.join(5)
+    assert cache.stats()['last_block'] == registry.block_number - 1
+    cache.sync()
+    assert cache.get(ISSUERS[0])['name'] == 'Renamed'
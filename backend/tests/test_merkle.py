@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from app.services.merkle import MerkleBatchConflict, MerkleBatchStore, MerkleTree, merkle_leaf
+
+RECIPIENT = '0x0000000000000000000000000000000000000006'
+ISSUER = '0x0000000000000000000000000000000000000007'
+
+
+def make_certificates(count, seed=0):
+    return [(bytes([seed, i]) * 16, RECIPIENT) for i in range(count)]
+
+
+@pytest.mark.parametrize('count', [1, 2, 3, 5, 8, 13])
+def test_every_proof_verifies(count):
+    leaves = [merkle_leaf(cert_hash, recipient) for cert_hash, recipient in make_certificates(count)]
+    tree = MerkleTree(leaves)
+    for i, leaf in enumerate(leaves):
+        assert MerkleTree.verify(tree.proof(i), tree.root, leaf)
+    assert not MerkleTree.verify(tree.proof(0), tree.root, merkle_leaf(b'\xff' * 32, RECIPIENT))
+
+
+def test_build_and_lookup(tmp_path):
+    store = MerkleBatchStore(tmp_path)
+    certificates = make_certificates(3)
+    batch = store.build_batch(ISSUER, certificates)
+    assert batch['certificate_count'] == 3
+
+    found = store.lookup(certificates[2][0])
+    assert found['merkle_root'] == batch['merkle_root']
+    assert found['leaf_index'] == 2
+    proof = [bytes.fromhex(node[2:]) for node in found['proof']]
+    assert MerkleTree.verify(proof, bytes.fromhex(batch['merkle_root'][2:]), merkle_leaf(*certificates[2]))
+    assert store.lookup(b'\xee' * 32) is None
+
+
+def test_batched_hash_is_rejected_across_workers(tmp_path):
+    first, second = MerkleBatchStore(tmp_path), MerkleBatchStore(tmp_path)
+    batch = first.build_batch(ISSUER, make_certificates(2))
+
+    overlapping = make_certificates(1) + make_certificates(2, seed=1)
+    with pytest.raises(MerkleBatchConflict) as e:
+        second.build_batch(ISSUER, overlapping)
+    assert e.value.batched == {'0x' + overlapping[0][0].hex(): batch['merkle_root']}
+    # The rejected batch left nothing behind, and the original proof did not move.
+    assert second.lookup(overlapping[1][0]) is None
+    assert second.lookup(overlapping[0][0])['merkle_root'] == batch['merkle_root']
+
+    second.build_batch(ISSUER, make_certificates(2, seed=1))
+    assert first.lookup(overlapping[1][0]) is not None
+
+
+def test_imports_json_batches(tmp_path):
+    certificates = make_certificates(2)
+    tree = MerkleTree([merkle_leaf(cert_hash, recipient) for cert_hash, recipient in certificates])
+    root_hex = '0x' + tree.root.hex()
+    with open(tmp_path / f"{root_hex}.json", 'w') as f:
+        json.dump({'merkle_root': root_hex, 'issuer': ISSUER, 'created_at': '2024-01-01T00:00:00',
+                   'leaves': [['0x' + h.hex(), r] for h, r in certificates]}, f)
+
+    store = MerkleBatchStore(tmp_path)
+    assert store.lookup(certificates[1][0])['merkle_root'] == root_hex
+    assert not (tmp_path / f"{root_hex}.json").exists()
+
+
+def test_replaced_batch_frees_its_hashes(tmp_path):
+    store = MerkleBatchStore(tmp_path)
+    first = store.build_batch(ISSUER, make_certificates(3))
+    # One wrong recipient: the issuer rebuilds with two of the three hashes.
+    second = store.build_batch(ISSUER, make_certificates(2), replace={first['merkle_root']})
+    assert store.lookup(make_certificates(2)[1][0])['merkle_root'] == second['merkle_root']
+    assert store.lookup(make_certificates(3)[2][0]) is None
+
+
+class StubBlockchain:
+    def __init__(self):
+        self.anchored = set()
+
+    def is_registered_issuer(self, address):
+        return True
+
+    def verify_certificates(self, hashes):
+        return [{'is_valid': False} for _ in hashes]
+
+    def is_merkle_root_anchored(self, merkle_root):
+        return merkle_root in self.anchored
+
+
+@pytest.fixture
+def merkle_client(app, tmp_path, monkeypatch):
+    from app.routes import certificate
+    chain = StubBlockchain()
+    store = MerkleBatchStore(tmp_path / 'merkle')
+    monkeypatch.setattr(certificate, 'get_blockchain_service', lambda: chain)
+    monkeypatch.setattr(certificate, 'get_merkle_store', lambda: store)
+    client = app.test_client()
+    client.chain, client.store = chain, store
+    return client
+
+
+def build(client, account, certificates, signer=None):
+    from eth_account.messages import encode_defunct
+    root = MerkleBatchStore.batch_root(certificates)
+    signature = (signer or account).sign_message(encode_defunct(primitive=root)).signature
+    return client.post('/api/certificate/merkle/build', json={
+        'issuer_address': account.address,
+        'certificates': [{'hash': '0x' + h.hex(), 'recipient': r} for h, r in certificates],
+        'signature': '0x' + bytes(signature).hex()
+    })
+
+
+def test_build_requires_issuer_signature(merkle_client):
+    from eth_account import Account
+    issuer, other = Account.create(), Account.create()
+    assert build(merkle_client, issuer, make_certificates(2), signer=other).status_code == 403
+    assert merkle_client.store.lookup(make_certificates(2)[0][0]) is None
+    assert build(merkle_client, issuer, make_certificates(2)).status_code == 201
+
+
+def test_build_replaces_unanchored_batches(app, merkle_client):
+    from eth_account import Account
+    issuer, other = Account.create(), Account.create()
+    assert build(merkle_client, issuer, make_certificates(3)).status_code == 201
+
+    # The same issuer can rebuild; another issuer cannot until the batch is stale.
+    assert build(merkle_client, issuer, make_certificates(2)).status_code == 201
+    assert build(merkle_client, other, make_certificates(2)).status_code == 409
+    app.config['MERKLE_BATCH_TTL'] = -1
+    response = build(merkle_client, other, make_certificates(2))
+    assert response.status_code == 201
+    assert merkle_client.store.lookup(make_certificates(2)[0][0])['issuer'] == other.address
+
+    # Once anchored, the hashes are issued and no batch can take them.
+    merkle_client.chain.anchored.add(bytes.fromhex(response.get_json()['data']['merkle_root'][2:]))
+    response = build(merkle_client, other, make_certificates(2))
+    assert response.status_code == 409
+    assert len(response.get_json()['data']['issued']) == 2
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from app.services.read_cache import BlockReadCache, RedisReadCache, SQLiteReadCache
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'redis'])
+def cache(request, tmp_path):
+    if request.param == 'memory':
+        return BlockReadCache(100)
+    if request.param == 'sqlite':
+        return SQLiteReadCache(tmp_path / 'reads.sqlite3', 'reads', 100)
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisReadCache(fakeredis.FakeRedis(), 'reads', 100)
+
+
+def test_get_set(cache):
+    assert cache.get(('verify', b'\x01', 10)) == (False, None)
+    cache.set(('verify', b'\x01', 10), [True, b'\x02' * 20, 'Name'], 10)
+    assert cache.get(('verify', b'\x01', 10)) == (True, [True, b'\x02' * 20, 'Name'])
+    assert cache.get(('verify', b'\x01', 11)) == (False, None)
+
+
+def test_ttl(cache):
+    cache.set('recent', 1, 10, ttl=0.05)
+    cache.set('confirmed', 2, 9)
+    assert cache.get('recent') == (True, 1)
+    time.sleep(0.1)
+    assert cache.get('recent') == (False, None)
+    assert cache.get('confirmed') == (True, 2)
+
+
+def test_reorg_invalidation(cache):
+    for block in range(5, 10):
+        cache.set(('read', block), block, block)
+    cache.set('latest', 'x')
+    assert cache.invalidate_from(8) == 2
+    assert cache.get(('read', 7)) == (True, 7)
+    assert cache.get(('read', 8)) == (False, None)
+    assert cache.get(('read', 9)) == (False, None)
+    assert cache.get('latest') == (True, 'x')
+
+
+def test_redis_block_index_trimmed_below_finalized():
+    fakeredis = pytest.importorskip('fakeredis')
+    client = fakeredis.FakeRedis()
+    cache = RedisReadCache(client, 'reads', 100)
+    for block in range(1, 11):
+        cache.set(('read', block), block, block)
+
+    cache.trim_below(8)
+    assert [int(score) for _, score in client.zrange(cache.blocks_key, 0, -1, withscores=True)] == [8, 9, 10]
+    # Values stay; only blocks that can still reorg remain invalidatable.
+    assert cache.get(('read', 3)) == (True, 3)
+    assert cache.invalidate_from(9) == 2
+    assert client.zcard(cache.blocks_key) == 1
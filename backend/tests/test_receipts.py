@@ -0,0 +1,59 @@
+import pytest
+from eth_account import Account
+
+from app.services import receipts
+from app.services.receipts import ReceiptSigner, ReceiptSigningUnavailable, check_receipt, get_receipt_signer
+
+KEY = '0x' + '11' * 32
+STORE = '0x0000000000000000000000000000000000000002'
+ISSUER = '0x0000000000000000000000000000000000000007'
+CERT_HASH = b'\x05' * 32
+
+
+@pytest.fixture
+def signer():
+    return ReceiptSigner(KEY, 1337, STORE, ttl=60)
+
+
+def test_round_trip(signer):
+    receipt = signer.sign(CERT_HASH, 'ACTIVE', ISSUER, 42)
+    assert receipt['signer'] == Account.from_key(KEY).address
+    assert check_receipt(receipt, signer.address)
+    assert signer.cached(CERT_HASH) is receipt
+
+
+@pytest.mark.parametrize('field, value', [
+    ('chain_id', 1),
+    ('certificate_store', '0x0000000000000000000000000000000000000009'),
+    ('certificate_hash', '0x' + '06' * 32),
+    ('status', 'REVOKED'),
+    ('issuer', '0x0000000000000000000000000000000000000008'),
+    ('block_number', 43),
+    ('expires_at', 2 ** 40),
+])
+def test_tampered_receipt_rejected(signer, field, value):
+    receipt = dict(signer.sign(CERT_HASH, 'ACTIVE', ISSUER, 42), **{field: value})
+    assert not check_receipt(receipt, signer.address)
+
+
+def test_wrong_signer_expired_or_malformed(signer):
+    receipt = signer.sign(CERT_HASH, 'NOT_FOUND', None, 42)
+    assert not check_receipt(receipt, ISSUER)
+    assert not check_receipt(receipt, signer.address, now=receipt['expires_at'])
+    assert not check_receipt(dict(receipt, signature='0x00'), signer.address)
+    assert not check_receipt({}, signer.address)
+
+
+@pytest.mark.parametrize('key', [None, '', '0x4C0883A69102937D6231471B5DBB6204FE5129617082792AE468D01A3F362318'])
+def test_dedicated_key_required(app, monkeypatch, key):
+    monkeypatch.setattr(receipts, '_signer', None)
+    app.config['RECEIPT_SIGNING_KEY'] = key
+    with app.app_context():
+        with pytest.raises(ReceiptSigningUnavailable):
+            get_receipt_signer()
+
+
+def test_receipt_key_route_without_key(client, monkeypatch):
+    monkeypatch.setattr(receipts, '_signer', None)
+    client.application.config['RECEIPT_SIGNING_KEY'] = None
+    assert client.get('/api/verify/receipt-key').status_code == 503
@@ -0,0 +1,46 @@
+import gzip
+import json
+
+import pytest
+
+from app.services import blockchain
+
+REVOKED = [bytes([i]) * 32 for i in range(1, 4)]
+
+
+class RevocationService:
+    def get_revocations(self, since):
+        return 42, list(REVOKED)
+
+
+@pytest.fixture
+def revocations_client(client, monkeypatch):
+    monkeypatch.setattr(blockchain, '_service', RevocationService())
+    return client
+
+
+def test_encodings_have_distinct_etags(revocations_client):
+    plain = revocations_client.get('/api/verify/revocations?format=json')
+    zipped = revocations_client.get('/api/verify/revocations?format=json', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Accept-Encoding' in plain.headers['Vary'] and 'Accept-Encoding' in zipped.headers['Vary']
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['ETag'] != zipped.headers['ETag']
+    assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+    assert plain.get_json()['count'] == 3
+
+
+def test_conditional_request_per_encoding(revocations_client):
+    zipped = revocations_client.get('/api/verify/revocations?format=json', headers={'Accept-Encoding': 'gzip'})
+    etag = zipped.headers['ETag']
+    assert revocations_client.get('/api/verify/revocations?format=json', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': etag}).status_code == 304
+    # A gzip ETag does not validate the identity body.
+    assert revocations_client.get('/api/verify/revocations?format=json',
+                                  headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_refuses_gzip_with_zero_quality(revocations_client):
+    response = revocations_client.get('/api/verify/revocations?format=json', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in response.headers
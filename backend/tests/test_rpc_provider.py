@@ -0,0 +1,84 @@
+import pytest
+
+from app.services.rpc_provider import MultiEndpointProvider, hedged_reads, is_execution_error
+
+OK = {'jsonrpc': '2.0', 'id': 1, 'result': '0x10'}
+HEADER_NOT_FOUND = {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32000, 'message': 'header not found'}}
+RATE_LIMITED = {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32005, 'message': 'rate limit exceeded'}}
+REVERTED = {'jsonrpc': '2.0', 'id': 1, 'error': {'code': 3, 'message': 'execution reverted: CertificateStore: Empty batch',
+                                                 'data': '0x08c379a0'}}
+
+
+class FakeNode:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def provider():
+    return MultiEndpointProvider(['http://node-a', 'http://node-b'], hedge_min_delay=0.001, failure_threshold=2)
+
+
+def attach(provider, *nodes):
+    for endpoint, node in zip(provider.endpoints, nodes):
+        endpoint.provider = node
+        # Make node-a the preferred endpoint.
+        endpoint.ewma = 0.001 if node is nodes[0] else 1.0
+    return nodes
+
+
+def test_is_execution_error():
+    assert is_execution_error(REVERTED['error'])
+    assert is_execution_error({'code': -32000, 'message': 'VM Exception while processing transaction: revert'})
+    assert not is_execution_error(HEADER_NOT_FOUND['error'])
+    assert not is_execution_error(RATE_LIMITED['error'])
+    assert not is_execution_error('oops')
+
+
+@pytest.mark.parametrize('error', [HEADER_NOT_FOUND, RATE_LIMITED, ConnectionError('refused')])
+def test_node_error_fails_over(provider, error):
+    a, b = attach(provider, FakeNode(error), FakeNode(OK))
+    assert provider.make_request('eth_call', []) == OK
+    assert a.calls == ['eth_call'] and b.calls == ['eth_call']
+    assert provider.endpoints[0].failures == 1 and provider.endpoints[1].failures == 0
+
+
+def test_node_errors_mark_endpoint_down(provider):
+    attach(provider, FakeNode(HEADER_NOT_FOUND), FakeNode(OK))
+    provider.make_request('eth_call', [])
+    provider.make_request('eth_call', [])
+    assert [e['healthy'] for e in provider.endpoint_stats()] == [False, True]
+
+
+def test_revert_is_returned_without_failover(provider):
+    a, b = attach(provider, FakeNode(REVERTED), FakeNode(OK))
+    assert provider.make_request('eth_call', []) == REVERTED
+    assert b.calls == []
+    assert provider.endpoints[0].failures == 0
+
+
+def test_last_node_error_is_returned_when_all_fail(provider):
+    attach(provider, FakeNode(HEADER_NOT_FOUND), FakeNode(RATE_LIMITED))
+    assert provider.make_request('eth_call', []) == RATE_LIMITED
+
+
+def test_hedged_read_fails_over_on_node_error(provider):
+    a, b = attach(provider, FakeNode(HEADER_NOT_FOUND), FakeNode(OK))
+    with hedged_reads():
+        assert provider.make_request('eth_call', []) == OK
+    assert b.calls == ['eth_call']
+
+
+def test_pinned_method_errors_stay_on_primary(provider):
+    nonce_too_low = {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32000, 'message': 'nonce too low'}}
+    a, b = attach(provider, FakeNode(nonce_too_low), FakeNode(OK))
+    assert provider.make_request('eth_sendRawTransaction', ['0x']) == nonce_too_low
+    assert b.calls == [] and provider.endpoints[0].failures == 0
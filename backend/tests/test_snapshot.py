@@ -0,0 +1,106 @@
+import pytest
+from eth_account import Account
+
+from app.services.snapshot import SnapshotBlockchainService, SnapshotError, decode_snapshot, encode_snapshot
+
+KEY = '0x4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318'
+SIGNER = Account.from_key(KEY).address
+ISSUER = '0x0000000000000000000000000000000000000007'
+RECIPIENT = '0x0000000000000000000000000000000000000006'
+CHAIN_ID = 1337
+
+
+def issuer(name='University'):
+    return {'address': ISSUER, 'name': name, 'location': 'Somewhere', 'registration_time': 100,
+            'is_active': True, 'total_certificate': 3}
+
+
+def certificate(n, issuance_time, revocation_time=0, recipient=RECIPIENT):
+    return {'hash': bytes([n]) * 32, 'issuer': ISSUER, 'recipient': recipient,
+            'issuance_time': issuance_time, 'revocation_time': revocation_time}
+
+
+def encode(certificates, block_number, base_block=None, chain_id=CHAIN_ID, issuers=None):
+    meta = {'chain_id': chain_id, 'block_number': block_number, 'block_hash': b'\xab' * 32, 'base_block': base_block}
+    return encode_snapshot(meta, issuers or [issuer()], certificates, KEY)
+
+
+def test_round_trip():
+    certificates = [certificate(2, 200), certificate(1, 300, revocation_time=400)]
+    snapshot = decode_snapshot(encode(certificates, 50, base_block=40), SIGNER)
+    assert snapshot['is_delta'] and snapshot['base_block'] == 40
+    assert snapshot['chain_id'] == CHAIN_ID and snapshot['block_number'] == 50
+    assert snapshot['block_hash'] == '0x' + 'ab' * 32
+    assert snapshot['issuers'] == [issuer()]
+    assert snapshot['certificates'] == sorted(certificates, key=lambda c: c['hash'])
+
+
+def test_tampered_or_foreign_signer_rejected():
+    data = bytearray(encode([certificate(1, 200)], 50))
+    data[-70] ^= 1
+    with pytest.raises(SnapshotError):
+        decode_snapshot(bytes(data), SIGNER)
+    with pytest.raises(SnapshotError):
+        decode_snapshot(encode([certificate(1, 200)], 50), '0x' + '11' * 20)
+
+
+def test_wrong_chain_rejected(tmp_path):
+    path = tmp_path / 'state.snapshot'
+    path.write_bytes(encode([certificate(1, 200)], 50, chain_id=1))
+    with pytest.raises(SnapshotError):
+        SnapshotBlockchainService(path, SIGNER, CHAIN_ID)
+
+
+def test_deltas_keep_issuance_order_and_swap_state(tmp_path):
+    path = tmp_path / 'state.snapshot'
+    # Hash order (3, 5) differs from issuance order (5, 3) on purpose.
+    path.write_bytes(encode([certificate(5, 200), certificate(3, 300)], 50))
+    service = SnapshotBlockchainService(path, SIGNER, CHAIN_ID, recheck_interval=0)
+    before = service._refresh()
+
+    (tmp_path / 'a.delta').write_bytes(encode(
+        [certificate(9, 500), certificate(4, 400), certificate(5, 200, revocation_time=450)], 60, base_block=50,
+        issuers=[issuer('Renamed University')]))
+    (tmp_path / 'wrong-chain.delta').write_bytes(encode([certificate(8, 600)], 70, base_block=60, chain_id=1))
+
+    certificates, _ = service.get_certificates_for_recipient_page(RECIPIENT)
+    assert [c['hash'] for c in certificates] == ['0x' + bytes([n]).hex() * 32 for n in (5, 3, 4, 9)]
+    assert service.get_block_number() == 60
+    assert service.get_certificate_status(bytes([5]) * 32) == 'REVOKED'
+    assert service.get_certificate_status(bytes([8]) * 32) == 'NOT_FOUND'
+    assert service.get_issuer_info(ISSUER)['name'] == 'Renamed University'
+
+    # A reader holding the previous state still sees it unchanged.
+    assert before.block_number == 50
+    assert before.certificates[bytes([5]) * 32]['revocation_time'] == 0
+    assert before.recipients[RECIPIENT] == [bytes([5]) * 32, bytes([3]) * 32]
+
+
+def test_register_issuer_admin_read_only(tmp_path):
+    path = tmp_path / 'state.snapshot'
+    path.write_bytes(encode([certificate(1, 200)], 50))
+    service = SnapshotBlockchainService(path, SIGNER, CHAIN_ID)
+    # Called the way approve_issuer calls BlockchainService.
+    with pytest.raises(SnapshotError):
+        service.register_issuer_admin(ISSUER, 'University', 'Somewhere',
+                                      on_submitted=lambda tx_hash: None, pending_transaction=None)
+
+
+def test_merkle_lookups_unavailable(app, tmp_path, monkeypatch):
+    from app.routes import verification
+    from app.services import blockchain
+    from app.services.merkle import MerkleBatchStore
+    path = tmp_path / 'state.snapshot'
+    path.write_bytes(encode([certificate(1, 200)], 50))
+    monkeypatch.setattr(blockchain, '_service', SnapshotBlockchainService(path, SIGNER, CHAIN_ID))
+    store = MerkleBatchStore(tmp_path / 'merkle')
+    merkle_hash = bytes([7]) * 32
+    store.build_batch(ISSUER, [(merkle_hash, RECIPIENT)])
+    monkeypatch.setattr(verification, 'get_merkle_store', lambda: store)
+
+    client = app.test_client()
+    # An anchored Merkle certificate must not be reported as never issued.
+    response = client.post('/api/verify/hash', json={'hash': '0x' + merkle_hash.hex()})
+    assert response.status_code == 503
+    assert client.get(f"/api/verify/status/0x{merkle_hash.hex()}").status_code == 503
+    assert client.get(f"/api/verify/status/0x{(bytes([1]) * 32).hex()}").get_json()['data']['status'] == 'ACTIVE'
@@ -0,0 +1,36 @@
+import io
+import os
+
+from app.services.upload_spool import UploadSpool
+
+
+def test_store_keeps_only_the_record(tmp_path):
+    spool = UploadSpool(tmp_path, max_bytes=1024 * 1024)
+    pre_key = spool.pre_key(io.BytesIO(b'%PDF-1.4 certificate'))
+    spool.store(pre_key, 'ab' * 32, True, None)
+    assert spool.lookup(pre_key) == {'sha256': 'ab' * 32, 'is_valid': True, 'error': None}
+    assert [p.name for p in tmp_path.iterdir()] == [f"{pre_key}.json"]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    spool = UploadSpool(tmp_path, max_bytes=10 ** 6)
+    for i in range(5):
+        spool.store(f"key{i}", f"{i:064x}", True, None)
+        os.utime(tmp_path / f"key{i}.json", (i, i))
+    record_size = (tmp_path / 'key0.json').stat().st_size
+    spool.max_bytes = record_size * 5
+    spool.store('key5', f"{5:064x}", False, 'Invalid PDF file')
+    remaining = sorted(p.stem for p in tmp_path.iterdir())
+    assert remaining == ['key2', 'key3', 'key4', 'key5']
+
+
+def test_counts_records_from_other_workers(tmp_path):
+    first = UploadSpool(tmp_path, max_bytes=10 ** 6)
+    second = UploadSpool(tmp_path, max_bytes=10 ** 6)
+    for i in range(3):
+        second.store(f"other{i}", f"{i:064x}", True, None)
+    record_size = (tmp_path / 'other0.json').stat().st_size
+    first.max_bytes = record_size * 3
+    # The rescan after a tenth of max_bytes written sees the other worker's records.
+    first.store('mine', f"{9:064x}", True, None)
+    assert first.stats()['bytes'] <= first.max_bytes * 0.9
@@ -0,0 +1,63 @@
+import io
+
+import pytest
+from flask import jsonify
+
+from app.services.uploads import pdf_upload
+
+PDF = b'%PDF-1.4\n%%EOF\n'
+
+
+@pytest.fixture
+def upload_client(app):
+    @app.route('/test-upload', methods=['POST'])
+    @pdf_upload
+    def upload():
+        from flask import request
+        file = request.files['file']
+        file.seek(0)
+        return jsonify({'success': True, 'data': {'size': len(file.read())}})
+    return app.test_client()
+
+
+def post(client, body, filename='certificate.pdf', **kwargs):
+    return client.post('/test-upload', data={'file': (io.BytesIO(body), filename)},
+                       content_type='multipart/form-data', **kwargs)
+
+
+def test_accepts_pdf(upload_client):
+    response = post(upload_client, PDF)
+    assert response.status_code == 200
+    assert response.get_json()['data']['size'] == len(PDF)
+
+
+@pytest.mark.parametrize('body', [b'%', b'%PD', b'%PDF'])
+def test_rejects_part_shorter_than_magic(upload_client, body):
+    response = post(upload_client, body)
+    assert response.status_code == 415
+    assert response.get_json()['message'] == 'Invalid PDF file'
+
+
+def test_rejects_non_pdf_body(upload_client):
+    assert post(upload_client, b'PK\x03\x04 not a pdf').status_code == 415
+
+
+def test_rejects_non_pdf_filename(upload_client):
+    response = post(upload_client, PDF, filename='certificate.txt')
+    assert response.status_code == 415
+    assert response.get_json()['message'] == 'File must be PDF'
+
+
+def test_rejects_oversized_body(app, upload_client):
+    app.config['MAX_CONTENT_LENGTH'] = 1024
+    assert post(upload_client, PDF + b'0' * 2048).status_code == 413
+
+
+def test_requires_content_length(upload_client):
+    response = post(upload_client, PDF, headers={'Transfer-Encoding': 'chunked'})
+    assert response.status_code == 411
+
+
+def test_requires_multipart(upload_client):
+    response = upload_client.post('/test-upload', data=PDF, content_type='application/pdf')
+    assert response.status_code == 415
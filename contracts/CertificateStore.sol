@@ -2,35 +2,62 @@
 pragma solidity ^0.8.19;
 
 import "@openzeppelin/contracts/security/ReentrancyGuard.sol";
-import "@openzeppelin/contracts/utils/Counters.sol";
+import "@openzeppelin/contracts/utils/cryptography/MerkleProof.sol";
 
 interface IIssuerRegistry{
     function isRegisteredIssuer(address _issuerAddress) external view returns (bool);
     function incrementCertificateCount(address _issuerAddress) external;
+    function incrementCertificateCountBy(address _issuerAddress, uint256 _count) external;
     function getIssuerName(address _issuerAddress) external view returns (string memory);
 
 }
 
 contract CertificateStore is ReentrancyGuard{
-    using Counters for Counters.Counter;
 
+    // Packed into two slots: issuer, both timestamps and the revoked flag share
+    // slot 0 and recipient sits in slot 1. The hash is the mapping key and a
+    // certificate exists iff its issuer is non-zero.
     struct Certificate {
+        address issuer;
+        uint40 issuanceTime;
+        uint40 revocationTime;
+        bool isRevoked;
+        address recipient;
+    }
+
+    // A Merkle batch anchors an arbitrarily large set of certificates with one
+    // root. Leaves are merkleLeaf(certificateHash, recipient).
+    struct MerkleBatch {
+        address issuer;
+        uint40 anchoredAt;
+    }
+
+    // Full view of a stored certificate, returned by the detailed listing views.
+    struct CertificateRecord {
         bytes32 certificateHash;
         address issuer;
         address recipient;
         uint256 issuanceTime;
         bool isRevoked;
         uint256 revocationTime;
+        string issuerName;
     }
 
     IIssuerRegistry public issuerRegistry;
-    Counters.Counter private certificateCounter;
+    // Largest certificate count one Merkle root may claim; matches IssuerRegistry.MAX_COUNT_INCREMENT.
+    uint256 public constant MAX_MERKLE_BATCH = 1000000;
+    uint256 private certificateCount;
+    uint256 private revokedCount;
 
     mapping(bytes32 => Certificate) private certificates;
-    mapping(bytes32 => bool) private certificateExists;
     mapping(address => bytes32[]) private recipientCertificates;
     mapping(address => bytes32[]) private issuerCertificates;
-    mapping(address => mapping(bytes32 => uint256)) private recipientCertificateIndex;
+    // Individual certificates only; Merkle batches are counted separately below.
+    mapping(address => uint256) private issuerRevokedCount;
+    mapping(address => uint256) private issuerMerkleIssuedCount;
+    mapping(address => uint256) private issuerMerkleRevokedCount;
+    mapping(bytes32 => MerkleBatch) private merkleBatches;
+    mapping(bytes32 => mapping(bytes32 => uint40)) private merkleRevocations;
 
     event CertificateIssued(
         bytes32 indexed certificateHash,
@@ -51,6 +78,20 @@ contract CertificateStore is ReentrancyGuard{
         uint256 timestamp
     );
 
+    event MerkleRootAnchored(
+        bytes32 indexed merkleRoot,
+        address indexed issuer,
+        uint256 certificateCount,
+        uint256 timestamp
+    );
+
+    event MerkleCertificateRevoked(
+        bytes32 indexed merkleRoot,
+        bytes32 indexed certificateHash,
+        address indexed issuer,
+        uint256 timestamp
+    );
+
     modifier onlyRegisteredIssuer(){
         require(issuerRegistry.isRegisteredIssuer(msg.sender),
         "CertificateStore: Caller is not registered");
@@ -58,13 +99,13 @@ contract CertificateStore is ReentrancyGuard{
     }
 
     modifier certificateMustExist(bytes32 _certificateHash){
-        require(certificateExists[_certificateHash],
+        require(certificates[_certificateHash].issuer != address(0),
         "CertificateStore: Certificate does not exist");
         _;
     }
 
     modifier certificateMustNotExist(bytes32 _certificateHash){
-        require(!certificateExists[_certificateHash],
+        require(certificates[_certificateHash].issuer == address(0),
         "CertificateStore: Certificate already exists");
         _;
     }
@@ -100,20 +141,16 @@ contract CertificateStore is ReentrancyGuard{
         nonReentrant{
         
         certificates[_certificateHash] = Certificate({
-            certificateHash: _certificateHash,
             issuer: msg.sender,
-            recipient: _recipientAddress,
-            issuanceTime: block.timestamp,
+            issuanceTime: uint40(block.timestamp),
+            revocationTime: 0,
             isRevoked: false,
-            revocationTime: 0
+            recipient: _recipientAddress
         });
 
-        certificateExists[_certificateHash] = true;
         recipientCertificates[_recipientAddress].push(_certificateHash);
         issuerCertificates[msg.sender].push(_certificateHash);
-
-        recipientCertificateIndex[_recipientAddress][_certificateHash] = recipientCertificates[_recipientAddress].length - 1;
-        certificateCounter.increment();
+        certificateCount++;
         issuerRegistry.incrementCertificateCount(msg.sender);
         
         emit CertificateIssued(_certificateHash, msg.sender, _recipientAddress, block.timestamp);    
@@ -124,40 +161,102 @@ contract CertificateStore is ReentrancyGuard{
         onlyRegisteredIssuer
         nonReentrant{
         
-        require(_certificateHashes.length == _recipientAddresses.length, "CertificateStore: Array length mismatch");
-        require(_certificateHashes.length >0, "CertificateStore: Empty arrays");
-        require(_certificateHashes.length <= 100, "CertificateStore: Batch too large (max 100)");
+        uint256 count = _certificateHashes.length;
+        require(count == _recipientAddresses.length, "CertificateStore: Array length mismatch");
+        require(count >0, "CertificateStore: Empty arrays");
+        require(count <= 100, "CertificateStore: Batch too large (max 100)");
 
-        for(uint256 i = 0;i < _certificateHashes.length; i++){
+        uint40 timestamp = uint40(block.timestamp);
+        bytes32[] storage issuedBySender = issuerCertificates[msg.sender];
+
+        for(uint256 i = 0;i < count; ){
             bytes32 certHash = _certificateHashes[i];
             address recipient = _recipientAddresses[i];
 
             require(certHash != bytes32(0), "CertificateStore: Invalid hash in batch");
             require(recipient != address(0), "CertificateStore: Invalid address in batch");
-            require(!certificateExists[certHash],"CertificateStore: Duplicate certification in batch");
+            require(certificates[certHash].issuer == address(0),"CertificateStore: Duplicate certification in batch");
 
             certificates[certHash] = Certificate({
-                certificateHash: certHash,
                 issuer: msg.sender,
-                recipient: recipient,
-                issuanceTime: block.timestamp,
+                issuanceTime: timestamp,
+                revocationTime: 0,
                 isRevoked: false,
-                revocationTime: 0
+                recipient: recipient
             });
-            certificateExists[certHash] = true;
             recipientCertificates[recipient].push(certHash);
-            issuerCertificates[msg.sender].push(certHash);
-            recipientCertificateIndex[recipient][certHash] = recipientCertificates[recipient].length-1;
-
-            certificateCounter.increment();
+            issuedBySender.push(certHash);
 
-            emit CertificateIssued(certHash, msg.sender, recipient, block.timestamp);
+            emit CertificateIssued(certHash, msg.sender, recipient, timestamp);
+            unchecked { ++i; }
         }
-        for(uint256 i = 0; i < _certificateHashes.length; i++){
-            issuerRegistry.incrementCertificateCount(msg.sender);
+        // One counter write and one registry call per batch instead of one per certificate.
+        certificateCount += count;
+        issuerRegistry.incrementCertificateCountBy(msg.sender, count);
+        emit BatchCertificatesIssued(msg.sender, count, timestamp);
+
+    }
+
+    function anchorMerkleRoot(bytes32 _merkleRoot, uint256 _certificateCount)
+        external
+        onlyRegisteredIssuer
+        validHash(_merkleRoot)
+        nonReentrant{
+
+        require(_certificateCount > 0, "CertificateStore: Empty batch");
+        require(_certificateCount <= MAX_MERKLE_BATCH, "CertificateStore: Batch too large");
+        require(merkleBatches[_merkleRoot].issuer == address(0), "CertificateStore: Merkle root already anchored");
+
+        merkleBatches[_merkleRoot] = MerkleBatch({
+            issuer: msg.sender,
+            anchoredAt: uint40(block.timestamp)
+        });
+        certificateCount += _certificateCount;
+        issuerMerkleIssuedCount[msg.sender] += _certificateCount;
+        issuerRegistry.incrementCertificateCountBy(msg.sender, _certificateCount);
+
+        emit MerkleRootAnchored(_merkleRoot, msg.sender, _certificateCount, block.timestamp);
+    }
+
+    function revokeMerkleCertificate(bytes32 _merkleRoot, bytes32 _certificateHash, address _recipientAddress, bytes32[] calldata _proof)
+        external
+        onlyRegisteredIssuer
+        nonReentrant{
+
+        require(merkleBatches[_merkleRoot].issuer == msg.sender,
+        "CertificateStore: Caller is not the issuer of this batch");
+        require(MerkleProof.verifyCalldata(_proof, _merkleRoot, merkleLeaf(_certificateHash, _recipientAddress)),
+        "CertificateStore: Invalid Merkle proof");
+        require(merkleRevocations[_merkleRoot][_certificateHash] == 0, "CertificateStore: Certificate already revoked");
+
+        merkleRevocations[_merkleRoot][_certificateHash] = uint40(block.timestamp);
+        revokedCount++;
+        issuerMerkleRevokedCount[msg.sender]++;
+
+        emit MerkleCertificateRevoked(_merkleRoot, _certificateHash, msg.sender, block.timestamp);
+    }
+
+    function verifyMerkleCertificate(bytes32 _merkleRoot, bytes32 _certificateHash, address _recipientAddress, bytes32[] calldata _proof)
+        external
+        view
+        returns(bool isValid, address issuer, uint256 anchoredAt, bool isRevoked, uint256 revocationTime, string memory issuerName){
+
+        MerkleBatch memory batch = merkleBatches[_merkleRoot];
+        if(batch.issuer == address(0) ||
+            !MerkleProof.verifyCalldata(_proof, _merkleRoot, merkleLeaf(_certificateHash, _recipientAddress))){
+            return(false, address(0), 0, false, 0, "");
         }
-        emit BatchCertificatesIssued(msg.sender, _certificateHashes.length, block.timestamp);
+        uint40 revokedAt = merkleRevocations[_merkleRoot][_certificateHash];
+        return(true, batch.issuer, batch.anchoredAt, revokedAt != 0, revokedAt, _issuerName(batch.issuer));
+    }
+
+    function getMerkleBatch(bytes32 _merkleRoot) external view returns (address issuer, uint256 anchoredAt){
+        MerkleBatch memory batch = merkleBatches[_merkleRoot];
+        return (batch.issuer, batch.anchoredAt);
+    }
 
+    function merkleLeaf(bytes32 _certificateHash, address _recipientAddress) public pure returns (bytes32){
+        return keccak256(bytes.concat(keccak256(abi.encode(_certificateHash, _recipientAddress))));
     }
 
     function verifyCertificate(bytes32 _certificateHash)
@@ -166,18 +265,79 @@ contract CertificateStore is ReentrancyGuard{
         validHash(_certificateHash)
         returns(bool isValid, address issuer, address recipient, uint256 issuanceTime, bool isRevoked, string memory issuerName){
 
-        if(!certificateExists[_certificateHash]){
+        Certificate memory cert = certificates[_certificateHash];
+        if(cert.issuer == address(0)){
             return(false, address(0), address(0), 0, false, "");
         }
-        Certificate memory cert = certificates[_certificateHash];
-        string memory name = "";
-        try issuerRegistry.getIssuerName(cert.issuer) returns (string memory _name){
-            name = _name;
+        return(true, cert.issuer, cert.recipient, cert.issuanceTime, cert.isRevoked, _issuerName(cert.issuer));
+    }
+
+    function verifyCertificates(bytes32[] calldata _certificateHashes)
+        external
+        view
+        returns(
+            bool[] memory exists,
+            address[] memory issuers,
+            address[] memory recipients,
+            uint256[] memory issuanceTimes,
+            bool[] memory revoked,
+            uint256[] memory revocationTimes,
+            string[] memory issuerNames
+        ){
+
+        exists = new bool[](_certificateHashes.length);
+        issuers = new address[](_certificateHashes.length);
+        recipients = new address[](_certificateHashes.length);
+        issuanceTimes = new uint256[](_certificateHashes.length);
+        revoked = new bool[](_certificateHashes.length);
+        revocationTimes = new uint256[](_certificateHashes.length);
+
+        for(uint256 i = 0; i < _certificateHashes.length; i++){
+            Certificate storage cert = certificates[_certificateHashes[i]];
+            if(cert.issuer == address(0)){
+                continue;
+            }
+            exists[i] = true;
+            issuers[i] = cert.issuer;
+            recipients[i] = cert.recipient;
+            issuanceTimes[i] = cert.issuanceTime;
+            revoked[i] = cert.isRevoked;
+            revocationTimes[i] = cert.revocationTime;
+        }
+        issuerNames = _resolveIssuerNames(issuers);
+    }
+
+    function _issuerName(address _issuerAddress) private view returns (string memory){
+        try issuerRegistry.getIssuerName(_issuerAddress) returns (string memory _name){
+            return _name;
         }catch{
-            name = "Unknown Issuer";
+            return "Unknown Issuer";
         }
+    }
 
-        return(true, cert.issuer, cert.recipient, cert.issuanceTime, cert.isRevoked, name);
+    // Looks each distinct issuer up once; batches are dominated by a handful of issuers.
+    function _resolveIssuerNames(address[] memory _issuers) private view returns (string[] memory names){
+        names = new string[](_issuers.length);
+        address[] memory seen = new address[](_issuers.length);
+        string[] memory seenNames = new string[](_issuers.length);
+        uint256 seenCount = 0;
+
+        for(uint256 i = 0; i < _issuers.length; i++){
+            address issuer = _issuers[i];
+            if(issuer == address(0)){
+                continue;
+            }
+            uint256 j = 0;
+            while(j < seenCount && seen[j] != issuer){
+                j++;
+            }
+            if(j == seenCount){
+                seen[j] = issuer;
+                seenNames[j] = _issuerName(issuer);
+                seenCount++;
+            }
+            names[i] = seenNames[j];
+        }
     }
 
     function isCertificateValid(bytes32 _certificateHash)
@@ -185,10 +345,8 @@ contract CertificateStore is ReentrancyGuard{
         view
         returns (bool){
 
-        if(!certificateExists[_certificateHash]){
-            return false;
-        }
-        return !certificates[_certificateHash].isRevoked;
+        Certificate storage cert = certificates[_certificateHash];
+        return cert.issuer != address(0) && !cert.isRevoked;
     }
 
     function revokeCertificate(bytes32 _certificateHash)
@@ -201,7 +359,9 @@ contract CertificateStore is ReentrancyGuard{
         Certificate storage cert = certificates[_certificateHash];
         require(!cert.isRevoked, "CertificateStore: Certificate already revoked");
         cert.isRevoked = true;
-        cert.revocationTime = block.timestamp;
+        cert.revocationTime = uint40(block.timestamp);
+        revokedCount++;
+        issuerRevokedCount[msg.sender]++;
 
         emit CertificateRevoked(_certificateHash, msg.sender, block.timestamp);
     }
@@ -221,7 +381,7 @@ contract CertificateStore is ReentrancyGuard{
         
         Certificate memory cert = certificates[_certificateHash];
         return (
-            cert.certificateHash,
+            _certificateHash,
             cert.issuer,
             cert.recipient,
             cert.issuanceTime,
@@ -235,24 +395,80 @@ contract CertificateStore is ReentrancyGuard{
     view
     validAddress(_recipientAddress)
     returns (bytes32[] memory hashes, bool hasMore) {
-        bytes32[] storage recipientCerts = recipientCertificates[_recipientAddress];
-        require(_start < recipientCerts.length || recipientCerts.length == 0, "CertifiateStore: Start index out of bounds");
+        return _paginate(recipientCertificates[_recipientAddress], _start, _limit);
+    }
+
+    function getCertificatesForRecipientDetailed(address _recipientAddress, uint256 _start, uint256 _limit)
+    external
+    view
+    validAddress(_recipientAddress)
+    returns (CertificateRecord[] memory records, bool hasMore) {
+        bytes32[] memory hashes;
+        (hashes, hasMore) = _paginate(recipientCertificates[_recipientAddress], _start, _limit);
+
+        records = new CertificateRecord[](hashes.length);
+        address[] memory issuers = new address[](hashes.length);
+        for(uint256 i = 0; i < hashes.length; i++){
+            Certificate storage cert = certificates[hashes[i]];
+            records[i].certificateHash = hashes[i];
+            records[i].issuer = cert.issuer;
+            records[i].recipient = cert.recipient;
+            records[i].issuanceTime = cert.issuanceTime;
+            records[i].isRevoked = cert.isRevoked;
+            records[i].revocationTime = cert.revocationTime;
+            issuers[i] = cert.issuer;
+        }
+        string[] memory names = _resolveIssuerNames(issuers);
+        for(uint256 i = 0; i < hashes.length; i++){
+            records[i].issuerName = names[i];
+        }
+    }
+
+    function getCertificatesIssuedBy(address _issuerAddress, uint256 _start, uint256 _limit)
+    external
+    view
+    validAddress(_issuerAddress)
+    returns (bytes32[] memory hashes, bool hasMore) {
+        return _paginate(issuerCertificates[_issuerAddress], _start, _limit);
+    }
+
+    function getIssuerCertificateStats(address _issuerAddress)
+    external
+    view
+    validAddress(_issuerAddress)
+    returns (uint256 totalIssued, uint256 totalRevoked) {
+        totalIssued = issuerCertificates[_issuerAddress].length;
+        totalRevoked = issuerRevokedCount[_issuerAddress];
+    }
+
+    function getIssuerMerkleStats(address _issuerAddress)
+    external
+    view
+    validAddress(_issuerAddress)
+    returns (uint256 totalIssued, uint256 totalRevoked) {
+        totalIssued = issuerMerkleIssuedCount[_issuerAddress];
+        totalRevoked = issuerMerkleRevokedCount[_issuerAddress];
+    }
+
+    function _paginate(bytes32[] storage _list, uint256 _start, uint256 _limit)
+    private
+    view
+    returns (bytes32[] memory hashes, bool hasMore) {
+        require(_start < _list.length || _list.length == 0, "CertificateStore: Start index out of bounds");
         uint256 end = _start + _limit;
-        if(end > recipientCerts.length){
-            end = recipientCerts.length;
+        if(end > _list.length){
+            end = _list.length;
         }
 
         hashes = new bytes32[](end - _start);
         for(uint256 i = _start; i < end; i++){
-            hashes[i - _start] = recipientCerts[i];
+            hashes[i - _start] = _list[i];
         }
-        hasMore = end < recipientCerts.length;
+        hasMore = end < _list.length;
     }
 
-    // function getCertificatesIssuedBy(){}
-
     function getTotalCertificates() external view returns (uint256){
-        return certificateCounter.current();
+        return certificateCount;
     }
 
     // function getRecipientCertificateCount(){}
@@ -260,7 +476,7 @@ contract CertificateStore is ReentrancyGuard{
     function getContractStats() external view returns(
         uint256 totalCertificates, uint256 totalRevoked
     ){
-        totalCertificates = certificateCounter.current();
-        totalRevoked = 0;
+        totalCertificates = certificateCount;
+        totalRevoked = revokedCount;
     }
 }
@@ -20,18 +20,27 @@ contract IssuerRegistry is Ownable, ReentrancyGuard{
     address[] private issuerAddresses;
     mapping(address => bool) private isRegistered;
     uint256 private totalIssuers;
+    // The only contract allowed to bump certificate counts.
+    address public certificateStore;
+    // Upper bound on a single count update; keeps the counters far from overflow.
+    uint256 public constant MAX_COUNT_INCREMENT = 1000000;
 
     event IssuerRegistered(address indexed issuerAddress, string name, string location, uint256 timestamp);
     event IssuerUpdated(address indexed IssuerAddress, string name, string location, uint256 timestamp);
     event IssuerDeactivated(address indexed issuerAddress, uint256 timestamp);
     event IssuerReactivated(address indexed issuerAddress, uint256 timestamp);
     event CertificateCountUpdated(address indexed issuerAddress, uint256 newCount);
+    event CertificateStoreUpdated(address indexed certificateStore);
 
     modifier onlyRegisteredIssuer(){
         require(isRegistered[msg.sender], "IssuerRegistry: Caller is not a registered");
         require(issuers[msg.sender].isActive, "IssuerRegistry: Issuer is not active");
         _;
     }
+    modifier onlyCertificateStore(){
+        require(msg.sender == certificateStore, "IssuerRegistry: Caller is not the certificate store");
+        _;
+    }
     modifier validAddress(address _address){
         require(_address != address(0), "IssuerRegistry: Invalid address");
         _;
@@ -99,12 +108,29 @@ contract IssuerRegistry is Ownable, ReentrancyGuard{
         emit IssuerReactivated(_issuerAddress, block.timestamp);
     }
 
-    function incrementCertificateCount(address _issuerAddress) external validAddress(_issuerAddress){
+    function setCertificateStore(address _certificateStore)
+        external onlyOwner validAddress(_certificateStore){
+        certificateStore = _certificateStore;
+        emit CertificateStoreUpdated(_certificateStore);
+    }
+
+    function incrementCertificateCount(address _issuerAddress)
+        external onlyCertificateStore validAddress(_issuerAddress){
         require(isRegistered[_issuerAddress], "IssuerRegistry: Issuer not registered");
         issuers[_issuerAddress].totalCertificatesIssued++;
         emit CertificateCountUpdated(_issuerAddress, issuers[_issuerAddress].totalCertificatesIssued);
     }
 
+    function incrementCertificateCountBy(address _issuerAddress, uint256 _count)
+        external onlyCertificateStore validAddress(_issuerAddress){
+        require(isRegistered[_issuerAddress], "IssuerRegistry: Issuer not registered");
+        require(_count > 0, "IssuerRegistry: Count must be greater than 0");
+        require(_count <= MAX_COUNT_INCREMENT, "IssuerRegistry: Count too large");
+        uint256 newCount = issuers[_issuerAddress].totalCertificatesIssued + _count;
+        issuers[_issuerAddress].totalCertificatesIssued = newCount;
+        emit CertificateCountUpdated(_issuerAddress, newCount);
+    }
+
 
     function isRegisteredIssuer(address _issuerAddress) external view  returns (bool){
         return isRegistered[_issuerAddress] && issuers[_issuerAddress].isActive;
@@ -1,10 +1,13 @@
 const API_BASE = process.env.REACT_APP_API_URL || 'http://127.0.0.1:5000/api';
 
+const withIdempotencyKey = (headers, key) => (key ? { ...headers, 'Idempotency-Key': key } : headers);
+
 const api = {
-  async registerInstitution(data) {
+  // Reuse the same idempotencyKey when retrying a submission so it is applied once.
+  async registerInstitution(data, idempotencyKey) {
     const res = await fetch(`${API_BASE}/issuer/register`, {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers: withIdempotencyKey({ 'Content-Type': 'application/json' }, idempotencyKey),
       body: JSON.stringify(data)
     });
     return res.json();
@@ -58,9 +61,64 @@ const api = {
     return res.json();
   },
 
+  async getIssuerCertificates(address, start = 0, limit = 50) {
+    const res = await fetch(`${API_BASE}/certificate/issuer/${address}?start=${start}&limit=${limit}`);
+    return res.json();
+  },
+
   async checkIssuer(address) {
     const res = await fetch(`${API_BASE}/issuer/check/${address}`);
     return res.json();
+  },
+
+  async checkIssuers(addresses) {
+    const res = await fetch(`${API_BASE}/issuer/check`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ addresses })
+    });
+    return res.json();
+  },
+
+  // signature: the issuer's personal_sign of the batch's Merkle root.
+  async buildMerkleBatch(issuerAddress, certificates, signature, idempotencyKey) {
+    const res = await fetch(`${API_BASE}/certificate/merkle/build`, {
+      method: 'POST',
+      headers: withIdempotencyKey({ 'Content-Type': 'application/json' }, idempotencyKey),
+      body: JSON.stringify({ issuer_address: issuerAddress, certificates, signature })
+    });
+    return res.json();
+  },
+
+  async getMerkleProof(hash) {
+    const res = await fetch(`${API_BASE}/certificate/merkle/proof/${hash}`);
+    return res.json();
+  },
+
+  // ACTIVE, REVOKED or NOT_FOUND without the certificate details.
+  async getCertificateStatus(hash) {
+    const res = await fetch(`${API_BASE}/verify/status/${hash}`);
+    return res.json();
+  },
+
+  async getVerificationReceipt(hash) {
+    const res = await fetch(`${API_BASE}/verify/receipt/${hash}`);
+    return res.json();
+  },
+
+  // Returns the EventSource; call close() on it to unsubscribe.
+  subscribeCertificateEvents(filters, onEvent) {
+    const params = new URLSearchParams(filters).toString();
+    const source = new EventSource(`${API_BASE}/certificate/events?${params}`);
+    ['issued', 'revoked', 'merkle_anchored', 'merkle_revoked'].forEach((type) =>
+      source.addEventListener(type, (e) => onEvent(type, JSON.parse(e.data)))
+    );
+    return source;
+  },
+
+  async getRevocations(since = -1) {
+    const res = await fetch(`${API_BASE}/verify/revocations?format=json&since=${since}`);
+    return res.json();
   }
 };
 
@@ -313,6 +313,54 @@ export const batchIssueCertificates = async (certificateHashes, recipientAddress
     }
 };
 
+export const anchorMerkleRoot = async (merkleRoot, certificateCount, fromAddress) => {
+    try {
+        const web3 = new Web3(process.env.REACT_APP_WEB3_PROVIDER);
+        const checksumFrom = web3.utils.toChecksumAddress(fromAddress);
+        const contract = getCertificateStoreContract();
+        
+        const gasEstimate = await contract.methods
+        .anchorMerkleRoot(merkleRoot, certificateCount)
+        .estimateGas({ from: checksumFrom });
+        
+        const tx = await contract.methods
+        .anchorMerkleRoot(merkleRoot, certificateCount)
+        .send({
+            from: checksumFrom,
+            gas: withGasBuffer(gasEstimate),
+        });
+        
+        return { success: true, tx };
+    } catch (error) {
+        console.error('Error anchoring Merkle root:', error);
+        throw error;
+    }
+};
+
+// `proof` is the payload served by /api/certificate/merkle/proof/<hash>.
+export const revokeMerkleCertificate = async (certificateHash, proof, fromAddress) => {
+    try {
+        const web3 = new Web3(process.env.REACT_APP_WEB3_PROVIDER);
+        const checksumFrom = web3.utils.toChecksumAddress(fromAddress);
+        const hashWithPrefix = certificateHash.startsWith('0x') ? certificateHash : '0x' + certificateHash;
+        const contract = getCertificateStoreContract();
+        const method = contract.methods.revokeMerkleCertificate(
+            proof.merkle_root, hashWithPrefix, proof.recipient, proof.proof
+        );
+        
+        const gasEstimate = await method.estimateGas({ from: checksumFrom });
+        const tx = await method.send({
+            from: checksumFrom,
+            gas: withGasBuffer(gasEstimate),
+        });
+        
+        return { success: true, tx };
+    } catch (error) {
+        console.error('Error revoking Merkle certificate:', error);
+        throw error;
+    }
+};
+
 export const subscribeToCertificateIssued = (callback, options = {}) => {
     try {
         const contract = getCertificateStoreContract();
@@ -366,6 +414,8 @@ export default {
   getCertificateStats,
   revokeCertificate,
   batchIssueCertificates,
+  anchorMerkleRoot,
+  revokeMerkleCertificate,
   
   // Event listeners
   subscribeToCertificateIssued,
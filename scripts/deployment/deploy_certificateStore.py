@@ -34,6 +34,11 @@ def deploy_certificateStore():
         print("Transaction Details..")
         print_transaction_details(certificate_store.tx)
         
+        # Only the store may bump issuer certificate counts.
+        tx = issuer_registry.setCertificateStore(certificate_store.address, {'from': account})
+        tx.wait(1)
+        print(f"IssuerRegistry certificate store set: {issuer_registry.certificateStore()}")
+
         connected_registry = certificate_store.issuerRegistry()
         print(f"Connected IssuerRegistry: {connected_registry}")
         print(f"Address Match: {'Success' if connected_registry == issuer_registry_address else 'Failed'}")
@@ -32,6 +32,8 @@ def deploy_issuer_registry():
         # print(f" -Total Certificates: {stats[2]}")
 
         save_deployment_info("IssuerRegistry", issuer_registry.address,network.show_active())
+        # Certificate counts only accept the linked store, so issuance reverts until then.
+        print("Next: deploy_certificateStore.py, which links the store to this registry")
         # print_section("Next Steps")
         # print("1. Register sample institutions using register_issuers.py")
         # print("2. Run tests with: brownie test tests/test_issuer_registry.py")
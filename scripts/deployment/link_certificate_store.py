@@ -0,0 +1,52 @@
+from brownie import network, CertificateStore, IssuerRegistry, ZERO_ADDRESS
+from scripts.help_scripts import (get_account, print_section, print_transaction_details, load_deployment_info)
+
+# Migration for registries deployed before incrementCertificateCount(By) became
+# onlyCertificateStore: until the owner links the store, every issuance reverts with
+# "IssuerRegistry: Caller is not the certificate store". deploy_certificateStore.py
+# links new deployments itself; run this once for the ones in deployments/*.json:
+#   brownie run scripts/deployment/link_certificate_store.py --network <network>
+
+def link_certificate_store():
+    print("LINKING CERTIFICATE STORE")
+    registry_info = load_deployment_info("IssuerRegistry", network.show_active())
+    store_info = load_deployment_info("CertificateStore", network.show_active())
+    if not registry_info or not store_info:
+        print("IssuerRegistry and CertificateStore must both be deployed")
+        return None
+
+    account = get_account()
+    issuer_registry = IssuerRegistry.at(registry_info["address"])
+    certificate_store = CertificateStore.at(store_info["address"])
+
+    print_section("Deployment Check")
+    connected_registry = certificate_store.issuerRegistry()
+    if connected_registry != issuer_registry.address:
+        print(f"CertificateStore points at {connected_registry}, not {issuer_registry.address}; redeploy it")
+        return None
+    if issuer_registry.owner() != account.address:
+        print(f"Account mismatch. Contract owner: {issuer_registry.owner()}")
+        return None
+
+    current = issuer_registry.certificateStore()
+    if current == certificate_store.address:
+        print(f"Already linked: {current}")
+        return issuer_registry
+    if current != ZERO_ADDRESS:
+        print(f"Replacing previous certificate store {current}")
+
+    try:
+        tx = issuer_registry.setCertificateStore(certificate_store.address, {'from': account})
+        tx.wait(1)
+        print_transaction_details(tx)
+        print(f"IssuerRegistry certificate store set: {issuer_registry.certificateStore()}")
+        return issuer_registry
+    except Exception as e:
+        print(f"Linking failed: {e}")
+        return None
+
+def main():
+    return link_certificate_store()
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,14 @@ def generate_certificate_hash(content):
         content = content.encode('utf-8')
     return hashlib.sha256(content).hexdigest()
 
+def hash_file(path, chunk_size=1024 * 1024):
+    # Streams the file so large PDFs never sit fully in memory; matches the backend's SHA-256 hash.
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
 def format_address(address):
     return f"{address[:6]}...{address[-4]}"
 
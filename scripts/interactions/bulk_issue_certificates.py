@@ -0,0 +1,157 @@
+from brownie import accounts, network, CertificateStore
+from scripts.help_scripts import (format_address, print_section, load_deployment_info, get_account, hash_file)
+from concurrent.futures import ProcessPoolExecutor
+from web3 import Web3
+from pathlib import Path
+import json
+import csv
+import os
+
+# Usage:
+#   brownie run scripts/interactions/bulk_issue_certificates.py main <manifest> [issuer_address] [checkpoint] --network <net>
+# The manifest is a CSV with pdf_path,recipient columns or JSONL with the same keys.
+# Relative PDF paths are resolved against the manifest's directory.
+
+BATCH_SIZE = 100        # CertificateStore.batchIssueCertificates limit
+LOOKUP_SIZE = 250       # hashes per verifyCertificates pre-filter call
+MAX_IN_FLIGHT = 8       # pipelined transactions awaiting confirmation
+
+def load_manifest(manifest_path):
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, 'r', newline='') as f:
+        if manifest_path.suffix.lower() == '.csv':
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    entries = []
+    for line_no, row in enumerate(rows, 1):
+        pdf_path = Path(row['pdf_path'])
+        if not pdf_path.is_absolute():
+            pdf_path = manifest_path.parent / pdf_path
+        recipient = (row.get('recipient') or '').strip()
+        if not Web3.is_address(recipient):
+            raise ValueError(f"Manifest entry {line_no}: invalid recipient {recipient!r}")
+        entries.append((str(pdf_path), Web3.to_checksum_address(recipient)))
+    return entries
+
+def load_checkpoint(checkpoint_path):
+    issued = set()
+    if checkpoint_path.exists():
+        with open(checkpoint_path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    issued.update(json.loads(line)['hashes'])
+    return issued
+
+def append_checkpoint(checkpoint_path, tx, hashes):
+    with open(checkpoint_path, 'a') as f:
+        f.write(json.dumps({'tx': tx.txid, 'block': tx.block_number, 'hashes': hashes}) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+def hash_manifest(entries):
+    print(f"Hashing {len(entries)} PDFs with {os.cpu_count()} workers...")
+    with ProcessPoolExecutor() as pool:
+        hashes = list(pool.map(hash_file, [path for path, _ in entries], chunksize=64))
+    return ['0x' + h for h in hashes]
+
+def filter_pending(certificate_store, entries, hashes, issued):
+    seen = set(issued)
+    candidates = []
+    for (path, recipient), cert_hash in zip(entries, hashes):
+        if cert_hash in seen:
+            continue
+        seen.add(cert_hash)
+        candidates.append((cert_hash, recipient, path))
+
+    pending = []
+    for start in range(0, len(candidates), LOOKUP_SIZE):
+        chunk = candidates[start:start + LOOKUP_SIZE]
+        exists = certificate_store.verifyCertificates([c[0] for c in chunk])[0]
+        pending.extend(c for c, found in zip(chunk, exists) if not found)
+    print(f"{len(entries) - len(pending)} already issued or duplicated, {len(pending)} to issue")
+    return pending
+
+def resolve_issuer(issuer_address):
+    if not issuer_address:
+        return get_account()
+    issuer_address = Web3.to_checksum_address(issuer_address)
+    for account in accounts:
+        if account.address == issuer_address:
+            return account
+    raise ValueError(f"No unlocked account for issuer {issuer_address}")
+
+def confirm(tx, checkpoint_path, hashes):
+    tx.wait(1)
+    if tx.status != 1:
+        print(f"  Batch {tx.txid} reverted, {len(hashes)} certificates not issued")
+        return False
+    append_checkpoint(checkpoint_path, tx, hashes)
+    print(f"  Confirmed {tx.txid} ({len(hashes)} certificates, gas {tx.gas_used:,})")
+    return True
+
+def bulk_issue(manifest_path, issuer_address=None, checkpoint_path=None):
+    print_section("Loading Contracts")
+    cert_store_info = load_deployment_info("CertificateStore", network.show_active())
+    if not cert_store_info:
+        print("Contracts not deployed")
+        return None
+    certificate_store = CertificateStore.at(cert_store_info["address"])
+    issuer = resolve_issuer(issuer_address)
+    print(f"CertificateStore: {certificate_store.address}")
+    print(f"Issuer: {format_address(issuer.address)}")
+
+    checkpoint_path = Path(checkpoint_path or f"{manifest_path}.checkpoint.jsonl")
+    issued = load_checkpoint(checkpoint_path)
+    if issued:
+        print(f"Resuming from {checkpoint_path}: {len(issued)} certificates already issued")
+
+    print_section("Preparing Certificates")
+    entries = load_manifest(manifest_path)
+    hashes = hash_manifest(entries)
+    pending = filter_pending(certificate_store, entries, hashes, issued)
+    if not pending:
+        print("Nothing to issue")
+        return certificate_store
+
+    print_section("Issuing Certificates")
+    nonce = issuer.nonce
+    in_flight = []
+    failed = False
+    for start in range(0, len(pending), BATCH_SIZE):
+        chunk = pending[start:start + BATCH_SIZE]
+        chunk_hashes = [c[0] for c in chunk]
+        tx = certificate_store.batchIssueCertificates(
+            chunk_hashes, [c[1] for c in chunk],
+            {'from': issuer, 'nonce': nonce, 'required_confs': 0}
+        )
+        nonce += 1
+        in_flight.append((tx, chunk_hashes))
+        print(f"Sent batch {start // BATCH_SIZE + 1} ({len(chunk)} certificates): {tx.txid}")
+
+        if len(in_flight) >= MAX_IN_FLIGHT:
+            tx, sent = in_flight.pop(0)
+            if not confirm(tx, checkpoint_path, sent):
+                failed = True
+                break
+
+    for tx, sent in in_flight:
+        failed = not confirm(tx, checkpoint_path, sent) or failed
+
+    issued_now = len(load_checkpoint(checkpoint_path)) - len(issued)
+    print_section("Summary")
+    print(f"Issued this run: {issued_now}")
+    print(f"Checkpoint: {checkpoint_path}")
+    if failed:
+        print("Some batches failed; re-run the same command to resume")
+    return certificate_store
+
+def main(manifest_path=None, issuer_address=None, checkpoint_path=None):
+    if not manifest_path:
+        print("Usage: brownie run scripts/interactions/bulk_issue_certificates.py main <manifest> [issuer_address] [checkpoint]")
+        return None
+    return bulk_issue(manifest_path, issuer_address, checkpoint_path)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,19 @@
-from scripts.help_scripts import print_section, load_deployment_info
+from scripts.help_scripts import print_section, load_deployment_info, hash_file
 from brownie import network, CertificateStore, IssuerRegistry
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import json
+import csv
+import os
 import time
+
+# Directory mode:
+#   brownie run scripts/interactions/verify_certificate.py main <directory> [report.csv|report.json] --network <net>
+# Without arguments the script verifies one hash typed on stdin.
+
+LOOKUP_SIZE = 250   # hashes per verifyCertificates call
+REPORT_FIELDS = ['path', 'hash', 'status', 'issuer', 'issuer_name', 'recipient',
+                 'issuance_time', 'revocation_time', 'error']
 def get_verify_input():
     print("\nEnter Certificate Information to verif7:")
     print("="*60)
@@ -81,7 +94,86 @@ def verify_certificate():
 
     return certificate_store
 
-def main():
+def find_pdfs(directory):
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith('.pdf'):
+                yield os.path.join(root, name)
+
+def _safe_hash(path):
+    try:
+        return path, '0x' + hash_file(path), None
+    except OSError as e:
+        return path, None, str(e)
+
+def _lookup_rows(certificate_store, batch):
+    hashes = [row['hash'] for row in batch]
+    exists, issuers, recipients, issuance_times, revoked, revocation_times, names = \
+        certificate_store.verifyCertificates(hashes)
+    for i, row in enumerate(batch):
+        if not exists[i]:
+            row['status'] = 'NOT_FOUND'
+            continue
+        row.update({
+            'status': 'REVOKED' if revoked[i] else 'ACTIVE',
+            'issuer': issuers[i],
+            'issuer_name': names[i],
+            'recipient': recipients[i],
+            'issuance_time': issuance_times[i],
+            'revocation_time': revocation_times[i]
+        })
+
+def write_report(report_path, rows):
+    report_path = Path(report_path)
+    with open(report_path, 'w', newline='') as f:
+        if report_path.suffix.lower() == '.json':
+            json.dump(rows, f, indent=2)
+        else:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+def verify_directory(directory, report_path=None):
+    print("BULK CERTIFICATE VERIFICATION")
+    print_section("Loading Contracts")
+    cert_store_info = load_deployment_info("CertificateStore", network.show_active())
+    if not cert_store_info:
+        print("Contract not deployed")
+        return None
+    certificate_store = CertificateStore.at(cert_store_info["address"])
+    print(f"CertificateStore: {certificate_store.address}")
+
+    report_path = report_path or 'verification_report.csv'
+    print_section("Verifying Files")
+    rows = []
+    batch = []
+    started = time.time()
+    with ProcessPoolExecutor() as pool:
+        # Lookups overlap with hashing: each full batch is checked while workers keep hashing.
+        for path, cert_hash, error in pool.map(_safe_hash, find_pdfs(directory), chunksize=64):
+            row = dict.fromkeys(REPORT_FIELDS, '')
+            row.update({'path': path, 'hash': cert_hash or '', 'status': 'ERROR' if error else '', 'error': error or ''})
+            rows.append(row)
+            if cert_hash:
+                batch.append(row)
+            if len(batch) >= LOOKUP_SIZE:
+                _lookup_rows(certificate_store, batch)
+                batch = []
+                print(f" {len(rows)} files checked...")
+        if batch:
+            _lookup_rows(certificate_store, batch)
+
+    write_report(report_path, rows)
+    print_section("Summary")
+    for status in ('ACTIVE', 'REVOKED', 'NOT_FOUND', 'ERROR'):
+        print(f" {status}: {sum(1 for row in rows if row['status'] == status)}")
+    print(f" Files: {len(rows)} in {time.time() - started:.1f}s")
+    print(f" Report: {report_path}")
+    return certificate_store
+
+def main(directory=None, report_path=None):
+    if directory:
+        return verify_directory(directory, report_path)
     print("\n" + "="*60)
     print("CERTIFICATE VERIFICATION TOOL")
     result = verify_certificate()
@@ -0,0 +1,201 @@
+from brownie import accounts, network, web3, IssuerRegistry, CertificateStore
+from scripts.help_scripts import (get_account, print_section, load_deployment_info, generate_certificate_hash)
+from web3 import Web3
+import random
+import time
+import json
+
+# Seeds a local chain with a large, reproducible issuer/certificate population.
+#   brownie run scripts/seed_load_data.py main <issuers> <certificates> [seed] [options-json] --network development
+# options-json keys (all optional):
+#   recipients        distinct recipient addresses (default certificates // 3)
+#   issuer_skew       Zipf exponent for certificates per issuer, 0 = uniform (default 1.0)
+#   heavy_holders     number of "heavy holder" recipients (default 10)
+#   heavy_share       fraction of certificates that go to heavy holders (default 0.2)
+#   gas_per_certificate  gas budgeted per issued certificate, batch overhead included (default 90000)
+#   funding_margin       multiplier on each issuer's gas budget (default 1.5)
+#   in_flight            pipelined transactions awaiting confirmation (default 32)
+# Each issuer is funded for the certificates planned for it; the run stops before
+# sending anything if the funding account cannot cover that plus the registrations.
+
+BATCH_SIZE = 100
+DEFAULT_OPTIONS = {
+    'issuer_skew': 1.0,
+    'heavy_holders': 10,
+    'heavy_share': 0.2,
+    'gas_per_certificate': 90000,
+    'funding_margin': 1.5,
+    'in_flight': 32
+}
+# Gas budgeted for one registerIssuer call by the owner.
+REGISTRATION_GAS = 250000
+
+class Pipeline:
+    """Sends transactions without waiting and confirms them oldest-first once the window is full."""
+
+    def __init__(self, window):
+        self.window = window
+        self.pending = []
+        self.nonces = {}
+        self.sent = 0
+
+    def next_nonce(self, account):
+        nonce = self.nonces.get(account.address, account.nonce)
+        self.nonces[account.address] = nonce + 1
+        return nonce
+
+    def send(self, method, *args, sender):
+        return self._track(method(*args, {'from': sender, 'nonce': self.next_nonce(sender), 'required_confs': 0}))
+
+    def transfer(self, sender, to, amount):
+        return self._track(sender.transfer(to, amount, nonce=self.next_nonce(sender), required_confs=0, silent=True))
+
+    def _track(self, tx):
+        self.pending.append(tx)
+        self.sent += 1
+        if len(self.pending) >= self.window:
+            self._confirm(self.pending.pop(0))
+        return tx
+
+    def drain(self):
+        while self.pending:
+            self._confirm(self.pending.pop(0))
+
+    @staticmethod
+    def _confirm(tx):
+        tx.wait(1)
+        if tx.status != 1:
+            raise RuntimeError(f"Transaction {tx.txid} reverted")
+
+def derive_key(seed, label, index):
+    return Web3.keccak(text=f"{seed}:{label}:{index}").hex()
+
+def derive_address(rng):
+    return Web3.to_checksum_address('0x' + rng.getrandbits(160).to_bytes(20, 'big').hex())
+
+def build_issuer_weights(count, skew):
+    return [1.0 / (rank ** skew) for rank in range(1, count + 1)]
+
+def plan_certificates(rng, seed, num_certificates, issuer_count, options):
+    recipients = [derive_address(rng) for _ in range(options['recipients'])]
+    heavy = recipients[:options['heavy_holders']]
+    issuer_weights = build_issuer_weights(issuer_count, options['issuer_skew'])
+    issuer_choices = rng.choices(range(issuer_count), weights=issuer_weights, k=num_certificates)
+
+    plan = [[] for _ in range(issuer_count)]
+    for i, issuer_index in enumerate(issuer_choices):
+        if heavy and rng.random() < options['heavy_share']:
+            recipient = rng.choice(heavy)
+        else:
+            recipient = rng.choice(recipients)
+        cert_hash = '0x' + generate_certificate_hash(f"load-{seed}-{i}")
+        plan[issuer_index].append((cert_hash, recipient))
+    return plan, heavy
+
+def gas_price():
+    # Brownie sends at the network's configured gas price, which may differ from the node's.
+    configured = network.gas_price()
+    # It is False for 'auto' and may be a gas strategy object.
+    if isinstance(configured, int) and not isinstance(configured, bool):
+        return int(configured)
+    return web3.eth.gas_price
+
+def derive_issuers(seed, count):
+    return [accounts.add(derive_key(seed, 'issuer', i)) for i in range(count)]
+
+def plan_funding(issuer_registry, issuers, plan, options, price):
+    """Wei to send each issuer, and the owner's total cost including registrations."""
+    funding = []
+    registrations = 0
+    for account, certificates in zip(issuers, plan):
+        needed = int(len(certificates) * options['gas_per_certificate'] * price * options['funding_margin'])
+        funding.append(max(0, needed - account.balance()))
+        if not issuer_registry.isAddressRegistered(account.address):
+            registrations += 1
+    return funding, sum(funding) + int(registrations * REGISTRATION_GAS * price * options['funding_margin'])
+
+def create_issuers(issuer_registry, owner, pipeline, issuers, funding):
+    for i, (account, amount) in enumerate(zip(issuers, funding)):
+        if amount:
+            pipeline.transfer(owner, account, amount)
+        if issuer_registry.isAddressRegistered(account.address):
+            continue
+        pipeline.send(issuer_registry.registerIssuer, account.address,
+                      f"Load Test Institution {i}", f"Region {i % 50}", sender=owner)
+    pipeline.drain()
+    return issuers
+
+def seed_load_data(num_issuers, num_certificates, seed=42, options=None):
+    options = {**DEFAULT_OPTIONS, 'recipients': max(1, num_certificates // 3), **(options or {})}
+    rng = random.Random(seed)
+
+    print_section("Loading Contracts")
+    issuer_reg_info = load_deployment_info("IssuerRegistry", network.show_active())
+    cert_store_info = load_deployment_info("CertificateStore", network.show_active())
+    if not issuer_reg_info or not cert_store_info:
+        print("Contracts not deployed")
+        return None
+    issuer_registry = IssuerRegistry.at(issuer_reg_info["address"])
+    certificate_store = CertificateStore.at(cert_store_info["address"])
+    owner = get_account()
+    pipeline = Pipeline(int(options['in_flight']))
+
+    issuers = derive_issuers(seed, num_issuers)
+    plan, heavy = plan_certificates(rng, seed, num_certificates, len(issuers), options)
+
+    print_section("Funding Check")
+    funding, required = plan_funding(issuer_registry, issuers, plan, options, gas_price())
+    print(f"Largest issuer: {max(len(p) for p in plan)} certificates, funded {max(funding) / 1e18:.4f} ETH")
+    print(f"Required from {owner.address}: {required / 1e18:.4f} ETH, balance {owner.balance() / 1e18:.4f} ETH")
+    if owner.balance() < required:
+        print("Funding account balance is too low for this plan; "
+              "lower the issuer/certificate counts, gas_per_certificate or funding_margin, or fund the account")
+        return None
+
+    print_section("Creating Issuers")
+    started = time.time()
+    create_issuers(issuer_registry, owner, pipeline, issuers, funding)
+    print(f"{len(issuers)} issuers ready in {time.time() - started:.1f}s")
+
+    print_section("Issuing Certificates")
+    started = time.time()
+    issued = 0
+    for issuer, certificates in zip(issuers, plan):
+        # Skip anything already on chain so re-running with the same seed tops up instead of reverting.
+        certificates = [c for c, found in zip(certificates, _existing(certificate_store, certificates)) if not found]
+        for start in range(0, len(certificates), BATCH_SIZE):
+            chunk = certificates[start:start + BATCH_SIZE]
+            pipeline.send(certificate_store.batchIssueCertificates,
+                          [c[0] for c in chunk], [c[1] for c in chunk], sender=issuer)
+            issued += len(chunk)
+            if issued % (BATCH_SIZE * 50) < len(chunk):
+                print(f" {issued} certificates sent...")
+    pipeline.drain()
+    elapsed = time.time() - started
+
+    summary = {
+        'seed': seed,
+        'issuers': len(issuers),
+        'certificates_planned': num_certificates,
+        'certificates_issued': issued,
+        'transactions': pipeline.sent,
+        'issuance_seconds': round(elapsed, 1),
+        'largest_issuer': max(len(p) for p in plan),
+        'heavy_holders': heavy,
+        'options': options
+    }
+    print_section("Summary")
+    print(json.dumps(summary, indent=2))
+    return summary
+
+def _existing(certificate_store, certificates):
+    exists = []
+    for start in range(0, len(certificates), 250):
+        exists.extend(certificate_store.verifyCertificates([c[0] for c in certificates[start:start + 250]])[0])
+    return exists
+
+def main(num_issuers="100", num_certificates="10000", seed="42", options=None):
+    return seed_load_data(int(num_issuers), int(num_certificates), int(seed), json.loads(options) if options else None)
+
+if __name__ == "__main__":
+    main()
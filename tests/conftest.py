@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+import pytest
+from brownie import IssuerRegistry, CertificateStore, accounts
+from scripts.help_scripts import create_sample_institution_data
+
+# Lets the contract tests check the backend's helpers against the deployed contracts.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'backend'))
+
+
+@pytest.fixture
+def issuer_registry():
+    registry = accounts[0].deploy(IssuerRegistry)
+    for institution in create_sample_institution_data()[:2]:
+        registry.registerIssuer(
+            institution["address"],
+            institution["name"],
+            institution["location"],
+            {'from': accounts[0]}
+        )
+    return registry
+
+
+@pytest.fixture
+def certificate_store(issuer_registry):
+    store = accounts[0].deploy(CertificateStore, issuer_registry.address)
+    issuer_registry.setCertificateStore(store, {'from': accounts[0]})
+    return store
@@ -0,0 +1,235 @@
+import pytest
+from brownie import accounts, reverts, ZERO_ADDRESS
+from web3 import Web3
+from scripts.help_scripts import generate_certificate_hash
+from app.services.merkle import MerkleTree, merkle_leaf
+
+def make_hashes(count, prefix="certificate"):
+    return ["0x" + generate_certificate_hash(f"{prefix}-{i}") for i in range(count)]
+
+def test_issue_certificate(certificate_store, issuer_registry):
+    cert_hash = make_hashes(1)[0]
+    tx = certificate_store.issueCertificate(cert_hash, accounts[6], {'from': accounts[1]})
+    assert len(tx.events["CertificateIssued"]) == 1
+
+    verification = certificate_store.verifyCertificate(cert_hash)
+    assert verification[0] == True
+    assert verification[1] == accounts[1]
+    assert verification[2] == accounts[6]
+    assert verification[4] == False
+    assert certificate_store.getTotalCertificates() == 1
+    assert issuer_registry.getIssuerInfo(accounts[1])[4] == 1
+
+def test_issue_certificate_unregistered_issuer(certificate_store):
+    with reverts("CertificateStore: Caller is not registered"):
+        certificate_store.issueCertificate(make_hashes(1)[0], accounts[6], {'from': accounts[8]})
+
+def test_batch_issue_single_count_update(certificate_store, issuer_registry):
+    hashes = make_hashes(10)
+    recipients = [accounts[6 + i % 2] for i in range(10)]
+    tx = certificate_store.batchIssueCertificates(hashes, recipients, {'from': accounts[1]})
+
+    assert len(tx.events["CertificateIssued"]) == 10
+    assert len(tx.events["BatchCertificatesIssued"]) == 1
+    assert tx.events["BatchCertificatesIssued"][0]["count"] == 10
+    assert len(tx.events["CertificateCountUpdated"]) == 1
+    assert tx.events["CertificateCountUpdated"][0]["newCount"] == 10
+
+    assert certificate_store.getTotalCertificates() == 10
+    assert certificate_store.getContractStats()[0] == 10
+    assert issuer_registry.getIssuerInfo(accounts[1])[4] == 10
+    for cert_hash in hashes:
+        assert certificate_store.isCertificateValid(cert_hash) == True
+
+def test_batch_issue_duplicate_in_batch(certificate_store):
+    cert_hash = make_hashes(1)[0]
+    with reverts("CertificateStore: Duplicate certification in batch"):
+        certificate_store.batchIssueCertificates(
+            [cert_hash, cert_hash], [accounts[6], accounts[7]], {'from': accounts[1]}
+        )
+
+def test_batch_issue_length_mismatch(certificate_store):
+    with reverts("CertificateStore: Array length mismatch"):
+        certificate_store.batchIssueCertificates(make_hashes(2), [accounts[6]], {'from': accounts[1]})
+
+def test_revoke_certificate(certificate_store):
+    cert_hash = make_hashes(1)[0]
+    certificate_store.issueCertificate(cert_hash, accounts[6], {'from': accounts[1]})
+    with reverts("CertificateStore: Caller is not the issuer of this certificate"):
+        certificate_store.revokeCertificate(cert_hash, {'from': accounts[2]})
+
+    tx = certificate_store.revokeCertificate(cert_hash, {'from': accounts[1]})
+    assert len(tx.events["CertificateRevoked"]) == 1
+    assert certificate_store.isCertificateValid(cert_hash) == False
+    details = certificate_store.getCertificateDetails(cert_hash)
+    assert details[4] == True
+    assert details[5] > 0
+
+def test_certificate_details_abi_unchanged(certificate_store):
+    cert_hash = make_hashes(1)[0]
+    tx = certificate_store.issueCertificate(cert_hash, accounts[6], {'from': accounts[1]})
+    details = certificate_store.getCertificateDetails(cert_hash)
+    assert details[0] == cert_hash
+    assert details[1] == accounts[1]
+    assert details[2] == accounts[6]
+    assert details[3] == tx.timestamp
+    assert details[4] == False
+    assert details[5] == 0
+
+def test_missing_certificate(certificate_store):
+    cert_hash = make_hashes(1, prefix="missing")[0]
+    assert certificate_store.verifyCertificate(cert_hash)[0] == False
+    assert certificate_store.isCertificateValid(cert_hash) == False
+    with reverts("CertificateStore: Certificate does not exist"):
+        certificate_store.getCertificateDetails(cert_hash)
+
+def test_verify_certificates_batch(certificate_store):
+    hashes = make_hashes(3)
+    certificate_store.issueCertificate(hashes[0], accounts[6], {'from': accounts[1]})
+    certificate_store.issueCertificate(hashes[1], accounts[7], {'from': accounts[2]})
+    certificate_store.revokeCertificate(hashes[1], {'from': accounts[2]})
+
+    exists, issuers, recipients, issuance_times, revoked, revocation_times, names = \
+        certificate_store.verifyCertificates(hashes)
+    assert list(exists) == [True, True, False]
+    assert list(issuers) == [accounts[1], accounts[2], ZERO_ADDRESS]
+    assert list(recipients)[:2] == [accounts[6], accounts[7]]
+    assert issuance_times[2] == 0
+    assert list(revoked) == [False, True, False]
+    assert revocation_times[1] > 0
+    assert names[0] == certificate_store.verifyCertificate(hashes[0])[5]
+    assert names[2] == ""
+
+def merkle_pair(a, b):
+    return bytes(Web3.keccak(a + b if a < b else b + a))
+
+@pytest.fixture
+def merkle_batch(certificate_store):
+    hashes = make_hashes(3, prefix="merkle")
+    recipients = [accounts[6], accounts[7], accounts[6]]
+    leaves = [bytes(certificate_store.merkleLeaf(h, r)) for h, r in zip(hashes, recipients)]
+    inner = merkle_pair(leaves[0], leaves[1])
+    root = merkle_pair(inner, leaves[2])
+    proofs = [[leaves[1], leaves[2]], [leaves[0], leaves[2]], [inner]]
+    return root, hashes, recipients, proofs
+
+def test_anchor_merkle_root(certificate_store, issuer_registry, merkle_batch):
+    root, hashes, recipients, proofs = merkle_batch
+    tx = certificate_store.anchorMerkleRoot(root, 3, {'from': accounts[1]})
+    assert tx.events["MerkleRootAnchored"][0]["certificateCount"] == 3
+    assert certificate_store.getTotalCertificates() == 3
+    assert issuer_registry.getIssuerInfo(accounts[1])[4] == 3
+    assert certificate_store.getMerkleBatch(root)[0] == accounts[1]
+
+    for cert_hash, recipient, proof in zip(hashes, recipients, proofs):
+        result = certificate_store.verifyMerkleCertificate(root, cert_hash, recipient, proof)
+        assert result[0] == True
+        assert result[1] == accounts[1]
+        assert result[3] == False
+
+    assert certificate_store.verifyMerkleCertificate(root, hashes[0], accounts[7], proofs[0])[0] == False
+
+    with reverts("CertificateStore: Merkle root already anchored"):
+        certificate_store.anchorMerkleRoot(root, 3, {'from': accounts[1]})
+
+def test_revoke_merkle_certificate(certificate_store, merkle_batch):
+    root, hashes, recipients, proofs = merkle_batch
+    certificate_store.anchorMerkleRoot(root, 3, {'from': accounts[1]})
+
+    with reverts("CertificateStore: Caller is not the issuer of this batch"):
+        certificate_store.revokeMerkleCertificate(root, hashes[2], recipients[2], proofs[2], {'from': accounts[2]})
+    with reverts("CertificateStore: Invalid Merkle proof"):
+        certificate_store.revokeMerkleCertificate(root, hashes[2], recipients[2], proofs[0], {'from': accounts[1]})
+
+    tx = certificate_store.revokeMerkleCertificate(root, hashes[2], recipients[2], proofs[2], {'from': accounts[1]})
+    assert len(tx.events["MerkleCertificateRevoked"]) == 1
+    result = certificate_store.verifyMerkleCertificate(root, hashes[2], recipients[2], proofs[2])
+    assert result[0] == True
+    assert result[3] == True
+    assert result[4] == tx.timestamp
+
+def test_anchor_merkle_root_count_bounded(certificate_store, merkle_batch):
+    root = merkle_batch[0]
+    limit = certificate_store.MAX_MERKLE_BATCH()
+    with reverts("CertificateStore: Batch too large"):
+        certificate_store.anchorMerkleRoot(root, 2**255, {'from': accounts[1]})
+    with reverts("CertificateStore: Batch too large"):
+        certificate_store.anchorMerkleRoot(root, limit + 1, {'from': accounts[1]})
+
+    # An oversized claim cannot wedge the global counter for other issuers.
+    certificate_store.issueCertificate(make_hashes(1, prefix="after-bound")[0], accounts[6], {'from': accounts[2]})
+    assert certificate_store.getTotalCertificates() == 1
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 8])
+def test_backend_merkle_tree_verifies_on_chain(certificate_store, count):
+    hashes = make_hashes(count, prefix=f"backend-merkle-{count}")
+    recipients = [accounts[6 + i % 3].address for i in range(count)]
+    leaves = [merkle_leaf(bytes.fromhex(h[2:]), r) for h, r in zip(hashes, recipients)]
+    for leaf, cert_hash, recipient in zip(leaves, hashes, recipients):
+        assert leaf == bytes(certificate_store.merkleLeaf(cert_hash, recipient))
+
+    tree = MerkleTree(leaves)
+    certificate_store.anchorMerkleRoot(tree.root, count, {'from': accounts[1]})
+    for i, (cert_hash, recipient) in enumerate(zip(hashes, recipients)):
+        result = certificate_store.verifyMerkleCertificate(tree.root, cert_hash, recipient, tree.proof(i))
+        assert result[0] == True
+        assert result[1] == accounts[1]
+    assert certificate_store.verifyMerkleCertificate(tree.root, hashes[0], accounts[9], tree.proof(0))[0] == False
+
+def test_certificates_issued_by_pagination(certificate_store):
+    hashes = make_hashes(5)
+    certificate_store.batchIssueCertificates(hashes, [accounts[6]] * 5, {'from': accounts[1]})
+    certificate_store.issueCertificate(make_hashes(1, prefix="other")[0], accounts[6], {'from': accounts[2]})
+
+    page, has_more = certificate_store.getCertificatesIssuedBy(accounts[1], 0, 3)
+    assert list(page) == hashes[:3]
+    assert has_more == True
+    page, has_more = certificate_store.getCertificatesIssuedBy(accounts[1], 3, 3)
+    assert list(page) == hashes[3:]
+    assert has_more == False
+
+    with reverts("CertificateStore: Start index out of bounds"):
+        certificate_store.getCertificatesIssuedBy(accounts[1], 5, 3)
+
+def test_revocation_counters(certificate_store):
+    hashes = make_hashes(3)
+    certificate_store.batchIssueCertificates(hashes[:2], [accounts[6]] * 2, {'from': accounts[1]})
+    certificate_store.issueCertificate(hashes[2], accounts[7], {'from': accounts[2]})
+    certificate_store.revokeCertificate(hashes[0], {'from': accounts[1]})
+    certificate_store.revokeCertificate(hashes[2], {'from': accounts[2]})
+
+    assert certificate_store.getContractStats() == (3, 2)
+    assert certificate_store.getIssuerCertificateStats(accounts[1]) == (2, 1)
+    assert certificate_store.getIssuerCertificateStats(accounts[2]) == (1, 1)
+
+def test_issuer_stats_separate_merkle(certificate_store, merkle_batch):
+    root, hashes, recipients, proofs = merkle_batch
+    individual = make_hashes(2, prefix="individual")
+    certificate_store.batchIssueCertificates(individual, [accounts[6]] * 2, {'from': accounts[1]})
+    certificate_store.revokeCertificate(individual[0], {'from': accounts[1]})
+    certificate_store.anchorMerkleRoot(root, 3, {'from': accounts[1]})
+    certificate_store.revokeMerkleCertificate(root, hashes[0], recipients[0], proofs[0], {'from': accounts[1]})
+
+    assert certificate_store.getIssuerCertificateStats(accounts[1]) == (2, 1)
+    assert certificate_store.getIssuerMerkleStats(accounts[1]) == (3, 1)
+    assert certificate_store.getIssuerMerkleStats(accounts[2]) == (0, 0)
+    assert certificate_store.getContractStats() == (5, 2)
+
+def test_recipient_certificates_detailed(certificate_store, issuer_registry):
+    hashes = make_hashes(3)
+    certificate_store.batchIssueCertificates(hashes[:2], [accounts[6]] * 2, {'from': accounts[1]})
+    certificate_store.issueCertificate(hashes[2], accounts[6], {'from': accounts[2]})
+    certificate_store.revokeCertificate(hashes[1], {'from': accounts[1]})
+
+    records, has_more = certificate_store.getCertificatesForRecipientDetailed(accounts[6], 0, 2)
+    assert has_more == True
+    assert [r[0] for r in records] == hashes[:2]
+    assert records[0][1] == accounts[1]
+    assert records[0][6] == issuer_registry.getIssuerName(accounts[1])
+    assert records[1][4] == True
+    assert records[1][5] > 0
+
+    records, has_more = certificate_store.getCertificatesForRecipientDetailed(accounts[6], 2, 2)
+    assert has_more == False
+    assert records[0][0] == hashes[2]
+    assert records[0][6] == issuer_registry.getIssuerName(accounts[2])
@@ -0,0 +1,70 @@
+import pytest
+from brownie import IssuerRegistry, CertificateStore, accounts, web3
+from web3.exceptions import ContractLogicError
+from scripts.help_scripts import generate_certificate_hash
+from app.services.fast_calls import FastCalls
+
+# Differential test: the backend's raw eth_call path must return exactly what the
+# generic web3 contract-function path returns.
+
+@pytest.fixture
+def contracts(issuer_registry, certificate_store):
+    store = web3.eth.contract(address=certificate_store.address, abi=CertificateStore.abi)
+    registry = web3.eth.contract(address=issuer_registry.address, abi=IssuerRegistry.abi)
+    return store, registry, FastCalls(web3, certificate_store.address, issuer_registry.address)
+
+def normalize(values):
+    return [bytes(v) if isinstance(v, (bytes, bytearray)) else v for v in values]
+
+def test_verify_certificate_matches_generic_path(certificate_store, contracts):
+    store, _, fast = contracts
+    active = "0x" + generate_certificate_hash("fast-active")
+    revoked = "0x" + generate_certificate_hash("fast-revoked")
+    missing = "0x" + generate_certificate_hash("fast-missing")
+    certificate_store.issueCertificate(active, accounts[6], {'from': accounts[1]})
+    certificate_store.issueCertificate(revoked, accounts[7], {'from': accounts[2]})
+    certificate_store.revokeCertificate(revoked, {'from': accounts[2]})
+
+    for cert_hash in (active, revoked, missing):
+        cert_bytes = bytes.fromhex(cert_hash[2:])
+        generic = store.functions.verifyCertificate(cert_bytes).call()
+        assert fast.verify_certificate(cert_bytes).call() == normalize(generic)
+
+def test_certificate_details_matches_generic_path(certificate_store, contracts):
+    store, _, fast = contracts
+    cert_hash = "0x" + generate_certificate_hash("fast-details")
+    certificate_store.issueCertificate(cert_hash, accounts[6], {'from': accounts[1]})
+    certificate_store.revokeCertificate(cert_hash, {'from': accounts[1]})
+    cert_bytes = bytes.fromhex(cert_hash[2:])
+
+    generic = store.functions.getCertificateDetails(cert_bytes).call()
+    assert fast.get_certificate_details(cert_bytes).call() == normalize(generic)
+
+def test_certificate_details_revert_matches_generic_path(certificate_store, contracts):
+    store, _, fast = contracts
+    cert_bytes = bytes.fromhex(generate_certificate_hash("fast-unknown"))
+    with pytest.raises(ContractLogicError) as generic:
+        store.functions.getCertificateDetails(cert_bytes).call()
+    with pytest.raises(ContractLogicError) as raw:
+        fast.get_certificate_details(cert_bytes).call()
+    assert "Certificate does not exist" in str(generic.value)
+    assert "Certificate does not exist" in str(raw.value)
+
+def test_issuer_checks_match_generic_path(issuer_registry, contracts):
+    _, registry, fast = contracts
+    issuer_registry.deactivateIssuer(accounts[2], {'from': accounts[0]})
+    for account in (accounts[1], accounts[2], accounts[8]):
+        assert fast.is_registered_issuer(account.address).call() == \
+            registry.functions.isRegisteredIssuer(account.address).call()
+        assert fast.is_address_registered(account.address).call() == \
+            registry.functions.isAddressRegistered(account.address).call()
+
+def test_reads_at_fixed_block(certificate_store, contracts):
+    store, _, fast = contracts
+    cert_hash = bytes.fromhex(generate_certificate_hash("fast-pinned"))
+    before = web3.eth.block_number
+    certificate_store.issueCertificate(cert_hash, accounts[6], {'from': accounts[1]})
+
+    assert fast.verify_certificate(cert_hash).call(block_identifier=before) == \
+        normalize(store.functions.verifyCertificate(cert_hash).call(block_identifier=before))
+    assert fast.verify_certificate(cert_hash).call()[0] == True
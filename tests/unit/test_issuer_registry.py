@@ -4,7 +4,10 @@ from scripts.help_scripts import create_sample_institution_data
 
 @pytest.fixture
 def issuer_registry():
-    return accounts[0].deploy(IssuerRegistry)
+    registry = accounts[0].deploy(IssuerRegistry)
+    # accounts[0] stands in for CertificateStore so the count hooks can be called directly.
+    registry.setCertificateStore(accounts[0], {'from': accounts[0]})
+    return registry
 
 @pytest.fixture
 def sample_institutions():
@@ -153,6 +156,45 @@ def test_increment_certificate_count(registered_issuer_registry, sample_institut
     info = registered_issuer_registry.getIssuerInfo(issuer_address)
     assert info[4] == 2
 
+def test_increment_certificate_count_by(registered_issuer_registry, sample_institutions):
+    issuer_address = sample_institutions[0]["address"]
+    tx = registered_issuer_registry.incrementCertificateCountBy(issuer_address, 5, {'from': accounts[0]})
+    assert len(tx.events["CertificateCountUpdated"]) == 1
+    event = tx.events["CertificateCountUpdated"][0]
+    assert event["issuerAddress"] == issuer_address
+    assert event["newCount"] == 5
+
+    registered_issuer_registry.incrementCertificateCount(issuer_address, {'from': accounts[0]})
+    info = registered_issuer_registry.getIssuerInfo(issuer_address)
+    assert info[4] == 6
+
+def test_increment_certificate_count_by_zero(registered_issuer_registry, sample_institutions):
+    with reverts("IssuerRegistry: Count must be greater than 0"):
+        registered_issuer_registry.incrementCertificateCountBy(sample_institutions[0]["address"], 0, {'from': accounts[0]})
+
+def test_increment_certificate_count_only_store(registered_issuer_registry, sample_institutions):
+    issuer_address = sample_institutions[0]["address"]
+    with reverts("IssuerRegistry: Caller is not the certificate store"):
+        registered_issuer_registry.incrementCertificateCount(issuer_address, {'from': accounts[5]})
+    with reverts("IssuerRegistry: Caller is not the certificate store"):
+        registered_issuer_registry.incrementCertificateCountBy(issuer_address, 2**255, {'from': accounts[5]})
+    assert registered_issuer_registry.getIssuerInfo(issuer_address)[4] == 0
+
+def test_increment_certificate_count_by_bounded(registered_issuer_registry, sample_institutions):
+    issuer_address = sample_institutions[0]["address"]
+    limit = registered_issuer_registry.MAX_COUNT_INCREMENT()
+    with reverts("IssuerRegistry: Count too large"):
+        registered_issuer_registry.incrementCertificateCountBy(issuer_address, limit + 1, {'from': accounts[0]})
+    registered_issuer_registry.incrementCertificateCountBy(issuer_address, limit, {'from': accounts[0]})
+    assert registered_issuer_registry.getIssuerInfo(issuer_address)[4] == limit
+
+def test_set_certificate_store_only_owner(issuer_registry):
+    with reverts("Ownable: caller is not the owner"):
+        issuer_registry.setCertificateStore(accounts[5], {'from': accounts[5]})
+    tx = issuer_registry.setCertificateStore(accounts[5], {'from': accounts[0]})
+    assert tx.events["CertificateStoreUpdated"][0]["certificateStore"] == accounts[5]
+    assert issuer_registry.certificateStore() == accounts[5]
+
 # def test_get_issuer_name(registered_issuer_registry, sample_institutions):
 #     issuer_address = sample_institutions[0]["address"]
 #     expected_name = sample_institutions[0]["name"]